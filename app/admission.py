@@ -0,0 +1,231 @@
+"""
+Admission control in front of the sync threadpool.
+
+Every request takes a slot before it may run; slots match the DB pool
+(and the anyio thread limiter), so excess work waits here, visibly and
+in priority order, instead of inside the pool. Weighbridge and allocation
+writes go first, then every other POST/PUT/PATCH/DELETE, then reporting
+lists. When a queue is too deep, or a request has waited too long, it is
+shed with 503 + Retry-After rather than left to time out on the client.
+"""
+import asyncio
+import heapq
+import itertools
+import json
+import os
+
+from .db import POOL_SIZE, MAX_OVERFLOW
+
+URGENT, WRITE, READ = "urgent", "write", "read"
+PRIORITY = {URGENT: 0, WRITE: 1, READ: 2}
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+# long-lived or trivial endpoints that must never queue
+EXEMPT_PATHS = (
+    "/changes/stream",
+    "/metrics",
+    "/docs",
+    "/redoc",
+    "/openapi.json",
+    "/test",
+)
+
+
+class PriorityLimiter:
+    def __init__(self, slots):
+        self.slots = slots
+        self.in_use = 0
+        self._waiters = []  # heap of (priority, seq, future)
+        self._seq = itertools.count()
+
+    async def acquire(self, priority=0):
+        if self.in_use < self.slots and not self._waiters:
+            self.in_use += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # the slot was handed over just as we gave up
+                self.release()
+            raise
+
+    def release(self):
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)  # slot passes straight to the waiter
+                return
+        self.in_use -= 1
+
+
+class RouteLimit:
+    def __init__(self, prefix, limit, max_queue):
+        self.prefix = prefix
+        self.limiter = PriorityLimiter(limit)
+        self.max_queue = max_queue
+        self.queued = 0
+
+
+class AdmissionControl:
+    def __init__(
+        self,
+        slots,
+        max_queue=None,
+        max_wait=10.0,
+        route_limits=(),
+        priority_paths=(),
+        retry_after=2,
+    ):
+        self.limiter = PriorityLimiter(slots)
+        self.max_queue = max_queue or {
+            URGENT: slots * 16,
+            WRITE: slots * 8,
+            READ: slots * 2,
+        }
+        self.max_wait = max_wait
+        self.routes = sorted(route_limits, key=lambda r: len(r.prefix), reverse=True)
+        self.priority_paths = tuple(priority_paths)
+        self.retry_after = retry_after
+        self.queued = {cls: 0 for cls in PRIORITY}
+        self.shed = {cls: 0 for cls in PRIORITY}
+
+    def classify(self, method, path):
+        if method in SAFE_METHODS:
+            return READ
+        if path.startswith(self.priority_paths):
+            return URGENT
+        return WRITE
+
+    def route_for(self, path):
+        for route in self.routes:
+            if path.startswith(route.prefix):
+                return route
+        return None
+
+    def metrics(self):
+        lines = [
+            "# TYPE admission_slots gauge",
+            f"admission_slots {self.limiter.slots}",
+            "# TYPE admission_in_flight gauge",
+            f"admission_in_flight {self.limiter.in_use}",
+            "# TYPE admission_queue_depth gauge",
+        ]
+        lines += [f'admission_queue_depth{{class="{c}"}} {n}' for c, n in self.queued.items()]
+        lines.append("# TYPE admission_shed_total counter")
+        lines += [f'admission_shed_total{{class="{c}"}} {n}' for c, n in self.shed.items()]
+        lines.append("# TYPE admission_route_queue_depth gauge")
+        lines += [
+            f'admission_route_queue_depth{{route="{r.prefix}"}} {r.queued}'
+            for r in self.routes
+        ]
+        lines.append("# TYPE admission_route_in_flight gauge")
+        lines += [
+            f'admission_route_in_flight{{route="{r.prefix}"}} {r.limiter.in_use}'
+            for r in self.routes
+        ]
+        return "\n".join(lines) + "\n"
+
+
+class AdmissionMiddleware:
+    def __init__(self, app, control: AdmissionControl):
+        self.app = app
+        self.control = control
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["path"].startswith(EXEMPT_PATHS):
+            return await self.app(scope, receive, send)
+
+        control = self.control
+        cls = control.classify(scope["method"], scope["path"])
+        route = control.route_for(scope["path"])
+
+        if control.queued[cls] >= control.max_queue[cls] or (
+            route is not None and route.queued >= route.max_queue
+        ):
+            return await self._reject(cls, send)
+
+        route_acquired = acquired = False
+        control.queued[cls] += 1
+        if route is not None:
+            route.queued += 1
+        try:
+            async with asyncio.timeout(control.max_wait):
+                if route is not None:
+                    await route.limiter.acquire()
+                    route_acquired = True
+                await control.limiter.acquire(PRIORITY[cls])
+                acquired = True
+        except TimeoutError:
+            if route_acquired:
+                route.limiter.release()
+            return await self._reject(cls, send)
+        finally:
+            control.queued[cls] -= 1
+            if route is not None:
+                route.queued -= 1
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if acquired:
+                control.limiter.release()
+            if route_acquired:
+                route.limiter.release()
+
+    async def _reject(self, cls, send):
+        self.control.shed[cls] += 1
+        body = json.dumps({"detail": "Server is busy, retry later"}).encode()
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 503,
+                "headers": [
+                    (b"content-type", b"application/json"),
+                    (b"content-length", str(len(body)).encode()),
+                    (b"retry-after", str(self.control.retry_after).encode()),
+                ],
+            }
+        )
+        await send({"type": "http.response.body", "body": body})
+
+
+def _route_limits(spec):
+    """
+    "/settlements/=2:10,/dispatch/=4:20"  ->  prefix=limit:max_queue
+    """
+    limits = []
+    for item in filter(None, (s.strip() for s in spec.split(","))):
+        prefix, _, values = item.partition("=")
+        limit, _, max_queue = values.partition(":")
+        limits.append(RouteLimit(prefix, int(limit), int(max_queue or int(limit) * 4)))
+    return limits
+
+
+SLOTS = int(os.getenv("ADMISSION_SLOTS", POOL_SIZE + MAX_OVERFLOW))
+
+admission = AdmissionControl(
+    slots=SLOTS,
+    max_wait=float(os.getenv("ADMISSION_MAX_WAIT", "10")),
+    route_limits=_route_limits(
+        os.getenv(
+            "ADMISSION_ROUTE_LIMITS",
+            "/settlements/=2:10,/dispatch/=4:20,/audit-logs/=4:20",
+        )
+    ),
+    priority_paths=("/loads/batch", "/factory_seeds/", "/factory_pesticides/"),
+)
+
+
+def configure_threadpool():
+    """
+    Give sync handlers exactly as many threads as there are admission slots
+    (plus headroom for dependency teardown); must run inside the event loop.
+    """
+    import anyio.to_thread
+
+    anyio.to_thread.current_default_thread_limiter().total_tokens = SLOTS + 8
@@ -0,0 +1,241 @@
+"""
+Write-behind audit trail.
+
+Row diffs are captured from the ORM flush (so every router is covered
+without touching it), held on the session until the transaction commits,
+then handed to an in-process queue. A background thread writes them in
+batches, so a request never waits on the audit insert.
+
+Writes made with Core statements never reach the flush, so those paths
+build their entries with core_entry: stock decrements and allocations in
+app/distribution.py (held on the session like flushed ones), weighbridge
+loads in app/ingest.py and settlement runs in app/settlement.py (submitted
+once their transaction has committed).
+"""
+import contextvars
+import datetime
+import decimal
+import logging
+import os
+import queue
+import threading
+
+from sqlalchemy import event, insert, inspect
+
+from .changes import collect_changes
+from .db import SessionLocal, engine
+from .models.audit_logs import AuditLog
+
+logger = logging.getLogger(__name__)
+
+# set per request by AuditContextMiddleware
+current_actor = contextvars.ContextVar("audit_actor", default=None)
+current_request = contextvars.ContextVar("audit_request", default=None)
+
+SKIPPED_FIELDS = {"created_at", "updated_at", "deleted_at", "search_text"}
+MASKED_FIELDS = {"password"}
+
+
+def _jsonable(key, value):
+    if key in MASKED_FIELDS and value is not None:
+        return "***"
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(None, v) for v in value]
+    return str(value)
+
+
+def _diff(obj, action):
+    state = inspect(obj)
+    changes = {}
+    for attr in state.mapper.column_attrs:
+        key = attr.key
+        if key in SKIPPED_FIELDS:
+            continue
+        if action == "update":
+            history = state.attrs[key].history
+            if not history.has_changes():
+                continue
+            before = history.deleted[0] if history.deleted else None
+            after = history.added[0] if history.added else None
+            changes[key] = {
+                "before": _jsonable(key, before),
+                "after": _jsonable(key, after),
+            }
+        elif key in state.dict:
+            value = _jsonable(key, state.dict[key])
+            if action == "create":
+                changes[key] = {"before": None, "after": value}
+            else:
+                changes[key] = {"before": value, "after": None}
+    return changes
+
+
+# -------- capture --------
+@event.listens_for(SessionLocal, "after_flush")
+def _capture(session, flush_context):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    entries = session.info.setdefault("audit", [])
+    for entity, entity_id, action, obj in collect_changes(session):
+        changes = _diff(obj, action)
+        if action == "update" and not changes:
+            continue
+        entries.append(
+            {
+                "entity": entity,
+                "entity_id": entity_id,
+                "action": action,
+                "changes": changes,
+                "actor": current_actor.get(),
+                "request": current_request.get(),
+                "created_at": now,
+            }
+        )
+
+
+@event.listens_for(SessionLocal, "after_commit")
+def _enqueue(session):
+    entries = session.info.pop("audit", None)
+    if entries:
+        audit_writer.submit(entries)
+
+
+@event.listens_for(SessionLocal, "after_soft_rollback")
+def _discard(session, previous_transaction):
+    session.info.pop("audit", None)
+
+
+# -------- Core writes --------
+def request_context():
+    """
+    (actor, request) of the current request, for work handed to another thread.
+    """
+    return current_actor.get(), current_request.get()
+
+
+def core_entry(entity, entity_id, action, changes, context=None):
+    """
+    Audit entry for a row written by a Core statement; changes is
+    {field: (before, after)}.
+    """
+    actor, request = context or request_context()
+    return {
+        "entity": entity,
+        "entity_id": entity_id,
+        "action": action,
+        "changes": {
+            key: {"before": _jsonable(key, before), "after": _jsonable(key, after)}
+            for key, (before, after) in changes.items()
+            if key not in SKIPPED_FIELDS
+        },
+        "actor": actor,
+        "request": request,
+        "created_at": datetime.datetime.now(datetime.timezone.utc),
+    }
+
+
+def record(session, entries):
+    """
+    Queue entries with the session's own, written only if it commits.
+    """
+    session.info.setdefault("audit", []).extend(entries)
+
+
+# -------- writer --------
+class AuditWriter:
+    def __init__(self, batch_size=500, flush_interval=0.5, max_queue=100_000):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._thread = None
+        self.dropped = 0
+
+    def submit(self, entries):
+        for entry in entries:
+            try:
+                self._queue.put_nowait(entry)
+            except queue.Full:
+                # never slow down a write because the audit trail is behind
+                self.dropped += 1
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(
+            target=self._run, name="audit-writer", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join(timeout=30)
+            self._thread = None
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = []
+            item = first
+            while True:
+                if item is None:
+                    stopping = True
+                else:
+                    batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch):
+        try:
+            with engine.begin() as connection:
+                connection.execute(insert(AuditLog), batch)
+        except Exception:
+            logger.exception("failed to write %d audit entries", len(batch))
+
+
+audit_writer = AuditWriter(
+    batch_size=int(os.getenv("AUDIT_BATCH_SIZE", "500")),
+    flush_interval=float(os.getenv("AUDIT_FLUSH_INTERVAL", "0.5")),
+)
+
+
+# -------- request context --------
+class AuditContextMiddleware:
+    """
+    Records who (X-Actor header) and which request made each change.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in ("GET", "HEAD", "OPTIONS"):
+            return await self.app(scope, receive, send)
+
+        actor = None
+        for name, value in scope["headers"]:
+            if name == b"x-actor":
+                actor = value.decode("utf-8", "replace")[:150]
+                break
+        actor_token = current_actor.set(actor)
+        request_token = current_request.set(f"{scope['method']} {scope['path']}"[:255])
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_actor.reset(actor_token)
+            current_request.reset(request_token)
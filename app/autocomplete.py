@@ -0,0 +1,210 @@
+"""
+In-memory prefix index for type-ahead pickers.
+
+Every village, city, driver and farmer name is normalized (app/text.py)
+and split into words; each word (and the full name) is kept as a
+(key, id) pair in a sorted list per kind. A prefix lookup is a bisect to the first key >= prefix and a short scan,
+so a keystroke never reaches Postgres.
+
+Each worker builds its own copy on startup and keeps it current from the
+change feed (app/changes.py): deleted ids are dropped, created or updated
+ids are re-read in one query per notification. A periodic full rebuild
+covers events missed while the listener was reconnecting.
+"""
+import bisect
+import logging
+import os
+import threading
+import time
+
+from sqlalchemy import select
+
+from .changes import hub
+from .db import SessionLocal
+from .models import City, Driver, User, Village
+from .text import normalize_fa
+
+logger = logging.getLogger(__name__)
+
+FARMER_ROLE_ID = 3
+
+# kind -> (table, model, label columns, extra filter)
+SOURCES = {
+    "village": ("villages", Village, (Village.village,), None),
+    "city": ("cities", City, (City.city,), None),
+    "driver": ("drivers", Driver, (Driver.name, Driver.last_name), None),
+    "farmer": ("users", User, (User.fullname,), User.role_id == FARMER_ROLE_ID),
+}
+KINDS = tuple(SOURCES)
+_KIND_BY_TABLE = {table: kind for kind, (table, *_rest) in SOURCES.items()}
+
+
+def _keys(label):
+    name = normalize_fa(label)
+    words = name.split(" ")
+    # the full name too, so "ali re" still matches "Ali Rezaei"
+    return {name, *words}
+
+
+def _label(row):
+    return " ".join(str(v) for v in row[1:] if v)
+
+
+class PrefixIndex:
+    def __init__(self):
+        self.entries = []  # sorted (key, id)
+        self.labels = {}  # id -> label
+
+    def add(self, id_, label):
+        self.remove(id_)
+        self.labels[id_] = label
+        for key in _keys(label):
+            bisect.insort(self.entries, (key, id_))
+
+    def remove(self, id_):
+        label = self.labels.pop(id_, None)
+        if label is None:
+            return
+        for key in _keys(label):
+            i = bisect.bisect_left(self.entries, (key, id_))
+            if i < len(self.entries) and self.entries[i] == (key, id_):
+                del self.entries[i]
+
+    def bulk_load(self, rows):
+        self.labels = dict(rows)
+        self.entries = sorted(
+            (key, id_) for id_, label in rows for key in _keys(label)
+        )
+
+    def search(self, prefix, limit):
+        found = []
+        seen = set()
+        i = bisect.bisect_left(self.entries, (prefix,))
+        while i < len(self.entries) and len(found) < limit:
+            key, id_ = self.entries[i]
+            if not key.startswith(prefix):
+                break
+            if id_ not in seen:
+                seen.add(id_)
+                found.append((id_, self.labels[id_]))
+            i += 1
+        return found
+
+
+class Autocomplete:
+    def __init__(self, rebuild_interval=600.0):
+        self.rebuild_interval = rebuild_interval
+        self.indexes = {kind: PrefixIndex() for kind in KINDS}
+        self.built_at = None
+        self._rebuilding = False
+        self._lock = threading.Lock()  # guards the indexes
+        self._build_lock = threading.Lock()
+
+    # -------- loading --------
+    def _select(self, kind, ids=None):
+        _, model, columns, condition = SOURCES[kind]
+        stmt = select(model.id, *columns)
+        if condition is not None:
+            stmt = stmt.where(condition)
+        if ids is not None:
+            stmt = stmt.where(model.id.in_(ids))
+        return stmt
+
+    def rebuild(self):
+        loaded = {}
+        with SessionLocal() as session:
+            for kind in KINDS:
+                loaded[kind] = [
+                    (row[0], _label(row)) for row in session.execute(self._select(kind))
+                ]
+        with self._lock:
+            for kind, rows in loaded.items():
+                self.indexes[kind].bulk_load(rows)
+            self.built_at = time.monotonic()
+
+    def ensure_fresh(self):
+        if self.built_at is None:
+            with self._build_lock:
+                if self.built_at is None:
+                    self.rebuild()
+        elif (
+            time.monotonic() - self.built_at > self.rebuild_interval
+            and not self._rebuilding
+        ):
+            # serve the current copy while a fresh one loads
+            self._rebuilding = True
+            threading.Thread(
+                target=self._rebuild_in_background, name="autocomplete-build", daemon=True
+            ).start()
+
+    def _rebuild_in_background(self):
+        try:
+            with self._build_lock:
+                self.rebuild()
+        except Exception:
+            logger.exception("autocomplete index build failed, will retry on use")
+        finally:
+            self._rebuilding = False
+
+    def start(self):
+        """
+        Build in the background and follow the change feed; called on startup.
+        """
+        hub.add_listener(self.apply_changes)
+        if self.built_at is None and not self._rebuilding:
+            self._rebuilding = True
+            threading.Thread(
+                target=self._rebuild_in_background, name="autocomplete-build", daemon=True
+            ).start()
+
+    # -------- change feed --------
+    def apply_changes(self, changes):
+        if self.built_at is None:
+            return
+        refresh = {}
+        with self._lock:
+            for change in changes:
+                kind = _KIND_BY_TABLE.get(change["entity"])
+                if kind is None or change["id"] is None:
+                    continue
+                if change["action"] == "delete":
+                    self.indexes[kind].remove(change["id"])
+                else:
+                    refresh.setdefault(kind, set()).add(change["id"])
+        if not refresh:
+            return
+        with SessionLocal() as session:
+            fresh = {
+                kind: session.execute(self._select(kind, ids)).all()
+                for kind, ids in refresh.items()
+            }
+        with self._lock:
+            for kind, ids in refresh.items():
+                index = self.indexes[kind]
+                for row in fresh[kind]:
+                    index.add(row[0], _label(row))
+                    ids.discard(row[0])
+                # e.g. a user who is no longer a farmer
+                for id_ in ids:
+                    index.remove(id_)
+
+    # -------- queries --------
+    def search(self, text, kinds=KINDS, limit=10):
+        prefix = normalize_fa(text)
+        if not prefix:
+            return []
+        self.ensure_fresh()
+        results = []
+        with self._lock:
+            for kind in kinds:
+                for id_, label in self.indexes[kind].search(prefix, limit):
+                    results.append({"kind": kind, "id": id_, "label": label})
+        # shortest labels first: the closest completions
+        results.sort(key=lambda r: (len(r["label"]), r["label"]))
+        return results[:limit]
+
+
+autocomplete = Autocomplete(
+    rebuild_interval=float(os.getenv("AUTOCOMPLETE_REBUILD_SECONDS", "600"))
+)
+
@@ -0,0 +1,103 @@
+"""
+Circuit breaker around the database engine.
+
+Failed connects and dropped connections are counted from the engine's
+handle_error event, pool checkout timeouts by the handler in
+app/config.py. When failure_threshold of them fall within window seconds
+the breaker opens and get_session fails fast with 503 instead of every
+request waiting on the pool or on a saturated Postgres. Successful
+queries in between do not reset the count, so a pool that is only partly
+failing still trips it. After reset_timeout a single probe request is let
+through; if its queries succeed the breaker closes again.
+
+Statement timeouts (QUERY_CANCELED) are not counted: they come from the
+per-route budgets in app/timeouts.py and mean one route's query pattern is
+slow, not that the database is gone. They stay a 503 for that request only.
+"""
+import threading
+import time
+from collections import deque
+
+from sqlalchemy import event
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+# postgres query_canceled: raised when statement_timeout fires
+QUERY_CANCELED = "57014"
+
+
+class DatabaseUnavailable(Exception):
+    def __init__(self, retry_after):
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, reset_timeout=10.0, window=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.window = window
+        self.state = CLOSED
+        self._failures = deque()  # monotonic times of recent failures
+        self.opened_at = 0.0
+        self.trips = 0
+        self._probe_started = None
+        self._lock = threading.Lock()
+
+    def check(self):
+        """
+        Raise DatabaseUnavailable unless a request may use the database now.
+        """
+        if self.state == CLOSED:
+            return
+        with self._lock:
+            remaining = self.opened_at + self.reset_timeout - time.monotonic()
+            if self.state == OPEN and remaining <= 0:
+                self.state = HALF_OPEN
+            if self.state == HALF_OPEN and (
+                # a probe that never touched the database must not block forever
+                self._probe_started is None
+                or time.monotonic() - self._probe_started > self.reset_timeout
+            ):
+                self._probe_started = time.monotonic()
+                return
+            if self.state == CLOSED:
+                return
+            raise DatabaseUnavailable(max(1, round(remaining)))
+
+    @property
+    def failures(self):
+        return len(self._failures)
+
+    def record_success(self):
+        # only the probe closes the breaker; while closed, failures age out
+        if self.state != HALF_OPEN:
+            return
+        with self._lock:
+            if self.state != HALF_OPEN:
+                return
+            self.state = CLOSED
+            self._failures.clear()
+            self._probe_started = None
+
+    def record_failure(self):
+        with self._lock:
+            now = time.monotonic()
+            self._failures.append(now)
+            while self._failures and self._failures[0] < now - self.window:
+                self._failures.popleft()
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.trips += 1
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self._probe_started = None
+
+    def watch(self, engine):
+        @event.listens_for(engine, "handle_error")
+        def _on_error(context):
+            if context.is_disconnect or context.connection is None:  # could not connect
+                self.record_failure()
+
+        @event.listens_for(engine, "after_cursor_execute")
+        def _on_success(conn, cursor, statement, parameters, context, executemany):
+            self.record_success()
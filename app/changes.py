@@ -0,0 +1,196 @@
+import asyncio
+import json
+import logging
+import threading
+
+import psycopg
+from sqlalchemy import event, func, inspect, select
+from sqlalchemy.orm import Session
+
+from .db import SessionLocal, engine
+from .softdelete import SoftDelete
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "havirkesht_changes"
+
+# postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD = 7900
+
+
+# -------- write path: ORM flush -> NOTIFY --------
+def _action(obj, action):
+    # a soft delete (app/softdelete.py) is an update that reads as a delete
+    if action == "update" and isinstance(obj, SoftDelete):
+        added = inspect(obj).attrs.deleted_at.history.added
+        if added and added[0] is not None:
+            return "delete"
+    return action
+
+
+def collect_changes(session: Session):
+    """
+    (entity, id, action, obj) for every row touched by the current flush.
+    Entity is the table name.
+    """
+    changes = []
+    for action, objs in (
+        ("create", session.new),
+        ("update", session.dirty),
+        ("delete", session.deleted),
+    ):
+        for obj in objs:
+            if action == "update" and not session.is_modified(
+                obj, include_collections=False
+            ):
+                continue
+            changes.append(
+                (obj.__tablename__, getattr(obj, "id", None), _action(obj, action), obj)
+            )
+    return changes
+
+
+def _chunks(events):
+    chunk, size = [], 2
+    for e in events:
+        encoded = json.dumps(e, ensure_ascii=False)
+        if chunk and size + len(encoded.encode()) + 1 > MAX_PAYLOAD:
+            yield "[" + ",".join(chunk) + "]"
+            chunk, size = [], 2
+        chunk.append(encoded)
+        size += len(encoded.encode()) + 1
+    if chunk:
+        yield "[" + ",".join(chunk) + "]"
+
+
+def notify(connection, events):
+    """
+    Publish change events on the given connection. NOTIFY is transactional:
+    delivered on commit, dropped on rollback.
+    """
+    if connection.dialect.name != "postgresql":
+        return
+    for payload in _chunks(events):
+        connection.execute(select(func.pg_notify(CHANNEL, payload)))
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _notify_changes(session, flush_context):
+    events = [
+        {"entity": entity, "id": id_, "action": action}
+        for entity, id_, action, _ in collect_changes(session)
+    ]
+    if events:
+        notify(session.connection(), events)
+
+
+# -------- read path: LISTEN -> subscribers --------
+class Subscriber:
+    def __init__(self, loop, entities=None, ids=None, maxsize=1000):
+        self.loop = loop
+        self.entities = entities
+        self.ids = ids
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def matches(self, change):
+        return self.ids is None or change["id"] in self.ids
+
+    def push(self, change):
+        # slow clients lose events rather than stall the hub
+        if not self.queue.full():
+            self.queue.put_nowait(change)
+
+
+class ChangeHub:
+    """
+    One LISTEN connection per worker, fanned out to every SSE client
+    connected to that worker.
+    """
+
+    def __init__(self, url):
+        self.conninfo = url.set(drivername="postgresql").render_as_string(
+            hide_password=False
+        )
+        self._by_entity = {}
+        self._all = set()
+        self._listeners = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    # -------- subscriptions --------
+    def subscribe(self, entities=None, ids=None) -> Subscriber:
+        sub = Subscriber(asyncio.get_running_loop(), entities, ids)
+        with self._lock:
+            if entities:
+                for entity in entities:
+                    self._by_entity.setdefault(entity, set()).add(sub)
+            else:
+                self._all.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscriber):
+        with self._lock:
+            if sub.entities:
+                for entity in sub.entities:
+                    self._by_entity.get(entity, set()).discard(sub)
+            else:
+                self._all.discard(sub)
+
+    def add_listener(self, callback):
+        """
+        In-process consumer (e.g. a cache); called on the listener thread
+        with the list of changes of each notification.
+        """
+        self._listeners.append(callback)
+
+    def publish(self, change):
+        with self._lock:
+            targets = self._all | self._by_entity.get(change["entity"], set())
+        for sub in targets:
+            if sub.matches(change):
+                try:
+                    sub.loop.call_soon_threadsafe(sub.push, change)
+                except RuntimeError:  # loop already closed
+                    self.unsubscribe(sub)
+
+    # -------- listener thread --------
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="change-hub", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        backoff = 1
+        while not self._stop.is_set():
+            try:
+                with psycopg.connect(self.conninfo, autocommit=True) as conn:
+                    conn.execute(f"LISTEN {CHANNEL}")
+                    backoff = 1
+                    while not self._stop.is_set():
+                        for notify in conn.notifies(timeout=1.0):
+                            changes = json.loads(notify.payload)
+                            for change in changes:
+                                self.publish(change)
+                            for callback in self._listeners:
+                                try:
+                                    callback(changes)
+                                except Exception:
+                                    logger.exception("change listener failed")
+            except psycopg.Error:
+                logger.exception("change feed listener lost its connection")
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30)
+
+
+hub = ChangeHub(engine.url)
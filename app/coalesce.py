@@ -0,0 +1,93 @@
+"""
+Single-flight for hot list endpoints.
+
+Identical GETs (same path, same normalized query string, same caller
+credentials) that arrive while one is already being served wait for that
+first request and get a copy of its response, instead of each running
+its own count + page queries.
+"""
+import asyncio
+from urllib.parse import parse_qsl, urlencode
+
+# list routes that are hit by many clients with the same parameters
+COALESCED_PATHS = {
+    "/provinces/",
+    "/cities/",
+    "/villages/",
+    "/crop-years/",
+    "/factories/",
+    "/measure_units/",
+    "/seeds/",
+    "/pesticides/",
+    "/factory_seeds/",
+    "/factory_pesticides/",
+    "/cars/",
+    "/drivers/",
+}
+
+# headers that change the response for the same URL
+VARY_HEADERS = (b"authorization", b"accept-encoding", b"x-actor")
+
+
+class SingleFlightMiddleware:
+    def __init__(self, app, paths=COALESCED_PATHS):
+        self.app = app
+        self.paths = paths
+        self._inflight = {}
+        self.coalesced = 0
+
+    def _key(self, scope):
+        query = parse_qsl(scope["query_string"].decode("latin-1"), keep_blank_values=True)
+        headers = dict(scope["headers"])
+        return (
+            scope["path"],
+            urlencode(sorted(query)),
+            tuple(headers.get(h) for h in VARY_HEADERS),
+        )
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "GET"
+            or scope["path"] not in self.paths
+        ):
+            return await self.app(scope, receive, send)
+
+        key = self._key(scope)
+        leader = self._inflight.get(key)
+        if leader is not None:
+            response = await asyncio.shield(leader)
+            if response is not None:
+                self.coalesced += 1
+                return await self._replay(response, send)
+            # the leader failed; serve this request on its own
+            return await self.app(scope, receive, send)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        start, body = None, []
+
+        async def capture(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                body.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, capture)
+        finally:
+            del self._inflight[key]
+            if start is not None and start["status"] < 500:
+                future.set_result((start, b"".join(body)))
+            else:
+                future.set_result(None)
+
+    async def _replay(self, response, send):
+        start, body = response
+        headers = list(start["headers"]) + [(b"x-coalesced", b"1")]
+        await send(
+            {"type": "http.response.start", "status": start["status"], "headers": headers}
+        )
+        await send({"type": "http.response.body", "body": body})
@@ -1,5 +1,19 @@
-from fastapi import FastAPI
-from app.db import create_db_and_tables, SessionLocal, seed_roles
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeout
+from app.admission import admission, AdmissionMiddleware, configure_threadpool
+from app.audit import audit_writer, AuditContextMiddleware
+from app.autocomplete import autocomplete
+from app.breaker import DatabaseUnavailable, QUERY_CANCELED
+from app.changes import hub
+from app.coalesce import SingleFlightMiddleware
+from app.db import breaker
+from app.idempotency import idempotency, IdempotencyMiddleware
+from app.ingest import load_buffer
+from app.openapi import document as openapi_document
+from app.profiling import ProfilerMiddleware
+from app.timeouts import TimeoutMiddleware
+from app.tracing import TracingMiddleware
 from app.routes import (
     provinces,
     cities,
@@ -14,16 +28,72 @@ from app.routes import (
     factory_pesticides,
     cars,
     drivers,
+    changes,
+    loads,
+    settlements,
+    dispatch,
+    audit_logs,
+    metrics,
+    docs,
+    autocomplete as autocomplete_routes,
+    sync,
+    distributions,
 )
 
 
 app = FastAPI(
-    title="Havirkesht", description="Havirkesht: choghandar project!", version="0.0.1"
+    title="Havirkesht",
+    description="Havirkesht: choghandar project!",
+    version="0.0.1",
+    # served from a prebuilt blob by routes/docs.py
+    openapi_url=None,
+    docs_url=None,
+    redoc_url=None,
 )
 
+app.add_middleware(ProfilerMiddleware)
+app.add_middleware(TimeoutMiddleware)
+app.add_middleware(AuditContextMiddleware)
+app.add_middleware(SingleFlightMiddleware)
+app.add_middleware(IdempotencyMiddleware, control=idempotency)
+app.add_middleware(TracingMiddleware)
+# outermost: requests queue here before anything else runs
+app.add_middleware(AdmissionMiddleware, control=admission)
 
 
 
+# -------- database errors --------
+LOCK_NOT_AVAILABLE = "55P03"
+
+
+def _unavailable(detail, retry_after):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": detail},
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
+@app.exception_handler(DatabaseUnavailable)
+def database_unavailable(request: Request, exc: DatabaseUnavailable):
+    return _unavailable("Database unavailable, retry later", exc.retry_after)
+
+
+@app.exception_handler(PoolTimeout)
+def pool_timeout(request: Request, exc: PoolTimeout):
+    breaker.record_failure()
+    return _unavailable("Database busy, retry later", 2)
+
+
+@app.exception_handler(OperationalError)
+def operational_error(request: Request, exc: OperationalError):
+    sqlstate = getattr(exc.orig, "sqlstate", None)
+    if sqlstate == QUERY_CANCELED:
+        return _unavailable("Query took too long", 2)
+    if sqlstate == LOCK_NOT_AVAILABLE:
+        return _unavailable("Row is locked by another request, retry later", 1)
+    raise exc
+
 
 @app.get("/test")
 def root():
@@ -31,13 +101,20 @@ def root():
 
 
 @app.on_event("startup")
-def on_startup():
-    create_db_and_tables()
-    db = SessionLocal()
-    try:
-        seed_roles(db)
-    finally:
-        db.close()
+async def on_startup():
+    configure_threadpool()
+    hub.start()
+    autocomplete.start()
+    load_buffer.start()
+    audit_writer.start()
+
+
+@app.on_event("shutdown")
+def on_shutdown():
+    # drain queued loads before the worker exits
+    load_buffer.stop()
+    audit_writer.stop()
+    hub.stop()
 
 
 app.include_router(users.router)
@@ -53,3 +130,15 @@ app.include_router(pesticides.router)
 app.include_router(factory_pesticides.router)
 app.include_router(cars.router)
 app.include_router(drivers.router)
+app.include_router(changes.router)
+app.include_router(loads.router)
+app.include_router(settlements.router)
+app.include_router(dispatch.router)
+app.include_router(audit_logs.router)
+app.include_router(metrics.router)
+app.include_router(autocomplete_routes.router)
+app.include_router(sync.router)
+app.include_router(distributions.router)
+app.include_router(docs.router)
+
+openapi_document.load(app)
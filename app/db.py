@@ -1,15 +1,51 @@
+import os
 from typing import Annotated
 from fastapi import Depends
-from sqlalchemy import create_engine, select
+from sqlalchemy import create_engine, make_url
 from sqlalchemy.orm import Session, sessionmaker, declarative_base
 
-DATABASE_URL = "postgresql+psycopg2://postgres:postgres@db:5432/havirkesht"
+from .breaker import CircuitBreaker
+from .tracing import instrument, span
+
+DATABASE_URL = os.getenv(
+    "DATABASE_URL", "postgresql+psycopg://postgres:postgres@db:5432/havirkesht"
+)
+
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+
+url = make_url(DATABASE_URL)
+engine_args = {}
+connect_args = {}
+if url.get_backend_name() == "postgresql":
+    engine_args.update(
+        pool_size=POOL_SIZE,
+        max_overflow=MAX_OVERFLOW,
+        # a saturated pool should surface quickly, not after 30s
+        pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "5")),
+    )
+if url.get_driver_name() == "psycopg":
+    # psycopg 3 turns a query into a server-side prepared statement after
+    # it has run this many times on a connection
+    connect_args["prepare_threshold"] = int(os.getenv("SQL_PREPARE_THRESHOLD", "2"))
 
 engine = create_engine(
     DATABASE_URL,
-    echo=True
+    echo=os.getenv("SQL_ECHO", "0") == "1",
+    # compiled SQL cache, keyed by statement shape (see app/queries.py)
+    query_cache_size=int(os.getenv("SQL_QUERY_CACHE_SIZE", "1200")),
+    connect_args=connect_args,
+    **engine_args,
 )
 
+breaker = CircuitBreaker(
+    failure_threshold=int(os.getenv("DB_BREAKER_THRESHOLD", "5")),
+    reset_timeout=float(os.getenv("DB_BREAKER_RESET", "10")),
+    window=float(os.getenv("DB_BREAKER_WINDOW", "30")),
+)
+breaker.watch(engine)
+instrument(engine)
+
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
@@ -18,44 +54,17 @@ SessionLocal = sessionmaker(
 
 Base = declarative_base()
 
-def create_db_and_tables():
-    Base.metadata.create_all(bind=engine)
+# schema and seed roles are managed by alembic (migrations/),
+# run once per deploy with: alembic upgrade head
 
 def get_session():
-    db = SessionLocal()
+    with span("get_session"):
+        # fail fast while the database is known to be down or saturated
+        breaker.check()
+        db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
 SessionDep = Annotated[Session, Depends(get_session)]
-
-
-def seed_roles(db: Session):
-    from app.models.roles import Role
-    roles = [
-        {
-            "id": 1,
-            "name": "پیمانکار/ادمین",
-            "scopes": ["admin", "contractor"],
-        },
-        {
-            "id": 2,
-            "name": "راننده",
-            "scopes": ["driver"],
-        },
-        {
-            "id": 3,
-            "name": "کشاورز",
-            "scopes": ["farmer"],
-        },
-    ]
-
-    for role_data in roles:
-        exists = db.scalar(
-            select(Role).where(Role.id == role_data["id"])
-        )
-        if not exists:
-            db.add(Role(**role_data))
-
-    db.commit()
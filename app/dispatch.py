@@ -0,0 +1,82 @@
+"""
+Harvest dispatch planning: pack village pickups onto drivers' trucks
+without exceeding Driver.capacity_ton.
+
+Heuristic: best-fit decreasing, with splitting. Village demands are taken
+largest first; each goes to the open truck whose remaining capacity fits
+it most tightly (bisect over a sorted list of remaining capacities). A
+demand that fits no truck fills the emptiest truck completely and its
+remainder is retried. When every truck of a round is full, a new round
+(second trip for every driver) starts. O(P log D + P * D) worst case for
+P pickups and D drivers, with a tiny constant.
+"""
+from bisect import bisect_left, insort
+from collections import deque
+from dataclasses import dataclass, field
+
+EPS = 1e-9
+
+
+@dataclass
+class Trip:
+    driver_id: int
+    round: int
+    load_ton: float = 0.0
+    stops: list = field(default_factory=list)  # [(village_id, tons)]
+
+
+def plan(pickups, drivers, max_rounds=None):
+    """
+    pickups: iterable of (village_id, tons); drivers: iterable of
+    (driver_id, capacity_ton). Returns (trips, unassigned) where unassigned
+    maps village_id to tons left over after max_rounds.
+    """
+    demand = {}
+    for village_id, tons in pickups:
+        demand[village_id] = demand.get(village_id, 0.0) + tons
+
+    queue = deque(
+        sorted(
+            ((v, t) for v, t in demand.items() if t > EPS),
+            key=lambda item: item[1],
+            reverse=True,
+        )
+    )
+    fleet = [(driver_id, cap) for driver_id, cap in drivers if cap > EPS]
+
+    trips = []
+    round_no = 0
+    while queue and fleet and (max_rounds is None or round_no < max_rounds):
+        round_no += 1
+        open_trucks = sorted((cap, i) for i, (_, cap) in enumerate(fleet))
+        round_trips = {}
+
+        while queue and open_trucks:
+            village_id, tons = queue.popleft()
+
+            pos = bisect_left(open_trucks, (tons - EPS, -1))
+            if pos < len(open_trucks):
+                remaining, i = open_trucks.pop(pos)  # tightest truck that fits
+                take = tons
+            else:
+                remaining, i = open_trucks.pop()  # nothing fits: fill the emptiest
+                take = remaining
+
+            trip = round_trips.get(i)
+            if trip is None:
+                trip = round_trips[i] = Trip(driver_id=fleet[i][0], round=round_no)
+            trip.stops.append((village_id, take))
+            trip.load_ton += take
+
+            if remaining - take > EPS:
+                insort(open_trucks, (remaining - take, i))
+            if tons - take > EPS:
+                queue.appendleft((village_id, tons - take))
+
+        trips.extend(round_trips.values())
+
+    unassigned = {}
+    for village_id, tons in queue:
+        unassigned[village_id] = unassigned.get(village_id, 0.0) + tons
+
+    return trips, unassigned
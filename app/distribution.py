@@ -0,0 +1,146 @@
+"""
+Issuing seed and pesticide to farmers.
+
+Stock is factory_seeds.amount / factory_pesticides.amount. Every stock
+row a batch draws from is decremented by one conditional statement,
+
+    UPDATE ... SET amount = amount - n WHERE id = ... AND amount >= n RETURNING amount
+
+and Postgres re-checks the condition on the latest row version after
+waiting for a concurrent writer, so two clerks can never both hand out
+the last bags. There is no read-modify-write to race.
+
+A batch is all or nothing. Demand is summed per stock row first (a
+thousand farmers served from one allocation cost one UPDATE), rows are
+decremented in a fixed order so concurrent batches cannot deadlock, and
+the FarmerAllocation rows go in with one INSERT. If any row is short the
+transaction rolls back and OutOfStock lists every short row. Both writes
+are Core statements, so their audit entries are recorded here.
+"""
+from collections import defaultdict
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.orm import Session
+
+from .audit import core_entry, record
+from .changes import notify
+from .models import FactoryPesticide, FactorySeed, FarmerAllocation
+
+# kind -> (stock model, FarmerAllocation column)
+KINDS = {
+    "seed": (FactorySeed, "factory_seed_id"),
+    "pesticide": (FactoryPesticide, "factory_pesticide_id"),
+}
+
+
+class OutOfStock(Exception):
+    def __init__(self, short):
+        # [{"kind", "id", "requested", "available"}], available is None
+        # for rows that do not exist in the crop year
+        self.short = short
+        super().__init__(f"{len(short)} stock rows short")
+
+
+def _demand(items):
+    demand = defaultdict(float)
+    for item in items:
+        for kind, (_, column) in KINDS.items():
+            if item.get(column) is not None:
+                demand[kind, item[column]] += item["amount"]
+    return demand
+
+
+def _available(session, crop_year_id, short):
+    for row in short:
+        model, _ = KINDS[row["kind"]]
+        row["available"] = session.scalar(
+            select(model.amount).where(
+                model.id == row["id"], model.crop_year_id == crop_year_id
+            )
+        )
+    return short
+
+
+def issue(session: Session, crop_year_id: int, items: list[dict]):
+    """
+    Take stock for items and record one FarmerAllocation each, then commit.
+    Items carry farmer_id, amount and factory_seed_id or factory_pesticide_id.
+    Returns (allocation ids in item order, {(kind, stock id): amount left}).
+    """
+    demand = _demand(items)
+    remaining, short = {}, []
+    for kind, stock_id in sorted(demand):
+        model, _ = KINDS[kind]
+        requested = demand[kind, stock_id]
+        left = session.execute(
+            update(model)
+            .where(
+                model.id == stock_id,
+                model.crop_year_id == crop_year_id,
+                model.deleted_at.is_(None),
+                model.amount >= requested,
+            )
+            .values(amount=model.amount - requested)
+            .returning(model.amount)
+            .execution_options(synchronize_session=False)
+        ).scalar_one_or_none()
+        if left is None:
+            short.append({"kind": kind, "id": stock_id, "requested": requested})
+        else:
+            remaining[kind, stock_id] = left
+
+    if short:
+        session.rollback()
+        raise OutOfStock(_available(session, crop_year_id, short))
+
+    rows = [
+        {
+            "farmer_id": item["farmer_id"],
+            "crop_year_id": crop_year_id,
+            "factory_seed_id": item.get("factory_seed_id"),
+            "factory_pesticide_id": item.get("factory_pesticide_id"),
+            "amount": item["amount"],
+        }
+        for item in items
+    ]
+    try:
+        ids = session.scalars(
+            insert(FarmerAllocation).returning(
+                FarmerAllocation.id, sort_by_parameter_order=True
+            ),
+            rows,
+        ).all()
+        record(
+            session,
+            [
+                core_entry(
+                    KINDS[kind][0].__tablename__,
+                    id_,
+                    "update",
+                    {"amount": (left + demand[kind, id_], left)},
+                )
+                for (kind, id_), left in remaining.items()
+            ]
+            + [
+                core_entry(
+                    "farmer_allocations",
+                    id_,
+                    "create",
+                    {key: (None, value) for key, value in row.items()},
+                )
+                for id_, row in zip(ids, rows)
+            ],
+        )
+        notify(
+            session.connection(),
+            [
+                {"entity": KINDS[kind][0].__tablename__, "id": id_, "action": "update"}
+                for kind, id_ in remaining
+            ]
+            + [{"entity": "farmer_allocations", "id": id_, "action": "create"} for id_ in ids],
+        )
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    return ids, remaining
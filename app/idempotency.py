@@ -0,0 +1,362 @@
+"""
+Idempotency-Key support for POSTs.
+
+Field clients on flaky links retry POSTs they never saw the answer to.
+A POST carrying an Idempotency-Key header runs once; its response is
+kept and every retry with the same key (same caller, same path) gets
+that response back without reaching the route.
+
+Completed responses sit in a bounded per-worker LRU, so a retry landing
+on the same worker is one dict lookup. Every key is also claimed in the
+idempotency_keys table before the route runs, which covers the other
+workers, restarts and two copies of a request arriving at once (the
+second gets 409 while the first runs). Server errors are not kept: the
+claim is released and the retry runs again. While the database is down
+or saturated a keyed POST gets the same 503 + Retry-After as any other
+request, unless its response is already in the LRU.
+
+    python -m app.idempotency prune   # drop keys past IDEMPOTENCY_TTL_HOURS
+"""
+import datetime
+import hashlib
+import json
+import logging
+import os
+import sys
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from sqlalchemy import delete, func, null, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import OperationalError, TimeoutError as PoolTimeout
+from starlette.concurrency import run_in_threadpool
+
+from .breaker import DatabaseUnavailable
+from .db import breaker, engine
+from .models.idempotency_keys import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+MAX_KEY_LENGTH = 255
+# larger responses are not kept; their retries run again
+MAX_STORED_BODY = 1024 * 1024
+
+# headers that identify the caller: the same key from two callers is two keys
+CALLER_HEADERS = (b"authorization", b"x-actor")
+# per-response headers a replay must not repeat
+UNSTORED_HEADERS = {b"date", b"server", b"traceparent", b"x-profile-id", b"x-request-id"}
+
+
+class Stored(NamedTuple):
+    fingerprint: str
+    status: int | None  # None while the first request runs
+    headers: list
+    body: bytes
+    # time.time() at which the durable key expires: created_at + TTL
+    expires_at: float = 0.0
+
+
+class ResponseCache:
+    """
+    Bounded LRU of completed responses, each dropped when its durable key
+    expires so a replay never outlives the key.
+    """
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> Stored
+
+    def get(self, key):
+        stored = self._entries.get(key)
+        if stored is None:
+            return None
+        if stored.expires_at < time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return stored
+
+    def put(self, key, stored):
+        self._entries[key] = stored
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+class IdempotencyStore:
+    """
+    The durable side: one idempotency_keys row per key.
+    """
+
+    def __init__(self, ttl, claim_timeout):
+        self.ttl = datetime.timedelta(seconds=ttl)
+        # a claim this old without a response belongs to a dead worker
+        self.claim_timeout = datetime.timedelta(seconds=claim_timeout)
+
+    def claim(self, key, fingerprint):
+        """
+        (owned, stored): owned is the expiry of the key when this request
+        now owns it, else None and stored is what is kept for it.
+        """
+        table = IdempotencyKey
+        stmt = insert(table).values(key=key, fingerprint=fingerprint)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.key],
+            set_={
+                "fingerprint": stmt.excluded.fingerprint,
+                "status_code": None,
+                "headers": null(),
+                "body": None,
+                "created_at": func.now(),
+            },
+            # take over expired keys and abandoned claims
+            where=or_(
+                table.created_at < func.now() - self.ttl,
+                (table.status_code.is_(None))
+                & (table.created_at < func.now() - self.claim_timeout),
+            ),
+        ).returning(table.created_at)
+
+        with engine.begin() as connection:
+            created_at = connection.execute(stmt).scalar()
+            if created_at is not None:
+                return self._expiry(created_at), None
+            row = connection.execute(
+                select(
+                    table.fingerprint,
+                    table.status_code,
+                    table.headers,
+                    table.body,
+                    table.created_at,
+                ).where(table.key == key)
+            ).first()
+        if row is None:
+            # released or pruned in between: let the client retry
+            return None, Stored(fingerprint, None, [], b"")
+        return None, Stored(
+            row.fingerprint,
+            row.status_code,
+            row.headers or [],
+            row.body or b"",
+            self._expiry(row.created_at),
+        )
+
+    def _expiry(self, created_at):
+        return (created_at + self.ttl).timestamp()
+
+    def save(self, key, stored):
+        with engine.begin() as connection:
+            connection.execute(
+                update(IdempotencyKey)
+                .where(IdempotencyKey.key == key)
+                .values(status_code=stored.status, headers=stored.headers, body=stored.body)
+            )
+
+    def release(self, key):
+        with engine.begin() as connection:
+            connection.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.key == key, IdempotencyKey.status_code.is_(None)
+                )
+            )
+
+    def prune(self) -> int:
+        with engine.begin() as connection:
+            result = connection.execute(
+                delete(IdempotencyKey).where(
+                    IdempotencyKey.created_at < func.now() - self.ttl
+                )
+            )
+        return result.rowcount
+
+
+class Idempotency:
+    def __init__(self, cache, store):
+        self.cache = cache
+        self.store = store
+        self.replayed = 0
+        self.conflicts = 0
+
+    def lookup(self, key):
+        return self.cache.get(key)
+
+    async def claim(self, key, fingerprint):
+        # the same fail-fast as get_session: this runs outside the routes
+        breaker.check()
+        try:
+            return await run_in_threadpool(self.store.claim, key, fingerprint)
+        except PoolTimeout:
+            breaker.record_failure()
+            raise
+
+    async def finish(self, key, stored):
+        try:
+            if stored is not None:
+                await run_in_threadpool(self.store.save, key, stored)
+                self.cache.put(key, stored)
+            else:
+                await run_in_threadpool(self.store.release, key)
+        except Exception:
+            # the claim times out on its own; retries then run again
+            logger.exception("could not store idempotent response")
+
+
+TTL = float(os.getenv("IDEMPOTENCY_TTL_HOURS", "24")) * 3600
+idempotency = Idempotency(
+    ResponseCache(int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))),
+    IdempotencyStore(TTL, float(os.getenv("IDEMPOTENCY_CLAIM_TIMEOUT", "60"))),
+)
+
+
+# -------- middleware --------
+def _key(scope, headers, client_key):
+    digest = hashlib.sha256()
+    for name in CALLER_HEADERS:
+        digest.update(headers.get(name, b"") + b"\0")
+    digest.update(scope["path"].encode() + b"\0" + client_key)
+    return digest.hexdigest()
+
+
+async def _read_body(receive):
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] != "http.request":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+async def _respond(send, status, headers, body):
+    await send({"type": "http.response.start", "status": status, "headers": headers})
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _error(send, status, detail, headers=()):
+    body = json.dumps({"detail": detail}).encode()
+    await _respond(
+        send, status, [(b"content-type", b"application/json"), *headers], body
+    )
+
+
+async def _unavailable(send, detail, retry_after):
+    await _error(send, 503, detail, [(b"retry-after", str(retry_after).encode())])
+
+
+class IdempotencyMiddleware:
+    def __init__(self, app, control=idempotency):
+        self.app = app
+        self.control = control
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST":
+            return await self.app(scope, receive, send)
+        headers = dict(scope["headers"])
+        client_key = headers.get(b"idempotency-key")
+        if client_key is None:
+            return await self.app(scope, receive, send)
+        if not 0 < len(client_key) <= MAX_KEY_LENGTH:
+            return await _error(
+                send, 400, f"Idempotency-Key must be 1 to {MAX_KEY_LENGTH} characters"
+            )
+
+        body = await _read_body(receive)
+        key = _key(scope, headers, client_key)
+        fingerprint = hashlib.sha256(scope["query_string"] + b"\0" + body).hexdigest()
+
+        stored = self.control.lookup(key)
+        if stored is None:
+            # outside ExceptionMiddleware: map database trouble to 503 here
+            try:
+                expires_at, stored = await self.control.claim(key, fingerprint)
+            except DatabaseUnavailable as exc:
+                return await _unavailable(
+                    send, "Database unavailable, retry later", exc.retry_after
+                )
+            except PoolTimeout:
+                return await _unavailable(send, "Database busy, retry later", 2)
+            except OperationalError:
+                logger.exception("could not claim idempotency key")
+                return await _unavailable(send, "Database unavailable, retry later", 2)
+        if stored is not None:
+            return await self._answer(key, stored, fingerprint, send)
+
+        # this request owns the key: run it and keep the response
+        sent = False
+
+        async def replay_body():
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": body, "more_body": False}
+            return await receive()
+
+        start, chunks = None, []
+
+        async def capture(message):
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, replay_body, capture)
+        finally:
+            response = b"".join(chunks)
+            keep = (
+                start is not None
+                and start["status"] < 500
+                and len(response) <= MAX_STORED_BODY
+            )
+            await self.control.finish(
+                key,
+                Stored(
+                    fingerprint,
+                    start["status"],
+                    [
+                        [name.decode("latin-1"), value.decode("latin-1")]
+                        for name, value in start["headers"]
+                        if name.lower() not in UNSTORED_HEADERS
+                    ],
+                    response,
+                    expires_at,
+                )
+                if keep
+                else None,
+            )
+
+    async def _answer(self, key, stored, fingerprint, send):
+        if stored.fingerprint != fingerprint:
+            self.control.conflicts += 1
+            return await _error(
+                send, 422, "Idempotency-Key was already used for a different request"
+            )
+        if stored.status is None:
+            self.control.conflicts += 1
+            return await _error(
+                send,
+                409,
+                "A request with this Idempotency-Key is still in progress",
+                [(b"retry-after", b"1")],
+            )
+        self.control.cache.put(key, stored)
+        self.control.replayed += 1
+        headers = [
+            (name.encode("latin-1"), value.encode("latin-1"))
+            for name, value in stored.headers
+        ]
+        await _respond(
+            send, stored.status, headers + [(b"idempotent-replayed", b"true")], stored.body
+        )
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["prune"]:
+        print(f"pruned {idempotency.store.prune()} idempotency keys")
+    else:
+        print(__doc__)
@@ -0,0 +1,185 @@
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future
+
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError
+
+from .audit import audit_writer, core_entry, request_context
+from .changes import notify
+from .db import engine
+from .models.loads import Load
+
+logger = logging.getLogger(__name__)
+
+
+class IngestOverloaded(Exception):
+    pass
+
+
+class LoadIngestBuffer:
+    """
+    Group commit for weighbridge loads.
+
+    Requests hand their rows to the buffer and wait on a Future; a single
+    writer thread drains everything queued so far (up to batch_size rows)
+    into one INSERT ... ON CONFLICT DO NOTHING transaction. Under burst
+    load many terminals share one round trip and one commit, while a lone
+    request still waits at most flush_interval.
+    """
+
+    def __init__(self, batch_size=2000, flush_interval=0.02, max_pending=50000):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._pending = deque()  # (rows, future, audit context)
+        self._pending_rows = 0
+        self._cond = threading.Condition()
+        self._stop = False
+        self._thread = None
+
+    @property
+    def pending_rows(self):
+        return self._pending_rows
+
+    def submit(self, rows) -> Future:
+        future = Future()
+        with self._cond:
+            if self._pending_rows + len(rows) > self.max_pending:
+                raise IngestOverloaded()
+            was_idle = not self._pending
+            self._pending.append((rows, future, request_context()))
+            self._pending_rows += len(rows)
+            if was_idle or self._pending_rows >= self.batch_size:
+                self._cond.notify()
+        return future
+
+    # -------- writer thread --------
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop = False
+        self._thread = threading.Thread(
+            target=self._run, name="load-ingest", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=30)
+            self._thread = None
+
+    def _take_batch(self):
+        batch, taken = [], 0
+        while self._pending and (not batch or taken < self.batch_size):
+            item = self._pending.popleft()
+            batch.append(item)
+            taken += len(item[0])
+        self._pending_rows -= taken
+        return batch
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stop:
+                    self._cond.wait()
+                if self._pending_rows < self.batch_size and not self._stop:
+                    # give concurrent requests a moment to join this batch
+                    self._cond.wait(self.flush_interval)
+                if self._stop and not self._pending:
+                    return
+                batch = self._take_batch()
+            if batch:
+                try:
+                    self._flush(batch)
+                except Exception as exc:
+                    # the writer must outlive any error, or every later
+                    # request would wait forever
+                    logger.exception("load ingest flush failed")
+                    for _, future, _ in batch:
+                        if not future.done():
+                            future.set_exception(exc)
+
+    def _flush(self, batch):
+        try:
+            results = self._write([(rows, context) for rows, _, context in batch])
+        except DBAPIError:
+            # e.g. an unknown farmer_id: retry request by request so one bad
+            # terminal cannot fail everybody else's loads
+            logger.warning("batched load insert failed, retrying per request")
+            for i, (rows, future, context) in enumerate(batch):
+                try:
+                    (result,) = self._write([(rows, context)])
+                except DBAPIError as exc:
+                    future.set_exception(exc)
+                except Exception as exc:
+                    # e.g. a pool timeout: the rest would fail the same way
+                    for _, pending, _ in batch[i:]:
+                        pending.set_exception(exc)
+                    return
+                else:
+                    future.set_result(result)
+            return
+        except Exception as exc:
+            for _, future, _ in batch:
+                future.set_exception(exc)
+            return
+
+        for (_, future, _), result in zip(batch, results):
+            future.set_result(result)
+
+    def _write(self, groups):
+        """
+        Insert every (rows, audit context) group in one transaction;
+        per group (inserted, duplicates).
+        """
+        first = {}  # key -> (row, audit context) of its first occurrence
+        for rows, context in groups:
+            for row in rows:
+                key = (row["terminal_id"], row["terminal_load_id"])
+                first.setdefault(key, (row, context))
+        unique_rows = [row for row, _ in first.values()]
+
+        stmt = (
+            insert(Load)
+            .on_conflict_do_nothing(index_elements=["terminal_id", "terminal_load_id"])
+            .returning(Load.id, Load.terminal_id, Load.terminal_load_id)
+        )
+
+        with engine.begin() as connection:
+            inserted = connection.execute(stmt, unique_rows).all()
+            notify(
+                connection,
+                [{"entity": "loads", "id": r.id, "action": "create"} for r in inserted],
+            )
+
+        entries = []
+        for r in inserted:
+            row, context = first[r.terminal_id, r.terminal_load_id]
+            changes = {key: (None, value) for key, value in row.items()}
+            entries.append(core_entry("loads", r.id, "create", changes, context))
+        audit_writer.submit(entries)
+
+        new_keys = {(r.terminal_id, r.terminal_load_id) for r in inserted}
+        results = []
+        for rows, _ in groups:
+            count = 0
+            for row in rows:
+                key = (row["terminal_id"], row["terminal_load_id"])
+                if key in new_keys:
+                    new_keys.discard(key)  # credit a key to one request only
+                    count += 1
+            results.append((count, len(rows) - count))
+        return results
+
+
+load_buffer = LoadIngestBuffer(
+    batch_size=int(os.getenv("LOAD_INGEST_BATCH_SIZE", "2000")),
+    flush_interval=float(os.getenv("LOAD_INGEST_FLUSH_INTERVAL", "0.02")),
+    max_pending=int(os.getenv("LOAD_INGEST_MAX_PENDING", "50000")),
+)
@@ -0,0 +1,82 @@
+"""
+Request-scoped batch loading.
+
+Handlers that return several entities ask the loader for related rows
+(car of each driver, measure unit of each seed, factory and crop year of
+each allocation) instead of touching the relationships one by one. Every
+wanted id of a type is fetched with one `IN (...)` query, and the rows
+land in the session's identity map, so the relationship attributes used
+by from_orm_* afterwards resolve without SQL.
+
+The loader lives on the session, so it is shared by everything that
+runs within one request.
+"""
+from typing import Annotated
+
+from fastapi import Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+MAX_IDS = 100
+
+
+class BatchLoader:
+    def __init__(self, session: Session):
+        self.session = session
+        self._loaded = {}  # model -> {id: obj}
+
+    def load_many(self, model, ids) -> dict:
+        """
+        {id: obj} for the ids that exist; one query for those not seen yet.
+        """
+        cache = self._loaded.setdefault(model, {})
+        missing = {i for i in ids if i is not None and i not in cache}
+        if missing:
+            for obj in self.session.scalars(
+                select(model).where(model.id.in_(sorted(missing)))
+            ):
+                cache[obj.id] = obj
+        return {i: cache[i] for i in ids if i in cache}
+
+    def load(self, model, id_):
+        return self.load_many(model, [id_]).get(id_)
+
+    def prime(self, objs, *paths):
+        """
+        Batch-load many-to-one relationships of objs. A path is a
+        relationship attribute or a tuple of them, e.g.
+        prime(rows, FactorySeed.factory, (FactorySeed.seed, Seed.measure_unit)).
+        """
+        for path in paths:
+            level = list(objs)
+            for attr in path if isinstance(path, tuple) else (path,):
+                prop = attr.property
+                (local, _), = prop.local_remote_pairs
+                fk = prop.parent.get_property_by_column(local).key
+                related = self.load_many(
+                    prop.mapper.class_, {getattr(o, fk) for o in level}
+                )
+                level = list(related.values())
+
+
+def get_loader(session: Session) -> BatchLoader:
+    loader = session.info.get("loader")
+    if loader is None:
+        loader = session.info["loader"] = BatchLoader(session)
+    return loader
+
+
+def parse_ids(
+    ids: str = Query(..., description=f"Comma separated ids, at most {MAX_IDS}")
+) -> list[int]:
+    try:
+        values = [int(v) for v in ids.split(",") if v.strip()]
+    except ValueError:
+        raise HTTPException(status_code=422, detail="ids must be comma separated integers")
+    if not values or len(values) > MAX_IDS:
+        raise HTTPException(status_code=422, detail=f"Pass between 1 and {MAX_IDS} ids")
+    # keep the caller's order, drop repeats
+    return list(dict.fromkeys(values))
+
+
+IdsDep = Annotated[list[int], Depends(parse_ids)]
@@ -11,4 +11,12 @@ from .factory_seeds import FactorySeed
 from .pesticides import Pesticide
 from .factory_pesticides import FactoryPesticide
 from .cars import Car
-from .drivers import Driver
\ No newline at end of file
+from .drivers import Driver
+from .loads import Load
+from .farmer_allocations import FarmerAllocation
+from .settlements import FarmerSettlement
+from .audit_logs import AuditLog
+from .deletions import Deletion
+from .factory_seed_prices import FactorySeedPrice
+from .factory_pesticide_prices import FactoryPesticidePrice
+from .idempotency_keys import IdempotencyKey
\ No newline at end of file
@@ -0,0 +1,30 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import BigInteger, String, DateTime, Index
+from sqlalchemy.dialects.postgresql import JSONB
+from ..db import Base as SQLAlchemyBase
+
+
+class AuditLog(SQLAlchemyBase):
+    __tablename__ = "audit_logs"
+    __table_args__ = (
+        Index("ix_audit_logs_entity", "entity", "entity_id", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+
+    entity: Mapped[str] = mapped_column(String(50), nullable=False)
+    entity_id: Mapped[int | None] = mapped_column(BigInteger, nullable=True)
+    action: Mapped[str] = mapped_column(String(10), nullable=False)
+
+    # {"field": {"before": ..., "after": ...}}
+    changes: Mapped[dict] = mapped_column(JSONB, nullable=False)
+
+    actor: Mapped[str | None] = mapped_column(String(150), nullable=True)
+    request: Mapped[str | None] = mapped_column(String(255), nullable=True)
+
+    # time of the change itself, not of the (later) batched write
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        index=True,
+    )
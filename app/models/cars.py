@@ -1,14 +1,18 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import BigInteger, String, DateTime, func
 from ..db import Base as SQLAlchemyBase
+from ..softdelete import SoftDelete, live_unique
 
 
-class Car(SQLAlchemyBase):
+class Car(SoftDelete, SQLAlchemyBase):
     __tablename__ = "cars"
+    __table_args__ = (
+        live_unique("cars", "name"),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
 
-    name: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
 
     created_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True),
@@ -21,6 +25,7 @@ class Car(SQLAlchemyBase):
         server_default=func.now(),
         onupdate=func.now(),
         nullable=False,
+        index=True,
     )
 
     drivers = relationship("Driver", back_populates="car")
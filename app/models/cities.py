@@ -1,14 +1,28 @@
 from ..db import Base as SQLAlchemyBase
+from ..softdelete import SoftDelete
+from ..text import searchable
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import Integer, BigInteger, String, ForeignKey, DateTime, func
 
-class City(SQLAlchemyBase):
+@searchable("city")
+class City(SoftDelete, SQLAlchemyBase):
     __tablename__ = "cities"
     
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     city: Mapped[str] = mapped_column(String, nullable=False)
-    province_id: Mapped[int] = mapped_column(ForeignKey("provinces.id"), nullable=False)
+    # normalized copy of the name columns for search, see app/text.py
+    search_text: Mapped[str] = mapped_column(String, nullable=False, server_default="")
+    province_id: Mapped[int] = mapped_column(
+        ForeignKey("provinces.id"), nullable=False, index=True
+    )
     created_at: Mapped[DateTime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    updated_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+        index=True,
+    )
 
     province = relationship("Province", back_populates="cities")
     villages = relationship("Village", back_populates="city")
\ No newline at end of file
@@ -1,10 +1,14 @@
 from ..db import Base as SQLAlchemyBase
+from ..softdelete import SoftDelete, live_unique
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import BigInteger, String, DateTime, func
+from sqlalchemy import BigInteger, String, DateTime, Float, func
 
 
-class CropYear(SQLAlchemyBase):
+class CropYear(SoftDelete, SQLAlchemyBase):
     __tablename__ = "crop_years"
+    __table_args__ = (
+        live_unique("crop_years", "crop_year_name"),
+    )
 
     id: Mapped[int] = mapped_column(
         BigInteger,
@@ -14,11 +18,15 @@ class CropYear(SQLAlchemyBase):
 
     crop_year_name: Mapped[str] = mapped_column(
         String(100),
-        unique=True,
         nullable=False,
-        index=True,
     )
 
+    # -------- settlement rates --------
+    beet_price_per_ton: Mapped[float | None] = mapped_column(Float, nullable=True)
+    base_sugar_grade: Mapped[float | None] = mapped_column(Float, nullable=True)
+    sugar_quota_kg_per_ton: Mapped[float | None] = mapped_column(Float, nullable=True)
+    pulp_quota_kg_per_ton: Mapped[float | None] = mapped_column(Float, nullable=True)
+
     created_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True),
         server_default=func.now(),
@@ -30,6 +38,7 @@ class CropYear(SQLAlchemyBase):
         server_default=func.now(),
         onupdate=func.now(),
         nullable=False,
+        index=True,
     )
 
     factory_seeds = relationship("FactorySeed", back_populates="crop_year")
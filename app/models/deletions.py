@@ -0,0 +1,20 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import BigInteger, String, DateTime, Index, func
+
+from ..db import Base as SQLAlchemyBase
+
+
+class Deletion(SQLAlchemyBase):
+    """
+    Tombstone of a deleted row, for delta sync (app/sync.py).
+    """
+
+    __tablename__ = "deletions"
+    __table_args__ = (Index("ix_deletions_deleted_at", "deleted_at"),)
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    entity: Mapped[str] = mapped_column(String(50), nullable=False)
+    entity_id: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    deleted_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
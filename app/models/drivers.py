@@ -8,24 +8,34 @@ from sqlalchemy import (
     func,
 )
 from ..db import Base as SQLAlchemyBase
+from ..softdelete import SoftDelete, live_unique
+from ..text import searchable
 
 
-class Driver(SQLAlchemyBase):
+@searchable("name", "last_name", "national_code", "phone_number")
+class Driver(SoftDelete, SQLAlchemyBase):
     __tablename__ = "drivers"
+    __table_args__ = (
+        live_unique("drivers", "national_code"),
+        live_unique("drivers", "phone_number"),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
 
     name: Mapped[str] = mapped_column(String(100), nullable=False)
     last_name: Mapped[str] = mapped_column(String(100), nullable=False)
 
-    national_code: Mapped[str] = mapped_column(String(10), nullable=False, unique=True)
+    national_code: Mapped[str] = mapped_column(String(10), nullable=False)
 
-    phone_number: Mapped[str] = mapped_column(String(11), nullable=False, unique=True)
+    phone_number: Mapped[str] = mapped_column(String(11), nullable=False)
+    # normalized copy of the name columns for search, see app/text.py
+    search_text: Mapped[str] = mapped_column(String, nullable=False, server_default="")
 
     car_id: Mapped[int] = mapped_column(
         BigInteger,
         ForeignKey("cars.id", ondelete="RESTRICT"),
         nullable=False,
+        index=True,
     )
 
     license_plate: Mapped[str] = mapped_column(String(20), nullable=False)
@@ -43,6 +53,7 @@ class Driver(SQLAlchemyBase):
         server_default=func.now(),
         onupdate=func.now(),
         nullable=False,
+        index=True,
     )
 
     # -------- relationships --------
@@ -1,13 +1,21 @@
 from ..db import Base as SQLAlchemyBase
+from ..softdelete import SoftDelete, live_unique
+from ..text import searchable
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import BigInteger, String, DateTime, func
 
 
-class Factory(SQLAlchemyBase):
+@searchable("factory_name")
+class Factory(SoftDelete, SQLAlchemyBase):
     __tablename__ = "factories"
+    __table_args__ = (
+        live_unique("factories", "factory_name"),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
-    factory_name: Mapped[str] = mapped_column(String(255), nullable=False, unique=True)
+    factory_name: Mapped[str] = mapped_column(String(255), nullable=False)
+    # normalized copy of the name columns for search, see app/text.py
+    search_text: Mapped[str] = mapped_column(String, nullable=False, server_default="")
 
     created_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True),
@@ -20,6 +28,7 @@ class Factory(SQLAlchemyBase):
         server_default=func.now(),
         onupdate=func.now(),
         nullable=False,
+        index=True,
     )
 
     factory_seeds = relationship("FactorySeed", back_populates="factory")
@@ -0,0 +1,43 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import BigInteger, ForeignKey, DateTime, Float, func
+from sqlalchemy.dialects.postgresql import TSTZRANGE, ExcludeConstraint
+from ..db import Base as SQLAlchemyBase
+
+
+class FactoryPesticidePrice(SQLAlchemyBase):
+    """
+    Prices of a factory pesticide allocation over time, one row per validity
+    period, written by app/prices.py whenever the prices change.
+    """
+
+    __tablename__ = "factory_pesticide_prices"
+    __table_args__ = (
+        # periods of one allocation never overlap; the GiST index behind
+        # it answers "price of allocation X at time T"
+        ExcludeConstraint(
+            ("factory_pesticide_id", "="),
+            ("valid_during", "&&"),
+            using="gist",
+            name="ex_factory_pesticide_prices_no_overlap",
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+
+    factory_pesticide_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("factory_pesticides.id", ondelete="RESTRICT"),
+        nullable=False,
+    )
+
+    farmer_price: Mapped[float] = mapped_column(Float, nullable=False)
+    factory_price: Mapped[float] = mapped_column(Float, nullable=False)
+
+    # [from, until), until is open for the current prices
+    valid_during = mapped_column(TSTZRANGE, nullable=False)
+
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
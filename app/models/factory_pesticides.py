@@ -1,10 +1,16 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import BigInteger, Integer, ForeignKey, DateTime, Float, func
 from ..db import Base as SQLAlchemyBase
+from ..softdelete import SoftDelete, live_unique
 
 
-class FactoryPesticide(SQLAlchemyBase):
+class FactoryPesticide(SoftDelete, SQLAlchemyBase):
     __tablename__ = "factory_pesticides"
+    __table_args__ = (
+        # one allocation per factory, pesticide and crop year; factory_id
+        # leads, so it also serves ?factory_id=
+        live_unique("factory_pesticides", "factory_id", "pesticide_id", "crop_year_id"),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
 
@@ -18,12 +24,14 @@ class FactoryPesticide(SQLAlchemyBase):
         BigInteger,
         ForeignKey("pesticides.id", ondelete="RESTRICT"),
         nullable=False,
+        index=True,
     )
 
     crop_year_id: Mapped[int] = mapped_column(
         BigInteger,
         ForeignKey("crop_years.id", ondelete="RESTRICT"),
         nullable=False,
+        index=True,
     )
 
     amount: Mapped[float] = mapped_column(Float, nullable=False)
@@ -42,6 +50,7 @@ class FactoryPesticide(SQLAlchemyBase):
         server_default=func.now(),
         onupdate=func.now(),
         nullable=False,
+        index=True,
     )
 
     # -------- relationships --------
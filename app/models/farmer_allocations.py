@@ -0,0 +1,77 @@
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    BigInteger,
+    Integer,
+    ForeignKey,
+    DateTime,
+    Float,
+    CheckConstraint,
+    Index,
+    func,
+)
+from ..db import Base as SQLAlchemyBase
+
+
+class FarmerAllocation(SQLAlchemyBase):
+    """
+    Seed or pesticide handed to a farmer out of a factory allocation;
+    deducted from the farmer's statement at settlement.
+    """
+
+    __tablename__ = "farmer_allocations"
+    __table_args__ = (
+        CheckConstraint(
+            "(factory_seed_id IS NULL) <> (factory_pesticide_id IS NULL)",
+            name="ck_farmer_allocations_one_item",
+        ),
+        Index("ix_farmer_allocations_crop_year_farmer", "crop_year_id", "farmer_id"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+
+    farmer_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("users.id", ondelete="RESTRICT"),
+        nullable=False,
+    )
+
+    crop_year_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("crop_years.id", ondelete="RESTRICT"),
+        nullable=False,
+    )
+
+    factory_seed_id: Mapped[int | None] = mapped_column(
+        BigInteger,
+        ForeignKey("factory_seeds.id", ondelete="RESTRICT"),
+        nullable=True,
+        index=True,
+    )
+
+    factory_pesticide_id: Mapped[int | None] = mapped_column(
+        BigInteger,
+        ForeignKey("factory_pesticides.id", ondelete="RESTRICT"),
+        nullable=True,
+        index=True,
+    )
+
+    amount: Mapped[float] = mapped_column(Float, nullable=False)
+
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    updated_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    # -------- relationships --------
+    farmer = relationship("User")
+    crop_year = relationship("CropYear")
+    factory_seed = relationship("FactorySeed")
+    factory_pesticide = relationship("FactoryPesticide")
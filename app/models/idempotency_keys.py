@@ -0,0 +1,31 @@
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import DateTime, Integer, LargeBinary, String, func
+from sqlalchemy.dialects.postgresql import JSONB
+from ..db import Base as SQLAlchemyBase
+
+
+class IdempotencyKey(SQLAlchemyBase):
+    """
+    Response to a POST sent with an Idempotency-Key, replayed to its
+    retries (app/idempotency.py). status_code is NULL while the first
+    request is still running.
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    # sha256 of caller, path and the client's key
+    key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    # sha256 of query string and body, to catch a key reused for another request
+    fingerprint: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    status_code: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    # [[name, value], ...]
+    headers: Mapped[list | None] = mapped_column(JSONB, nullable=True)
+    body: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+        index=True,
+    )
@@ -0,0 +1,86 @@
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    BigInteger,
+    Integer,
+    String,
+    DateTime,
+    Float,
+    ForeignKey,
+    Index,
+    UniqueConstraint,
+    func,
+)
+from ..db import Base as SQLAlchemyBase
+
+
+class Load(SQLAlchemyBase):
+    __tablename__ = "loads"
+    __table_args__ = (
+        # weighbridge terminals retry freely; (terminal, their id) is the idempotency key
+        UniqueConstraint(
+            "terminal_id", "terminal_load_id", name="uq_loads_terminal_load"
+        ),
+        Index("ix_loads_crop_year_farmer", "crop_year_id", "farmer_id"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+
+    terminal_id: Mapped[str] = mapped_column(String(50), nullable=False)
+    terminal_load_id: Mapped[str] = mapped_column(String(64), nullable=False)
+
+    farmer_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("users.id", ondelete="RESTRICT"),
+        nullable=False,
+        index=True,
+    )
+
+    driver_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("drivers.id", ondelete="RESTRICT"),
+        nullable=False,
+        index=True,
+    )
+
+    factory_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("factories.id", ondelete="RESTRICT"),
+        nullable=False,
+    )
+
+    crop_year_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("crop_years.id", ondelete="RESTRICT"),
+        nullable=False,
+    )
+
+    # وزن بار
+    weight_kg: Mapped[float] = mapped_column(Float, nullable=False)
+    # عیار
+    sugar_grade: Mapped[float] = mapped_column(Float, nullable=False)
+    # درصد افت
+    loss_percent: Mapped[float] = mapped_column(Float, nullable=False)
+
+    weighed_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+    )
+
+    created_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    updated_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+    )
+
+    # -------- relationships --------
+    farmer = relationship("User")
+    driver = relationship("Driver")
+    factory = relationship("Factory")
+    crop_year = relationship("CropYear")
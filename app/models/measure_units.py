@@ -1,14 +1,18 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import BigInteger, String, DateTime, func
 from ..db import Base as SQLAlchemyBase
+from ..softdelete import SoftDelete, live_unique
 
 
-class MeasureUnit(SQLAlchemyBase):
+class MeasureUnit(SoftDelete, SQLAlchemyBase):
     __tablename__ = "measure_units"
+    __table_args__ = (
+        live_unique("measure_units", "unit_name"),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
 
-    unit_name: Mapped[str] = mapped_column(String(100), unique=True, nullable=False)
+    unit_name: Mapped[str] = mapped_column(String(100), nullable=False)
 
     created_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
@@ -19,6 +23,7 @@ class MeasureUnit(SQLAlchemyBase):
         server_default=func.now(),
         onupdate=func.now(),
         nullable=False,
+        index=True,
     )
 
     
@@ -1,16 +1,27 @@
 from ..db import Base as SQLAlchemyBase
+from ..softdelete import SoftDelete, live_unique
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import BigInteger, String, DateTime, func
 
 
-class Province(SQLAlchemyBase):
+class Province(SoftDelete, SQLAlchemyBase):
 
     __tablename__ = "provinces"
+    __table_args__ = (
+        live_unique("provinces", "province"),
+    )
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
-    province: Mapped[str] = mapped_column(String, unique=True, nullable=False)
+    province: Mapped[str] = mapped_column(String, nullable=False)
     created_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+    updated_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+        index=True,
+    )
 
     cities = relationship("City", back_populates="province")
@@ -1,20 +1,31 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import BigInteger, String, ForeignKey, DateTime, func
 from ..db import Base as SQLAlchemyBase
+from ..softdelete import SoftDelete, live_unique
+from ..text import searchable
 
-class Seed(SQLAlchemyBase):
+@searchable("seed_name")
+class Seed(SoftDelete, SQLAlchemyBase):
     __tablename__ = "seeds"
+    __table_args__ = (
+        live_unique("seeds", "seed_name"),
+    )
 
     id: Mapped[int] = mapped_column(
         BigInteger, primary_key=True, autoincrement=True
     )
 
     seed_name: Mapped[str] = mapped_column(
-        String(150), nullable=False, unique=True
+        String(150), nullable=False
     )
+    # normalized copy of the name columns for search, see app/text.py
+    search_text: Mapped[str] = mapped_column(String, nullable=False, server_default="")
 
     measure_unit_id: Mapped[int] = mapped_column(
-        BigInteger, ForeignKey("measure_units.id", ondelete="RESTRICT"), nullable=False
+        BigInteger,
+        ForeignKey("measure_units.id", ondelete="RESTRICT"),
+        nullable=False,
+        index=True,
     )
 
     created_at: Mapped[DateTime] = mapped_column(
@@ -27,7 +38,8 @@ class Seed(SQLAlchemyBase):
         DateTime(timezone=True),
         server_default=func.now(),
         onupdate=func.now(),
-        nullable=False
+        nullable=False,
+        index=True,
     )
     
     """@property
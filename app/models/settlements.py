@@ -0,0 +1,61 @@
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from sqlalchemy import (
+    BigInteger,
+    Integer,
+    ForeignKey,
+    DateTime,
+    Float,
+    UniqueConstraint,
+    func,
+)
+from ..db import Base as SQLAlchemyBase
+
+
+class FarmerSettlement(SQLAlchemyBase):
+    """
+    One farmer's statement for a crop year, written by the settlement job.
+    """
+
+    __tablename__ = "farmer_settlements"
+    __table_args__ = (
+        UniqueConstraint(
+            "crop_year_id", "farmer_id", name="uq_farmer_settlements_crop_year_farmer"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+
+    crop_year_id: Mapped[int] = mapped_column(
+        BigInteger,
+        ForeignKey("crop_years.id", ondelete="RESTRICT"),
+        nullable=False,
+    )
+
+    farmer_id: Mapped[int] = mapped_column(
+        Integer,
+        ForeignKey("users.id", ondelete="RESTRICT"),
+        nullable=False,
+    )
+
+    load_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    gross_weight_kg: Mapped[float] = mapped_column(Float, nullable=False)
+    net_weight_kg: Mapped[float] = mapped_column(Float, nullable=False)
+    avg_sugar_grade: Mapped[float] = mapped_column(Float, nullable=False)
+
+    beet_amount: Mapped[float] = mapped_column(Float, nullable=False)
+    seed_deduction: Mapped[float] = mapped_column(Float, nullable=False)
+    pesticide_deduction: Mapped[float] = mapped_column(Float, nullable=False)
+    final_amount: Mapped[float] = mapped_column(Float, nullable=False)
+
+    sugar_quota_kg: Mapped[float] = mapped_column(Float, nullable=False)
+    pulp_quota_kg: Mapped[float] = mapped_column(Float, nullable=False)
+
+    computed_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False,
+    )
+
+    # -------- relationships --------
+    farmer = relationship("User")
+    crop_year = relationship("CropYear")
@@ -1,18 +1,28 @@
 from ..db import Base as SQLAlchemyBase
+from ..softdelete import SoftDelete, live_unique
+from ..text import searchable
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import Integer, BigInteger, ForeignKey, String, Boolean, DateTime, func
 
 
-class User(SQLAlchemyBase):
+@searchable("fullname", "username", "email")
+class User(SoftDelete, SQLAlchemyBase):
     __tablename__ = "users"
+    __table_args__ = (
+        live_unique("users", "username"),
+        live_unique("users", "email"),
+        live_unique("users", "phone_number"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True)
 
-    username: Mapped[str] = mapped_column(String(50), unique=True, index=True)
+    username: Mapped[str] = mapped_column(String(50))
     password: Mapped[str] = mapped_column(String(255), nullable=False)
     fullname: Mapped[str] = mapped_column(String(150), nullable=False)
-    email: Mapped[str] = mapped_column(String(120), unique=True, index=True)
-    phone_number: Mapped[str | None] = mapped_column(String(15), unique=True)
+    email: Mapped[str] = mapped_column(String(120))
+    phone_number: Mapped[str | None] = mapped_column(String(15))
+    # normalized copy of the name columns for search, see app/text.py
+    search_text: Mapped[str] = mapped_column(String, nullable=False, server_default="")
 
     disabled: Mapped[bool] = mapped_column(Boolean, default=False)
 
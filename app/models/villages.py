@@ -1,16 +1,28 @@
 from ..db import Base as SQLAlchemyBase
+from ..softdelete import SoftDelete
+from ..text import searchable
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy import BigInteger, String, ForeignKey, DateTime, func
 
 
-class Village(SQLAlchemyBase):
+@searchable("village")
+class Village(SoftDelete, SQLAlchemyBase):
     __tablename__ = "villages"
 
     id: Mapped[int] = mapped_column(BigInteger, primary_key=True)
     village: Mapped[str] = mapped_column(String, nullable=False)
-    city_id: Mapped[int] = mapped_column(ForeignKey("cities.id"), nullable=False)
+    # normalized copy of the name columns for search, see app/text.py
+    search_text: Mapped[str] = mapped_column(String, nullable=False, server_default="")
+    city_id: Mapped[int] = mapped_column(ForeignKey("cities.id"), nullable=False, index=True)
     created_at: Mapped[DateTime] = mapped_column(
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
+    updated_at: Mapped[DateTime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
+        index=True,
+    )
 
     city = relationship("City", back_populates="villages")
@@ -0,0 +1,70 @@
+"""
+Prebuilt OpenAPI schema.
+
+The schema is rendered once, at image build time:
+
+    python -m app.openapi [output_dir]
+
+which writes openapi.json and openapi.json.gz. Workers serve those bytes
+as-is; if the files are missing (local runs) the schema is rendered on
+import, which under gunicorn's preload_app happens once in the master
+before fork. Either way no request ever pays for schema generation.
+"""
+import gzip
+import hashlib
+import json
+import os
+import sys
+
+OPENAPI_DIR = os.getenv(
+    "OPENAPI_DIR", os.path.join(os.path.dirname(__file__), "static")
+)
+
+
+def render(app) -> bytes:
+    return json.dumps(app.openapi(), ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class OpenAPIDocument:
+    def __init__(self):
+        self.body = b""
+        self.gzipped = b""
+        self.etag = ""
+
+    def load(self, app, directory=OPENAPI_DIR):
+        path = os.path.join(directory, "openapi.json")
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                self.body = f.read()
+            gz_path = path + ".gz"
+            if os.path.exists(gz_path):
+                with open(gz_path, "rb") as f:
+                    self.gzipped = f.read()
+            else:
+                self.gzipped = gzip.compress(self.body, 9)
+        else:
+            self.body = render(app)
+            self.gzipped = gzip.compress(self.body, 9)
+        self.etag = '"' + hashlib.sha256(self.body).hexdigest()[:32] + '"'
+
+
+document = OpenAPIDocument()
+
+
+def write(app, directory=OPENAPI_DIR):
+    os.makedirs(directory, exist_ok=True)
+    body = render(app)
+    path = os.path.join(directory, "openapi.json")
+    with open(path, "wb") as f:
+        f.write(body)
+    with open(path + ".gz", "wb") as f:
+        # mtime=0 keeps the blob byte-identical across builds
+        f.write(gzip.compress(body, 9, mtime=0))
+    return path
+
+
+if __name__ == "__main__":
+    from .config import app
+
+    out = write(app, sys.argv[1] if len(sys.argv) > 1 else OPENAPI_DIR)
+    print(f"wrote {out}")
@@ -0,0 +1,78 @@
+"""
+Price history of factory seed and pesticide allocations.
+
+Whenever an allocation is created or its farmer/factory price changes,
+its open history row is closed at now() and a new one opened from now(),
+in the same transaction: an after_flush hook, so every writer is covered.
+now() is the transaction start, so consecutive periods meet exactly; the
+exclusion constraint on each history table rejects overlaps, and the
+GiST index behind it answers "prices at T" with one lookup (price_at).
+"""
+from sqlalchemy import and_, delete, event, func, inspect, insert, update
+
+from .db import SessionLocal
+from .models import FactoryPesticide, FactoryPesticidePrice, FactorySeed, FactorySeedPrice
+
+# allocation model -> (history model, its foreign key attribute)
+HISTORY = {
+    FactorySeed: (FactorySeedPrice, "factory_seed_id"),
+    FactoryPesticide: (FactoryPesticidePrice, "factory_pesticide_id"),
+}
+PRICE_FIELDS = ("farmer_price", "factory_price")
+
+
+def _prices_changed(obj):
+    state = inspect(obj)
+    return any(state.attrs[key].history.has_changes() for key in PRICE_FIELDS)
+
+
+@event.listens_for(SessionLocal, "after_flush")
+def _record_prices(session, flush_context):
+    changed = [
+        obj
+        for obj in (*session.new, *session.dirty)
+        if type(obj) in HISTORY and _prices_changed(obj)
+    ]
+    if not changed:
+        return
+    connection = session.connection()
+    if connection.dialect.name != "postgresql":
+        return
+
+    for obj in changed:
+        history, fk = HISTORY[type(obj)]
+        current = and_(
+            getattr(history, fk) == obj.id, func.upper_inf(history.valid_during)
+        )
+        # changed twice in one transaction: the first period would be empty
+        connection.execute(
+            delete(history).where(current, func.lower(history.valid_during) == func.now())
+        )
+        connection.execute(
+            update(history)
+            .where(current)
+            .values(
+                valid_during=func.tstzrange(func.lower(history.valid_during), func.now())
+            )
+        )
+        connection.execute(
+            insert(history).values(
+                {
+                    fk: obj.id,
+                    "farmer_price": obj.farmer_price,
+                    "factory_price": obj.factory_price,
+                    "valid_during": func.tstzrange(func.now(), None),
+                }
+            )
+        )
+
+
+def price_at(model, as_of):
+    """
+    (history model, join condition) for the prices of model in effect at as_of,
+    a datetime or a column such as FarmerAllocation.created_at.
+    """
+    history, fk = HISTORY[model]
+    return history, and_(
+        getattr(history, fk) == model.id, history.valid_during.contains(as_of)
+    )
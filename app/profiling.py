@@ -0,0 +1,161 @@
+"""
+Opt-in sampling profiler for live requests.
+
+A request is profiled when it carries `X-Profile: <PROFILE_TOKEN>` or is
+picked by PROFILE_SAMPLE_RATE. While it runs, a sampler thread snapshots
+the stacks of the threads working on that route (sys._current_frames)
+every PROFILE_INTERVAL_MS and, when it finishes, writes them in collapsed
+("folded") format to PROFILE_DIR/<route>/, ready for flamegraph.pl or
+speedscope. Requests that are not profiled pay one header lookup.
+
+Samples are attributed by the route's own handler on the stack (the
+function under TracedRoute's wrapper, which every route shares) and by
+response serialization for that route's response model, so concurrent
+requests to the same route on this worker can share a profile.
+"""
+import asyncio
+import inspect
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+
+from fastapi import routing
+
+PROFILE_DIR = os.getenv("PROFILE_DIR", "/tmp/havirkesht-profiles")
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL_MS", "5")) / 1000
+PROFILE_MAX_ACTIVE = int(os.getenv("PROFILE_MAX_ACTIVE", "2"))
+
+# long-lived streams would never finish their profile
+EXEMPT_PATHS = ("/changes/stream", "/metrics")
+
+_SERIALIZE_CODE = routing.serialize_response.__code__
+
+
+def _frame_name(code):
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{code.co_name} ({module}:{code.co_firstlineno})"
+
+
+class RequestSampler:
+    def __init__(self, scope, interval):
+        self.scope = scope
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _targets(self):
+        """
+        (handler code, response field) of the route, once routing is done.
+        """
+        endpoint = self.scope.get("endpoint")
+        if endpoint is None:
+            return None, None
+        handler = getattr(inspect.unwrap(endpoint), "__code__", None)
+        route = self.scope.get("route")
+        return handler, getattr(route, "response_field", None)
+
+    @staticmethod
+    def _is_target(frame, handler, field):
+        code = frame.f_code
+        if code is handler:
+            return True
+        # serialize_response is shared by all routes: keep this route's only
+        return (
+            code is _SERIALIZE_CODE
+            and field is not None
+            and frame.f_locals.get("field") is field
+        )
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            handler, field = self._targets()
+            if handler is None:
+                continue
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack, hit = [], False
+                while frame is not None:
+                    code = frame.f_code
+                    hit = hit or self._is_target(frame, handler, field)
+                    stack.append(_frame_name(code))
+                    frame = frame.f_back
+                if hit:
+                    self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def folded(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.items())
+
+
+class ProfilerMiddleware:
+    def __init__(self, app, token=PROFILE_TOKEN, sample_rate=PROFILE_SAMPLE_RATE):
+        self.app = app
+        self.token = token.encode() if token else None
+        self.sample_rate = sample_rate
+        self.active = 0
+
+    def _wanted(self, scope):
+        if self.token is not None:
+            for name, value in scope["headers"]:
+                if name == b"x-profile":
+                    return value == self.token
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["path"].startswith(EXEMPT_PATHS)
+            or self.active >= PROFILE_MAX_ACTIVE
+            or not self._wanted(scope)
+        ):
+            return await self.app(scope, receive, send)
+
+        profile_id = uuid.uuid4().hex[:12]
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-profile-id", profile_id.encode()),
+                ]
+            await send(message)
+
+        sampler = RequestSampler(scope, PROFILE_INTERVAL)
+        self.active += 1
+        started = time.perf_counter()
+        sampler.start()
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            elapsed = time.perf_counter() - started
+            self.active -= 1
+            await asyncio.to_thread(self._save, sampler, scope, profile_id, elapsed)
+
+    def _save(self, sampler, scope, profile_id, elapsed):
+        sampler.stop()
+        route = scope.get("route")
+        name = getattr(route, "path", None) or scope["path"]
+        folder = re.sub(r"[^A-Za-z0-9_.-]+", "_", f"{scope['method']}{name}").strip("_")
+        directory = os.path.join(PROFILE_DIR, folder)
+        os.makedirs(directory, exist_ok=True)
+        filename = f"{time.strftime('%Y%m%dT%H%M%S')}-{int(elapsed * 1000)}ms-{profile_id}.folded"
+        with open(os.path.join(directory, filename), "w") as f:
+            f.write(sampler.folded())
@@ -0,0 +1,15 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+
+def exists_where(session: Session, model, exclude_id=None, **criteria) -> bool:
+    """
+    Cheap existence / uniqueness check: SELECT id ... LIMIT 1.
+
+    A plain select(): SQLAlchemy caches the compiled SQL per statement
+    shape (model and columns) and only binds new values on every call.
+    """
+    conditions = [getattr(model, name) == value for name, value in criteria.items()]
+    if exclude_id is not None:
+        conditions.append(model.id != exclude_id)
+    return session.scalar(select(model.id).where(*conditions).limit(1)) is not None
@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Query
+from sqlalchemy import select
+
+from ..db import SessionDep
+from ..tracing import TracedRoute
+from ..models.audit_logs import AuditLog
+from ..schemas.audit_logs import AuditLogResponse
+from ..schemas.pagination import Page, paginate
+
+router = APIRouter(prefix="/audit-logs", tags=["Audit Log"], route_class=TracedRoute)
+
+
+@router.get("/", response_model=Page[AuditLogResponse])
+def get_all_audit_logs(
+    session: SessionDep,
+    page: int = Query(1, ge=1),
+    size: int = Query(50, ge=1, le=100),
+    entity: str | None = None,
+    entity_id: int | None = None,
+    action: str | None = Query(None, pattern="^(create|update|delete)$"),
+    actor: str | None = None,
+):
+    stmt = select(AuditLog)
+
+    if entity:
+        stmt = stmt.where(AuditLog.entity == entity)
+    if entity_id:
+        stmt = stmt.where(AuditLog.entity_id == entity_id)
+    if action:
+        stmt = stmt.where(AuditLog.action == action)
+    if actor:
+        stmt = stmt.where(AuditLog.actor == actor)
+
+    stmt = stmt.order_by(AuditLog.created_at.desc(), AuditLog.id.desc())
+
+    total, pages, items = paginate(session, stmt, page, size)
+
+    return {
+        "total": total,
+        "size": size,
+        "pages": pages,
+        "items": items,
+    }
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, HTTPException, Query
+
+from ..autocomplete import KINDS, autocomplete
+from ..schemas.autocomplete import AutocompleteItem
+from ..tracing import TracedRoute
+
+router = APIRouter(prefix="/autocomplete", tags=["Autocomplete"], route_class=TracedRoute)
+
+
+@router.get("/", response_model=list[AutocompleteItem])
+def autocomplete_names(
+    q: str = Query(..., min_length=1, max_length=100),
+    kind: str | None = Query(None, description="comma separated: village,city,driver,farmer"),
+    limit: int = Query(10, ge=1, le=50),
+):
+    kinds = KINDS
+    if kind:
+        kinds = tuple(k.strip() for k in kind.split(",") if k.strip())
+        unknown = set(kinds) - set(KINDS)
+        if unknown:
+            raise HTTPException(
+                status_code=422, detail=f"Unknown kind: {', '.join(sorted(unknown))}"
+            )
+
+    return autocomplete.search(q, kinds, limit)
@@ -3,6 +3,9 @@ from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from ..db import SessionDep
+from ..softdelete import soft_delete
+from ..tracing import TracedRoute
+from ..loaders import IdsDep, get_loader
 from ..models.cars import Car
 from ..schemas.cars import (
     CarCreate,
@@ -10,16 +13,15 @@ from ..schemas.cars import (
     CarResponse,
 )
 from ..schemas.pagination import Page, paginate
+from ..queries import exists_where
 
-router = APIRouter(prefix="/cars", tags=["Car"])
+router = APIRouter(prefix="/cars", tags=["Car"], route_class=TracedRoute)
 
 
 @router.post("/", response_model=CarResponse, status_code=201)
 def create_car(session: SessionDep, data: CarCreate):
 
-    exists = session.scalar(
-        select(Car).where(Car.name == data.name)
-    )
+    exists = exists_where(session, Car, name=data.name)
     if exists:
         raise HTTPException(status_code=409, detail="Car already exists")
 
@@ -62,6 +64,14 @@ def get_all_cars(
     }
 
 
+@router.get("/batch", response_model=list[CarResponse])
+def get_cars_batch(session: SessionDep, ids: IdsDep):
+
+    cars = get_loader(session).load_many(Car, ids)
+
+    return [cars[i] for i in ids if i in cars]
+
+
 @router.get("/{car_id}", response_model=CarResponse)
 def get_car_by_id(session: SessionDep, car_id: int):
 
@@ -99,7 +109,7 @@ def delete_car(session: SessionDep, car_id: int):
     if not car:
         raise HTTPException(status_code=404, detail="Car not found")
 
-    session.delete(car)
+    soft_delete(session, car)
     session.commit()
 
     return {"message": f"Car {car_id} deleted successfully"}
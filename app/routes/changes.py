@@ -0,0 +1,52 @@
+import asyncio
+import json
+
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
+
+from ..changes import hub
+from ..loaders import parse_ids
+
+router = APIRouter(prefix="/changes", tags=["Change Feed"])
+
+KEEPALIVE_SECONDS = 15
+
+
+def _split(value: str | None):
+    if not value:
+        return None
+    return {v.strip() for v in value.split(",") if v.strip()}
+
+
+@router.get("/stream")
+async def stream_changes(
+    request: Request,
+    entity: str | None = Query(None, description="comma separated, e.g. drivers,cars"),
+    ids: str | None = Query(None, description="comma separated row ids"),
+):
+    entities = _split(entity)
+    # 422 on anything but comma separated integers
+    id_set = set(parse_ids(ids)) if ids else None
+    sub = hub.subscribe(entities, id_set)
+
+    async def events():
+        try:
+            yield "retry: 3000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    change = await asyncio.wait_for(
+                        sub.queue.get(), timeout=KEEPALIVE_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                data = json.dumps(change, ensure_ascii=False)
+                yield f"event: {change['entity']}\ndata: {data}\n\n"
+        finally:
+            hub.unsubscribe(sub)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
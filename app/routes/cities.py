@@ -1,12 +1,16 @@
 from fastapi import APIRouter, HTTPException, Query
 from sqlalchemy import select
 from ..db import SessionDep
+from ..softdelete import soft_delete
+from ..tracing import TracedRoute
+from ..text import matches
 from ..models.cities import City
 from ..models.provinces import Province
 from ..schemas.cities import CityCreate, CityOut
 from ..schemas.pagination import Page, paginate
+from ..queries import exists_where
 
-router = APIRouter(prefix="/cities", tags=["City"])
+router = APIRouter(prefix="/cities", tags=["City"], route_class=TracedRoute)
 
 
 @router.post("/", response_model=CityOut, status_code=201)
@@ -20,9 +24,9 @@ def create_city(
         raise HTTPException(status_code=404, detail="Province not found")
     
     # -------- prevent duplicate city in same province --------
-    exists = session.execute(
-        select(City).where(City.city == city.city, City.province_id == city.province_id)
-    ).scalar_one_or_none()
+    exists = exists_where(
+        session, City, city=city.city, province_id=city.province_id
+    )
 
     if exists:
         raise HTTPException(
@@ -59,7 +63,7 @@ def get_all_cities(
 
     # -------- search --------
     if search:
-        stmt = stmt.where(City.city.ilike(f"%{search}%"))
+        stmt = stmt.where(matches(City, search))
 
     # -------- sorting --------
     allowed_sorts = ["id", "city", "created_at", "province_id"]
@@ -94,7 +98,7 @@ def delete_city(
         )
 
     city_name = city.city
-    session.delete(city)
+    soft_delete(session, city)
     session.commit()
 
     return {"detail": f"City {city_id}: {city_name} deleted successfully"}
\ No newline at end of file
@@ -3,16 +3,21 @@ from sqlalchemy import select, asc, desc
 from sqlalchemy.exc import IntegrityError
 
 from ..db import SessionDep
+from ..softdelete import soft_delete
+from ..tracing import TracedRoute
 from ..models.crop_years import CropYear
 from ..schemas.crop_years import (
     CropYearCreate,
+    CropYearUpdate,
     CropYearResponse,
 )
 from ..schemas.pagination import Page, paginate
+from ..queries import exists_where
 
 router = APIRouter(
     prefix="/crop-years",
     tags=["Crop Year"],
+    route_class=TracedRoute,
 )
 
 @router.post(
@@ -24,10 +29,8 @@ def create_crop_year(
     data: CropYearCreate,
     session: SessionDep,
 ):
-    exists = session.scalar(
-        select(CropYear).where(
-            CropYear.crop_year_name == data.crop_year_name
-        )
+    exists = exists_where(
+        session, CropYear, crop_year_name=data.crop_year_name
     )
     if exists:
         raise HTTPException(
@@ -35,9 +38,7 @@ def create_crop_year(
             detail="Crop year already exists",
         )
 
-    crop_year = CropYear(
-        crop_year_name=data.crop_year_name
-    )
+    crop_year = CropYear(**data.model_dump())
 
     session.add(crop_year)
     session.commit()
@@ -93,6 +94,43 @@ def get_crop_years(
     )
 
 
+@router.put(
+    "/{crop_year_id}",
+    response_model=CropYearResponse,
+)
+def update_crop_year(
+    crop_year_id: int,
+    data: CropYearUpdate,
+    session: SessionDep,
+):
+    crop_year = session.get(CropYear, crop_year_id)
+
+    if not crop_year:
+        raise HTTPException(
+            status_code=404,
+            detail="Crop year not found",
+        )
+
+    values = data.model_dump(exclude_unset=True)
+    if "crop_year_name" in values and exists_where(
+        session,
+        CropYear,
+        exclude_id=crop_year_id,
+        crop_year_name=values["crop_year_name"],
+    ):
+        raise HTTPException(
+            status_code=400,
+            detail="Crop year already exists",
+        )
+
+    for k, v in values.items():
+        setattr(crop_year, k, v)
+
+    session.commit()
+    session.refresh(crop_year)
+    return crop_year
+
+
 @router.delete(
     "/{crop_year_id}",
 )
@@ -108,7 +146,7 @@ def delete_crop_year(
             detail="Crop year not found",
         )
     crop_year_name = crop_year.crop_year_name
-    session.delete(crop_year)
+    soft_delete(session, crop_year)
     session.commit()
 
     return {
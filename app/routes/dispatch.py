@@ -0,0 +1,54 @@
+from fastapi import APIRouter, HTTPException
+from sqlalchemy import select
+
+from ..db import SessionDep
+from ..tracing import TracedRoute
+from ..dispatch import plan
+from ..models import Driver, Village
+from ..schemas.dispatch import DispatchRequest, DispatchPlan
+
+router = APIRouter(prefix="/dispatch", tags=["Dispatch"], route_class=TracedRoute)
+
+
+@router.post("/plan", response_model=DispatchPlan)
+def plan_dispatch(session: SessionDep, data: DispatchRequest):
+
+    village_ids = {p.village_id for p in data.pickups}
+    known = set(session.scalars(select(Village.id).where(Village.id.in_(village_ids))))
+    if known != village_ids:
+        missing = sorted(village_ids - known)[:20]
+        raise HTTPException(status_code=404, detail=f"Villages not found: {missing}")
+
+    stmt = select(Driver.id, Driver.capacity_ton)
+    if data.driver_ids:
+        stmt = stmt.where(Driver.id.in_(data.driver_ids))
+    if data.car_id:
+        stmt = stmt.where(Driver.car_id == data.car_id)
+    drivers = session.execute(stmt).all()
+
+    if not drivers:
+        raise HTTPException(status_code=404, detail="No drivers available")
+
+    trips, unassigned = plan(
+        ((p.village_id, p.tons) for p in data.pickups),
+        drivers,
+        max_rounds=data.max_rounds,
+    )
+
+    capacity = dict(drivers)
+    return {
+        "rounds": max((t.round for t in trips), default=0),
+        "trips": [
+            {
+                "driver_id": t.driver_id,
+                "round": t.round,
+                "load_ton": t.load_ton,
+                "capacity_ton": capacity[t.driver_id],
+                "stops": [{"village_id": v, "tons": tons} for v, tons in t.stops],
+            }
+            for t in trips
+        ],
+        "unassigned": [
+            {"village_id": v, "tons": tons} for v, tons in unassigned.items()
+        ],
+    }
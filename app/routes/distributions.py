@@ -0,0 +1,37 @@
+from fastapi import APIRouter, HTTPException
+from sqlalchemy.exc import IntegrityError
+
+from ..db import SessionDep
+from ..tracing import TracedRoute
+from ..distribution import OutOfStock, issue
+from ..models import CropYear
+from ..schemas.distributions import DistributionBatch, DistributionResult
+
+router = APIRouter(prefix="/distributions", tags=["Distribution"], route_class=TracedRoute)
+
+
+# ---------- Issue seed / pesticide to farmers ----------
+@router.post("/", response_model=DistributionResult, status_code=201)
+def issue_batch(session: SessionDep, batch: DistributionBatch):
+
+    if not session.get(CropYear, batch.crop_year_id):
+        raise HTTPException(status_code=404, detail="Crop year not found")
+
+    try:
+        ids, remaining = issue(
+            session, batch.crop_year_id, [item.model_dump() for item in batch.items]
+        )
+    except OutOfStock as exc:
+        raise HTTPException(
+            status_code=409, detail={"message": "Not enough stock", "short": exc.short}
+        )
+    except IntegrityError:
+        raise HTTPException(status_code=409, detail="Batch references an unknown farmer")
+
+    return {
+        "allocation_ids": ids,
+        "remaining": [
+            {"kind": kind, "id": id_, "amount": amount}
+            for (kind, id_), amount in remaining.items()
+        ],
+    }
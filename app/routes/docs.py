@@ -0,0 +1,31 @@
+from fastapi import APIRouter, Request, Response
+from fastapi.openapi.docs import get_redoc_html, get_swagger_ui_html
+
+from ..openapi import document
+
+router = APIRouter(include_in_schema=False)
+
+
+@router.get("/openapi.json")
+def openapi_json(request: Request):
+    headers = {
+        "ETag": document.etag,
+        "Cache-Control": "public, max-age=300",
+        "Vary": "Accept-Encoding",
+    }
+    if request.headers.get("if-none-match") == document.etag:
+        return Response(status_code=304, headers=headers)
+    if "gzip" in request.headers.get("accept-encoding", ""):
+        headers["Content-Encoding"] = "gzip"
+        return Response(document.gzipped, media_type="application/json", headers=headers)
+    return Response(document.body, media_type="application/json", headers=headers)
+
+
+@router.get("/docs")
+def swagger_ui():
+    return get_swagger_ui_html(openapi_url="/openapi.json", title="Havirkesht - Swagger UI")
+
+
+@router.get("/redoc")
+def redoc():
+    return get_redoc_html(openapi_url="/openapi.json", title="Havirkesht - ReDoc")
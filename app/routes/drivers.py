@@ -1,17 +1,20 @@
 from fastapi import APIRouter, HTTPException, Query
 from sqlalchemy import select, or_
-from sqlalchemy.orm import selectinload
 
 from ..db import SessionDep
+from ..softdelete import soft_delete
+from ..tracing import TracedRoute
+from ..text import matches
+from ..loaders import IdsDep, get_loader
 from ..models import Driver, Car
 from ..schemas.drivers import (
     DriverCreate,
     DriverUpdate,
     DriverResponse,
 )
-from ..schemas.pagination import Page, paginate
+from ..schemas.pagination import Page, paginate_rows
 
-router = APIRouter(prefix="/drivers", tags=["Driver"])
+router = APIRouter(prefix="/drivers", tags=["Driver"], route_class=TracedRoute)
 
 
 @router.post("/", response_model=DriverResponse, status_code=201)
@@ -21,12 +24,14 @@ def create_driver(session: SessionDep, data: DriverCreate):
         raise HTTPException(status_code=404, detail="Car not found")
 
     exists = session.scalar(
-        select(Driver).where(
+        select(Driver.id)
+        .where(
             or_(
                 Driver.national_code == data.national_code,
                 Driver.phone_number == data.phone_number,
             )
         )
+        .limit(1)
     )
     if exists:
         raise HTTPException(
@@ -53,34 +58,45 @@ def get_all_drivers(
     sort_order: str | None = Query("asc", pattern="^(asc|desc)$"),
 ):
 
-    stmt = select(Driver).options(selectinload(Driver.car))
+    # plain rows with the car name joined in: no ORM entities to hydrate
+    stmt = select(
+        Driver.id,
+        Driver.name,
+        Driver.last_name,
+        Driver.national_code,
+        Driver.phone_number,
+        Driver.car_id,
+        Driver.license_plate,
+        Driver.capacity_ton,
+        Driver.created_at,
+        Car.name.label("car_name"),
+    ).join(Car, Driver.car_id == Car.id)
 
     if car_id:
         stmt = stmt.where(Driver.car_id == car_id)
 
     if search:
-        stmt = stmt.where(
-            or_(
-                Driver.name.ilike(f"%{search}%"),
-                Driver.last_name.ilike(f"%{search}%"),
-                Driver.national_code.ilike(f"%{search}%"),
-                Driver.phone_number.ilike(f"%{search}%"),
-            )
-        )
+        # name, last name, national code and phone number, normalized
+        stmt = stmt.where(matches(Driver, search))
 
     allowed_sorts = ["id", "name", "last_name", "created_at"]
     if sort_by in allowed_sorts:
         column = getattr(Driver, sort_by)
         stmt = stmt.order_by(column.desc() if sort_order == "desc" else column)
 
-    total, pages, items = paginate(session, stmt, page, size)
+    total, pages, items = paginate_rows(session, stmt, page, size)
+
+    return {"total": total, "size": size, "pages": pages, "items": items}
+
 
-    return {
-        "total": total,
-        "size": size,
-        "pages": pages,
-        "items": [DriverResponse.from_orm_full(d) for d in items],
-    }
+@router.get("/batch", response_model=list[DriverResponse])
+def get_drivers_batch(session: SessionDep, ids: IdsDep):
+
+    loader = get_loader(session)
+    drivers = loader.load_many(Driver, ids)
+    loader.prime(drivers.values(), Driver.car)
+
+    return [DriverResponse.from_orm_full(drivers[i]) for i in ids if i in drivers]
 
 
 @router.get("/{driver_id}", response_model=DriverResponse)
@@ -104,7 +120,12 @@ def update_driver(
     if not driver:
         raise HTTPException(status_code=404, detail="Driver not found")
 
-    for k, v in data.model_dump(exclude_unset=True).items():
+    values = data.model_dump(exclude_unset=True)
+    # archived cars are gone for new references, as in create_driver
+    if "car_id" in values and not session.get(Car, values["car_id"]):
+        raise HTTPException(status_code=404, detail="Car not found")
+
+    for k, v in values.items():
         setattr(driver, k, v)
 
     session.commit()
@@ -122,7 +143,7 @@ def delete_driver(session: SessionDep, driver_id: int):
 
     driver_name = driver.name + " " + driver.last_name
 
-    session.delete(driver)
+    soft_delete(session, driver)
     session.commit()
 
     return {"message": f"Driver {driver_id}:{driver_name}  deleted successfully"}
\ No newline at end of file
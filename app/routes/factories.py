@@ -1,11 +1,15 @@
 from fastapi import APIRouter, HTTPException, Query
 from sqlalchemy import select
 from ..db import SessionDep
+from ..softdelete import soft_delete
+from ..tracing import TracedRoute
+from ..text import matches
 from ..models.factories import Factory
 from ..schemas.factories import FactoryCreate, FactoryResponse
 from ..schemas.pagination import Page, paginate
+from ..queries import exists_where
 
-router = APIRouter(prefix="/factories", tags=["Factory"])
+router = APIRouter(prefix="/factories", tags=["Factory"], route_class=TracedRoute)
 
 
 @router.post("/", response_model=FactoryResponse, status_code=201)
@@ -14,9 +18,7 @@ def create_factory(
     factory: FactoryCreate,
 ):
     # -------- prevent duplicate factory --------
-    exists = session.execute(
-        select(Factory).where(Factory.factory_name == factory.factory_name)
-    ).scalar_one_or_none()
+    exists = exists_where(session, Factory, factory_name=factory.factory_name)
 
     if exists:
         raise HTTPException(
@@ -47,7 +49,7 @@ def get_all_factories(
 
     # -------- search --------
     if search:
-        stmt = stmt.where(Factory.factory_name.ilike(f"%{search}%"))
+        stmt = stmt.where(matches(Factory, search))
 
     # -------- sorting --------
     allowed_sorts = ["id", "factory_name", "created_at"]
@@ -82,7 +84,7 @@ def delete_factory(
         )
 
     factory_name = factory.factory_name
-    session.delete(factory)
+    soft_delete(session, factory)
     session.commit()
 
     return {"detail": f"Factory {factory_id}: {factory_name} deleted successfully"}
\ No newline at end of file
@@ -1,17 +1,25 @@
-from fastapi import APIRouter, HTTPException
-from sqlalchemy import select, or_, func
-from sqlalchemy.orm import selectinload
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException, Query
+from sqlalchemy import select, or_
+from sqlalchemy.exc import IntegrityError
 
 from ..db import SessionDep
-from ..models import FactoryPesticide, Factory, Pesticide, CropYear
+from ..softdelete import soft_delete
+from ..tracing import TracedRoute
+from ..text import matches
+from ..loaders import IdsDep, get_loader
+from ..prices import price_at
+from ..models import FactoryPesticide, Factory, Pesticide, CropYear, MeasureUnit
 from ..schemas.factory_pesticides import (
     FactoryPesticideCreate,
     FactoryPesticideUpdate,
     FactoryPesticideResponse,
 )
-from ..schemas.pagination import Page, paginate
+from ..schemas.pagination import Page, paginate_rows
+from ..queries import exists_where
 
-router = APIRouter(prefix="/factory_pesticides", tags=["Factory Pesticide"])
+router = APIRouter(prefix="/factory_pesticides", tags=["Factory Pesticide"], route_class=TracedRoute)
 
 @router.post("/", response_model=FactoryPesticideResponse, status_code=201)
 def create_factory_pesticide(session: SessionDep, data: FactoryPesticideCreate):
@@ -25,12 +33,12 @@ def create_factory_pesticide(session: SessionDep, data: FactoryPesticideCreate):
     if not session.get(CropYear, data.crop_year_id):
         raise HTTPException(status_code=404, detail="Crop year not found")
 
-    exist = session.scalar(
-        select(FactoryPesticide).where(
-            FactoryPesticide.factory_id == data.factory_id,
-            FactoryPesticide.pesticide_id == data.pesticide_id,
-            FactoryPesticide.crop_year_id == data.crop_year_id,
-        )
+    exist = exists_where(
+        session,
+        FactoryPesticide,
+        factory_id=data.factory_id,
+        pesticide_id=data.pesticide_id,
+        crop_year_id=data.crop_year_id,
     )
     if exist:
         raise HTTPException(
@@ -40,7 +48,15 @@ def create_factory_pesticide(session: SessionDep, data: FactoryPesticideCreate):
 
     fs = FactoryPesticide(**data.model_dump())
     session.add(fs)
-    session.commit()
+    try:
+        session.commit()
+    except IntegrityError:
+        # a concurrent create won the unique allocation key
+        session.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail=f"A record for factory {data.factory_id}, pesticide {data.pesticide_id}, and crop year {data.crop_year_id} already exists",
+        )
     session.refresh(fs)
 
     return FactoryPesticideResponse.from_orm_full(fs)
@@ -55,13 +71,39 @@ def get_all_factory_pesticides(
     pesticide_id: int | None = None,
     crop_year_id: int | None = None,
     search: str | None = None,
+    as_of: datetime | None = Query(None, description="show the prices in effect at this time"),
 ):
-    stmt = select(FactoryPesticide).options(
-        selectinload(FactoryPesticide.factory),
-        selectinload(FactoryPesticide.pesticide).selectinload(Pesticide.measure_unit),
-        selectinload(FactoryPesticide.crop_year),
+    prices = FactoryPesticide
+    if as_of:
+        # from the price history instead of the current columns
+        prices, in_effect = price_at(FactoryPesticide, as_of)
+
+    # display names are joined in, so search filters the same rows
+    stmt = (
+        select(
+            FactoryPesticide.id,
+            FactoryPesticide.factory_id,
+            FactoryPesticide.pesticide_id,
+            FactoryPesticide.crop_year_id,
+            FactoryPesticide.amount,
+            prices.farmer_price,
+            prices.factory_price,
+            FactoryPesticide.created_at,
+            FactoryPesticide.updated_at,
+            Factory.factory_name,
+            Pesticide.pesticide_name,
+            MeasureUnit.unit_name,
+            CropYear.crop_year_name,
+        )
+        .join(Factory, FactoryPesticide.factory_id == Factory.id)
+        .join(Pesticide, FactoryPesticide.pesticide_id == Pesticide.id)
+        .join(MeasureUnit, Pesticide.measure_unit_id == MeasureUnit.id)
+        .join(CropYear, FactoryPesticide.crop_year_id == CropYear.id)
     )
 
+    if as_of:
+        stmt = stmt.join(prices, in_effect)
+
     if factory_id:
         stmt = stmt.where(FactoryPesticide.factory_id == factory_id)
     if pesticide_id:
@@ -71,21 +113,29 @@ def get_all_factory_pesticides(
     if search:
         stmt = stmt.where(
             or_(
-                Factory.factory_name.ilike(f"%{search}%"),
-                Pesticide.pesticide_name.ilike(f"%{search}%"),
+                matches(Factory, search),
+                matches(Pesticide, search),
                 CropYear.crop_year_name.ilike(f"%{search}%"),
             )
         )
 
-    total = session.scalar(select(func.count()).select_from(stmt.subquery()))
-    items = session.scalars(stmt.offset((page - 1) * size).limit(size)).all()
+    total, pages, items = paginate_rows(session, stmt, page, size)
+
+    return {"total": total, "size": size, "pages": pages, "items": items}
 
-    return {
-        "total": total,
-        "size": size,
-        "pages": (total + size - 1) // size,
-        "items": [FactoryPesticideResponse.from_orm_full(fs) for fs in items],
-    }
+
+@router.get("/batch", response_model=list[FactoryPesticideResponse])
+def get_factory_pesticides_batch(session: SessionDep, ids: IdsDep):
+    loader = get_loader(session)
+    rows = loader.load_many(FactoryPesticide, ids)
+    loader.prime(
+        rows.values(),
+        FactoryPesticide.factory,
+        FactoryPesticide.crop_year,
+        (FactoryPesticide.pesticide, Pesticide.measure_unit),
+    )
+
+    return [FactoryPesticideResponse.from_orm_full(rows[i]) for i in ids if i in rows]
 
 
 @router.put("/{id}", response_model=FactoryPesticideResponse)
@@ -94,23 +144,37 @@ def update_factory_pesticide(id: int, session: SessionDep, data: FactoryPesticid
     if not fs:
         raise HTTPException(status_code=404, detail="Factory pesticide not found")
 
-    exist = session.scalar(
-        select(FactoryPesticide).where(
-            FactoryPesticide.factory_id == data.factory_id,
-            FactoryPesticide.pesticide_id == data.pesticide_id,
-            FactoryPesticide.crop_year_id == data.crop_year_id,
-        )
+    values = data.model_dump(exclude_unset=True)
+    # archived rows are gone for new references, as in create_factory_pesticide
+    for column, model, name in (
+        ("factory_id", Factory, "Factory"),
+        ("pesticide_id", Pesticide, "Pesticide"),
+        ("crop_year_id", CropYear, "Crop year"),
+    ):
+        if column in values and not session.get(model, values[column]):
+            raise HTTPException(status_code=404, detail=f"{name} not found")
+
+    # the allocation key after the update: unchanged fields keep their value
+    key = {
+        column: values.get(column, getattr(fs, column))
+        for column in ("factory_id", "pesticide_id", "crop_year_id")
+    }
+    conflict = HTTPException(
+        status_code=409,
+        detail=f"A record for factory {key['factory_id']}, pesticide {key['pesticide_id']}, and crop year {key['crop_year_id']} already exists",
     )
-    if exist:
-        raise HTTPException(
-            status_code=409,
-            detail=f"A record for factory {data.factory_id}, pesticide {data.pesticide_id}, and crop year {data.crop_year_id} already exists",
-        )
+    if exists_where(session, FactoryPesticide, exclude_id=id, **key):
+        raise conflict
 
-    for k, v in data.model_dump(exclude_unset=True).items():
+    for k, v in values.items():
         setattr(fs, k, v)
 
-    session.commit()
+    try:
+        session.commit()
+    except IntegrityError:
+        # a concurrent write took the unique allocation key
+        session.rollback()
+        raise conflict
     session.refresh(fs)
 
     return FactoryPesticideResponse.from_orm_full(fs)
@@ -122,6 +186,6 @@ def delete_factory_pesticide(id: int, session: SessionDep):
     if not fs:
         raise HTTPException(status_code=404, detail="Factory pesticide not found")
 
-    session.delete(fs)
+    soft_delete(session, fs)
     session.commit()
     return {"message": f"Factory pesticide {id} deleted successfully"}
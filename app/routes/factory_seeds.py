@@ -1,18 +1,26 @@
-from fastapi import APIRouter, HTTPException
+from datetime import datetime
+
+from fastapi import APIRouter, HTTPException, Query
 from sqlalchemy import select, or_, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy.exc import IntegrityError
 
 from ..db import SessionDep
-from ..models import FactorySeed, Factory, Seed, CropYear
+from ..softdelete import soft_delete
+from ..tracing import TracedRoute
+from ..text import matches
+from ..loaders import IdsDep, get_loader
+from ..prices import price_at
+from ..models import FactorySeed, Factory, Seed, CropYear, MeasureUnit
 from ..schemas.factory_seeds import (
     FactorySeedCreate,
     FactorySeedUpdate,
     FactorySeedResponse,
 )
-from ..schemas.pagination import Page, paginate
+from ..schemas.pagination import Page, paginate_rows
+from ..queries import exists_where
 
 
-router = APIRouter(prefix="/factory_seeds", tags=["Factory Seed"])
+router = APIRouter(prefix="/factory_seeds", tags=["Factory Seed"], route_class=TracedRoute)
 
 @router.post("/", response_model=FactorySeedResponse, status_code=201)
 def create_factory_seed(session: SessionDep, data: FactorySeedCreate):
@@ -26,12 +34,12 @@ def create_factory_seed(session: SessionDep, data: FactorySeedCreate):
     if not session.get(CropYear, data.crop_year_id):
         raise HTTPException(status_code=404, detail="Crop year not found")
 
-    exist = session.scalar(
-        select(FactorySeed).where(
-            FactorySeed.factory_id == data.factory_id,
-            FactorySeed.seed_id == data.seed_id,
-            FactorySeed.crop_year_id == data.crop_year_id,
-        )
+    exist = exists_where(
+        session,
+        FactorySeed,
+        factory_id=data.factory_id,
+        seed_id=data.seed_id,
+        crop_year_id=data.crop_year_id,
     )
     if exist:
         raise HTTPException(
@@ -41,7 +49,15 @@ def create_factory_seed(session: SessionDep, data: FactorySeedCreate):
 
     fs = FactorySeed(**data.model_dump())
     session.add(fs)
-    session.commit()
+    try:
+        session.commit()
+    except IntegrityError:
+        # a concurrent create won the unique allocation key
+        session.rollback()
+        raise HTTPException(
+            status_code=409,
+            detail=f"A record for factory {data.factory_id}, seed {data.seed_id}, and crop year {data.crop_year_id} already exists",
+        )
     session.refresh(fs)
 
     return FactorySeedResponse.from_orm_full(fs)
@@ -55,13 +71,39 @@ def get_all_factory_seeds(
     seed_id: int | None = None,
     crop_year_id: int | None = None,
     search: str | None = None,
+    as_of: datetime | None = Query(None, description="show the prices in effect at this time"),
 ):
-    stmt = select(FactorySeed).options(
-        selectinload(FactorySeed.factory),
-        selectinload(FactorySeed.seed).selectinload(Seed.measure_unit),
-        selectinload(FactorySeed.crop_year),
+    prices = FactorySeed
+    if as_of:
+        # from the price history instead of the current columns
+        prices, in_effect = price_at(FactorySeed, as_of)
+
+    # display names are joined in, so search filters the same rows
+    stmt = (
+        select(
+            FactorySeed.id,
+            FactorySeed.factory_id,
+            FactorySeed.seed_id,
+            FactorySeed.crop_year_id,
+            FactorySeed.amount,
+            prices.farmer_price,
+            prices.factory_price,
+            FactorySeed.created_at,
+            FactorySeed.updated_at,
+            Factory.factory_name,
+            Seed.seed_name,
+            MeasureUnit.unit_name,
+            CropYear.crop_year_name,
+        )
+        .join(Factory, FactorySeed.factory_id == Factory.id)
+        .join(Seed, FactorySeed.seed_id == Seed.id)
+        .join(MeasureUnit, Seed.measure_unit_id == MeasureUnit.id)
+        .join(CropYear, FactorySeed.crop_year_id == CropYear.id)
     )
 
+    if as_of:
+        stmt = stmt.join(prices, in_effect)
+
     if factory_id:
         stmt = stmt.where(FactorySeed.factory_id == factory_id)
     if seed_id:
@@ -71,22 +113,31 @@ def get_all_factory_seeds(
     if search:
         stmt = stmt.where(
             or_(
-                Factory.factory_name.ilike(f"%{search}%"),
-                Seed.seed_name.ilike(f"%{search}%"),
+                matches(Factory, search),
+                matches(Seed, search),
                 CropYear.crop_year_name.ilike(f"%{search}%"),
             )
         )
 
-    total, pages, items = paginate(session, stmt, page, size)
+    total, pages, items = paginate_rows(session, stmt, page, size)
+
+    return {"total": total, "size": size, "pages": pages, "items": items}
 
-    return {
-        "total": total,
-        "size": size,
-        "pages": pages,
-        "items": [FactorySeedResponse.from_orm_full(fs) for fs in items],
-    }
 
 
+@router.get("/batch", response_model=list[FactorySeedResponse])
+def get_factory_seeds_batch(session: SessionDep, ids: IdsDep):
+    loader = get_loader(session)
+    rows = loader.load_many(FactorySeed, ids)
+    loader.prime(
+        rows.values(),
+        FactorySeed.factory,
+        FactorySeed.crop_year,
+        (FactorySeed.seed, Seed.measure_unit),
+    )
+
+    return [FactorySeedResponse.from_orm_full(rows[i]) for i in ids if i in rows]
+
 
 @router.put("/{id}", response_model=FactorySeedResponse)
 def update_factory_seed(id: int, session: SessionDep, data: FactorySeedUpdate):
@@ -94,23 +145,37 @@ def update_factory_seed(id: int, session: SessionDep, data: FactorySeedUpdate):
     if not fs:
         raise HTTPException(status_code=404, detail="Factory seed not found")
 
-    exist = session.scalar(
-        select(FactorySeed).where(
-            FactorySeed.factory_id == data.factory_id,
-            FactorySeed.seed_id == data.seed_id,
-            FactorySeed.crop_year_id == data.crop_year_id,
-        )
+    values = data.model_dump(exclude_unset=True)
+    # archived rows are gone for new references, as in create_factory_seed
+    for column, model, name in (
+        ("factory_id", Factory, "Factory"),
+        ("seed_id", Seed, "Seed"),
+        ("crop_year_id", CropYear, "Crop year"),
+    ):
+        if column in values and not session.get(model, values[column]):
+            raise HTTPException(status_code=404, detail=f"{name} not found")
+
+    # the allocation key after the update: unchanged fields keep their value
+    key = {
+        column: values.get(column, getattr(fs, column))
+        for column in ("factory_id", "seed_id", "crop_year_id")
+    }
+    conflict = HTTPException(
+        status_code=409,
+        detail=f"A record for factory {key['factory_id']}, seed {key['seed_id']}, and crop year {key['crop_year_id']} already exists",
     )
-    if exist:
-        raise HTTPException(
-            status_code=409,
-            detail=f"A record for factory {data.factory_id}, seed {data.seed_id}, and crop year {data.crop_year_id} already exists",
-        )
+    if exists_where(session, FactorySeed, exclude_id=id, **key):
+        raise conflict
 
-    for k, v in data.model_dump(exclude_unset=True).items():
+    for k, v in values.items():
         setattr(fs, k, v)
 
-    session.commit()
+    try:
+        session.commit()
+    except IntegrityError:
+        # a concurrent write took the unique allocation key
+        session.rollback()
+        raise conflict
     session.refresh(fs)
 
     return FactorySeedResponse.from_orm_full(fs)
@@ -122,6 +187,6 @@ def delete_factory_seed(id: int, session: SessionDep):
     if not fs:
         raise HTTPException(status_code=404, detail="Factory seed not found")
 
-    session.delete(fs)
+    soft_delete(session, fs)
     session.commit()
     return {"message": f"Factory seed {id} deleted successfully"}
@@ -0,0 +1,87 @@
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+
+from ..db import SessionDep
+from ..tracing import TracedRoute
+from ..ingest import load_buffer, IngestOverloaded
+from ..models.loads import Load
+from ..schemas.loads import LoadBatch, LoadBatchResult, LoadResponse
+from ..schemas.pagination import Page, paginate
+
+router = APIRouter(prefix="/loads", tags=["Load"], route_class=TracedRoute)
+
+
+# ---------- Weighbridge batch ingestion ----------
+@router.post("/batch", response_model=LoadBatchResult, status_code=201)
+async def ingest_loads(batch: LoadBatch):
+    rows = [
+        {"terminal_id": batch.terminal_id, **load.model_dump()}
+        for load in batch.loads
+    ]
+
+    try:
+        future = load_buffer.submit(rows)
+    except IngestOverloaded:
+        raise HTTPException(
+            status_code=503,
+            detail="Ingestion queue is full, retry shortly",
+            headers={"Retry-After": "2"},
+        )
+
+    try:
+        inserted, duplicates = await asyncio.wrap_future(future)
+    except IntegrityError:
+        raise HTTPException(
+            status_code=409,
+            detail="Batch references an unknown farmer, driver, factory or crop year",
+        )
+
+    return {"received": len(rows), "inserted": inserted, "duplicates": duplicates}
+
+
+# ---------- Get all Loads ----------
+@router.get("/", response_model=Page[LoadResponse])
+def get_all_loads(
+    session: SessionDep,
+    page: int = Query(1, ge=1),
+    size: int = Query(50, ge=1, le=100),
+    farmer_id: int | None = None,
+    driver_id: int | None = None,
+    crop_year_id: int | None = None,
+    terminal_id: str | None = None,
+    sort_order: str | None = Query("desc", pattern="^(asc|desc)$"),
+):
+    stmt = select(Load)
+
+    if farmer_id:
+        stmt = stmt.where(Load.farmer_id == farmer_id)
+    if driver_id:
+        stmt = stmt.where(Load.driver_id == driver_id)
+    if crop_year_id:
+        stmt = stmt.where(Load.crop_year_id == crop_year_id)
+    if terminal_id:
+        stmt = stmt.where(Load.terminal_id == terminal_id)
+
+    stmt = stmt.order_by(Load.id.desc() if sort_order == "desc" else Load.id)
+
+    total, pages, items = paginate(session, stmt, page, size)
+
+    return {
+        "total": total,
+        "size": size,
+        "pages": pages,
+        "items": items,
+    }
+
+
+@router.get("/{load_id}", response_model=LoadResponse)
+def get_load_by_id(session: SessionDep, load_id: int):
+
+    load = session.get(Load, load_id)
+    if not load:
+        raise HTTPException(status_code=404, detail="Load not found")
+
+    return load
@@ -1,11 +1,14 @@
 from fastapi import APIRouter, HTTPException, Query
 from sqlalchemy import select
 from ..db import SessionDep
+from ..softdelete import soft_delete
+from ..tracing import TracedRoute
 from ..models.measure_units import MeasureUnit
 from ..schemas.measure_units import MeasureUnitCreate, MeasureUnitResponse
 from ..schemas.pagination import Page, paginate
+from ..queries import exists_where
 
-router = APIRouter(prefix="/measure_units", tags=["Measure Unit"])
+router = APIRouter(prefix="/measure_units", tags=["Measure Unit"], route_class=TracedRoute)
 
 
 @router.post("/", response_model=MeasureUnitResponse, status_code=201)
@@ -14,9 +17,7 @@ def create_measure_unit(
     unit: MeasureUnitCreate,
 ):
     # -------- prevent duplicate unit --------
-    exists = session.execute(
-        select(MeasureUnit).where(MeasureUnit.unit_name == unit.unit_name)
-    ).scalar_one_or_none()
+    exists = exists_where(session, MeasureUnit, unit_name=unit.unit_name)
 
     if exists:
         raise HTTPException(
@@ -82,7 +83,7 @@ def delete_measure_unit(
         )
 
     unit_name = unit.unit_name
-    session.delete(unit)
+    soft_delete(session, unit)
     session.commit()
 
     return {"detail": f"Measure unit {unit_id}: {unit_name} deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,30 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from ..admission import admission
+from ..audit import audit_writer
+from ..db import breaker
+from ..idempotency import idempotency
+from ..ingest import load_buffer
+
+router = APIRouter(tags=["Metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+def metrics():
+    # Prometheus text format, per worker
+    return (
+        admission.metrics()
+        + "# TYPE load_ingest_pending_rows gauge\n"
+        + f"load_ingest_pending_rows {load_buffer.pending_rows}\n"
+        + "# TYPE audit_dropped_total counter\n"
+        + f"audit_dropped_total {audit_writer.dropped}\n"
+        + "# TYPE db_breaker_open gauge\n"
+        + f"db_breaker_open {int(breaker.state != 'closed')}\n"
+        + "# TYPE db_breaker_trips_total counter\n"
+        + f"db_breaker_trips_total {breaker.trips}\n"
+        + "# TYPE idempotency_replayed_total counter\n"
+        + f"idempotency_replayed_total {idempotency.replayed}\n"
+        + "# TYPE idempotency_conflicts_total counter\n"
+        + f"idempotency_conflicts_total {idempotency.conflicts}\n"
+    )
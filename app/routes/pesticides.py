@@ -3,12 +3,17 @@ from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
 from ..db import SessionDep
+from ..softdelete import soft_delete
+from ..tracing import TracedRoute
+from ..text import matches
+from ..loaders import IdsDep, get_loader
 from ..models.pesticides import Pesticide
 from ..models.measure_units import MeasureUnit
 from ..schemas.pesticides import PesticideCreate, PesticideResponse
 from ..schemas.pagination import Page, paginate
+from ..queries import exists_where
 
-router = APIRouter(prefix="/pesticides", tags=["Pesticide"])
+router = APIRouter(prefix="/pesticides", tags=["Pesticide"], route_class=TracedRoute)
 
 
 # ---------- Create Pesticide ----------
@@ -18,8 +23,8 @@ def create_pesticide(session: SessionDep, pesticide: PesticideCreate):
     if not session.get(MeasureUnit, pesticide.measure_unit_id):
         raise HTTPException(404, "Measure unit not found")
 
-    exists = session.scalar(
-        select(Pesticide).where(Pesticide.pesticide_name == pesticide.pesticide_name)
+    exists = exists_where(
+        session, Pesticide, pesticide_name=pesticide.pesticide_name
     )
     if exists:
         raise HTTPException(409, "Pesticide already exists")
@@ -50,7 +55,7 @@ def get_all_pesticides(
         stmt = stmt.where(Pesticide.measure_unit_id == measure_unit_id)
 
     if search:
-        stmt = stmt.where(Pesticide.pesticide_name.ilike(f"%{search}%"))
+        stmt = stmt.where(matches(Pesticide, search))
 
     allowed_sorts = ["id", "pesticide_name", "created_at"]
     if sort_by in allowed_sorts:
@@ -69,6 +74,21 @@ def get_all_pesticides(
     }
 
 
+# ---------- Get many Pesticides ----------
+@router.get("/batch", response_model=list[PesticideResponse])
+def get_pesticides_batch(session: SessionDep, ids: IdsDep):
+
+    loader = get_loader(session)
+    pesticides = loader.load_many(Pesticide, ids)
+    loader.prime(pesticides.values(), Pesticide.measure_unit)
+
+    return [
+        PesticideResponse.from_orm_with_unit(pesticides[i])
+        for i in ids
+        if i in pesticides
+    ]
+
+
 # ---------- Delete Pesticide ----------
 @router.delete("/{pesticide_id}")
 def delete_pesticide(session: SessionDep, pesticide_id: int):
@@ -78,7 +98,7 @@ def delete_pesticide(session: SessionDep, pesticide_id: int):
         raise HTTPException(404, "Pesticide not found")
 
     pesticide_name = pesticide.pesticide_name
-    session.delete(pesticide)
+    soft_delete(session, pesticide)
     session.commit()
 
     return {"detail": f"Pesticide {pesticide_id}:{pesticide_name} deleted successfully"}
@@ -1,18 +1,19 @@
 from fastapi import APIRouter, HTTPException, Query
 from ..db import SessionDep
+from ..softdelete import soft_delete
+from ..tracing import TracedRoute
 from ..schemas.provinces import ProvinceCreate, ProvinceOut
 from ..models.provinces import Province
 from sqlalchemy import select
 from ..schemas.pagination import Page, paginate
+from ..queries import exists_where
 
-router = APIRouter(prefix="/provinces", tags=["Province"])
+router = APIRouter(prefix="/provinces", tags=["Province"], route_class=TracedRoute)
 
 
 @router.post("/", response_model=ProvinceOut)
 def create_province(session: SessionDep, province: ProvinceCreate):
-    exists = session.execute(
-        select(Province).where(Province.province == province.province)
-    ).scalar_one_or_none()
+    exists = exists_where(session, Province, province=province.province)
 
     if exists:
         raise HTTPException(status_code=409, detail="Province already exists")
@@ -65,7 +66,7 @@ def delete_province(session: SessionDep, province_id: int):
             detail="Province not found"
         )
     province_name = province.province
-    session.delete(province)
+    soft_delete(session, province)
     session.commit()
 
     return {"detail": f"Province {province_id}: {province_name}  deleted successfully"}
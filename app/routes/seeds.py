@@ -1,14 +1,18 @@
 from fastapi import APIRouter, HTTPException, Query
 from sqlalchemy import select
-from sqlalchemy.orm import selectinload
 
 from ..db import SessionDep
+from ..softdelete import soft_delete
+from ..tracing import TracedRoute
+from ..text import matches
+from ..loaders import IdsDep, get_loader
 from ..models.seeds import Seed
 from ..models.measure_units import MeasureUnit
 from ..schemas.seeds import SeedCreate, SeedResponse
-from ..schemas.pagination import Page, paginate
+from ..schemas.pagination import Page, paginate_rows
+from ..queries import exists_where
 
-router = APIRouter(prefix="/seeds", tags=["Seed"])
+router = APIRouter(prefix="/seeds", tags=["Seed"], route_class=TracedRoute)
 
 
 # ---------- Create Seed ----------
@@ -18,7 +22,7 @@ def create_seed(session: SessionDep, seed: SeedCreate):
     if not session.get(MeasureUnit, seed.measure_unit_id):
         raise HTTPException(404, "Measure unit not found")
 
-    exists = session.scalar(select(Seed).where(Seed.seed_name == seed.seed_name))
+    exists = exists_where(session, Seed, seed_name=seed.seed_name)
     if exists:
         raise HTTPException(409, "Seed already exists")
 
@@ -42,30 +46,39 @@ def get_all_seeds(
     sort_order: str | None = Query("asc", pattern="^(asc|desc)$"),
 ):
 
-    stmt = select(Seed).options(selectinload(Seed.measure_unit))
+    stmt = select(
+        Seed.id,
+        Seed.seed_name,
+        Seed.measure_unit_id,
+        Seed.created_at,
+        MeasureUnit.unit_name,
+    ).outerjoin(MeasureUnit, Seed.measure_unit_id == MeasureUnit.id)
 
     if measure_unit_id:
         stmt = stmt.where(Seed.measure_unit_id == measure_unit_id)
 
     if search:
-        stmt = stmt.where(Seed.seed_name.ilike(f"%{search}%"))
+        stmt = stmt.where(matches(Seed, search))
 
     allowed_sorts = ["id", "seed_name", "created_at"]
     if sort_by in allowed_sorts:
         column = getattr(Seed, sort_by)
         stmt = stmt.order_by(column.desc() if sort_order == "desc" else column)
 
-    total, pages, items = paginate(session, stmt, page, size)
+    total, pages, items = paginate_rows(session, stmt, page, size)
 
-    return {
-        "total": total,
-        "size": size,
-        "pages": pages,
-        "items": [
-            SeedResponse.from_orm_with_unit(seed)
-            for seed in items
-        ],
-    }
+    return {"total": total, "size": size, "pages": pages, "items": items}
+
+
+# ---------- Get many Seeds ----------
+@router.get("/batch", response_model=list[SeedResponse])
+def get_seeds_batch(session: SessionDep, ids: IdsDep):
+
+    loader = get_loader(session)
+    seeds = loader.load_many(Seed, ids)
+    loader.prime(seeds.values(), Seed.measure_unit)
+
+    return [SeedResponse.from_orm_with_unit(seeds[i]) for i in ids if i in seeds]
 
 
 # ---------- Delete Seed ----------
@@ -77,7 +90,7 @@ def delete_seed(session: SessionDep, seed_id: int):
         raise HTTPException(404, "Seed not found")
 
     seed_name = seed.seed_name
-    session.delete(seed)
+    soft_delete(session, seed)
     session.commit()
 
     return {"detail": f"Seed {seed_id}:{seed_name} deleted successfully"}
@@ -0,0 +1,76 @@
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Query
+from sqlalchemy import select
+
+from ..db import SessionDep
+from ..tracing import TracedRoute
+from ..models.settlements import FarmerSettlement
+from ..schemas.settlements import FarmerStatement, FarmerSettlementResponse
+from ..schemas.pagination import Page, paginate
+from ..settlement import SettlementError, run_settlement, settle_farmer, load_rates
+
+router = APIRouter(prefix="/settlements", tags=["Settlement"], route_class=TracedRoute)
+
+
+# ---------- Run season settlement (job) ----------
+@router.post("/{crop_year_id}/run", status_code=202)
+def start_settlement(
+    crop_year_id: int, session: SessionDep, background_tasks: BackgroundTasks
+):
+    try:
+        load_rates(session.connection(), crop_year_id)
+    except SettlementError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    background_tasks.add_task(run_settlement, crop_year_id)
+
+    return {"detail": f"Settlement for crop year {crop_year_id} started"}
+
+
+# ---------- Stored statements ----------
+@router.get("/", response_model=Page[FarmerSettlementResponse])
+def get_all_settlements(
+    session: SessionDep,
+    crop_year_id: int,
+    page: int = Query(1, ge=1),
+    size: int = Query(50, ge=1, le=100),
+    farmer_id: int | None = None,
+    sort_by: str | None = None,
+    sort_order: str | None = Query("asc", pattern="^(asc|desc)$"),
+):
+    stmt = select(FarmerSettlement).where(
+        FarmerSettlement.crop_year_id == crop_year_id
+    )
+
+    if farmer_id:
+        stmt = stmt.where(FarmerSettlement.farmer_id == farmer_id)
+
+    allowed_sorts = ["farmer_id", "final_amount", "net_weight_kg"]
+    if sort_by in allowed_sorts:
+        column = getattr(FarmerSettlement, sort_by)
+        stmt = stmt.order_by(column.desc() if sort_order == "desc" else column)
+
+    total, pages, items = paginate(session, stmt, page, size)
+
+    return {
+        "total": total,
+        "size": size,
+        "pages": pages,
+        "items": items,
+    }
+
+
+# ---------- Live statement for one farmer ----------
+@router.get("/{crop_year_id}/farmers/{farmer_id}", response_model=FarmerStatement)
+def get_farmer_statement(crop_year_id: int, farmer_id: int, session: SessionDep):
+    try:
+        statement = settle_farmer(session.connection(), crop_year_id, farmer_id)
+    except SettlementError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    if statement is None:
+        raise HTTPException(
+            status_code=404,
+            detail="Farmer has no loads or allocations in this crop year",
+        )
+
+    return statement
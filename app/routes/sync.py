@@ -0,0 +1,24 @@
+from fastapi import APIRouter, HTTPException, Query
+
+from ..db import SessionDep
+from ..schemas.sync import SyncResponse
+from ..sync import SyncExpired, changes_since
+from ..tracing import TracedRoute
+
+router = APIRouter(prefix="/sync", tags=["Sync"], route_class=TracedRoute)
+
+
+@router.get("/", response_model=SyncResponse)
+def sync(
+    session: SessionDep,
+    since: str | None = Query(None, description="token from the previous sync; omit for a full copy"),
+    limit: int = Query(1000, ge=1, le=10000, description="rows per table"),
+):
+    if since is not None and not since.isdigit():
+        raise HTTPException(status_code=422, detail="Invalid sync token")
+    try:
+        return changes_since(session, since, limit)
+    except SyncExpired:
+        raise HTTPException(
+            status_code=410, detail="Sync token expired, start again without since"
+        )
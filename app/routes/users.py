@@ -1,12 +1,17 @@
 from fastapi import APIRouter, HTTPException, status, Query
 from sqlalchemy import select
 from ..db import SessionDep
+from ..softdelete import soft_delete
+from ..tracing import TracedRoute
+from ..text import matches
+from ..loaders import IdsDep, get_loader
 from ..schemas.users import UserCreate, UserUpdate, UserResponse
 from ..models.users import User
 from ..models.roles import Role
 from ..schemas.pagination import Page, paginate
+from ..queries import exists_where
 
-router = APIRouter(prefix="/users", tags=["User"])
+router = APIRouter(prefix="/users", tags=["User"], route_class=TracedRoute)
 
 
 @router.post(
@@ -15,20 +20,19 @@ router = APIRouter(prefix="/users", tags=["User"])
     status_code=status.HTTP_201_CREATED,
 )
 def create_user(user: UserCreate, session: SessionDep):
-    stmt = select(User).where(User.username == user.username)
-    if session.scalar(stmt):
+    if exists_where(session, User, username=user.username):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Username already exists",
         )
-    stmt = select(User).where(User.email == user.email)
-    if session.scalar(stmt):
+    if exists_where(session, User, email=user.email):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Email already exists",
         )
-    stmt = select(User).where(User.phone_number == user.phone_number)
-    if session.scalar(stmt):
+    if user.phone_number is not None and exists_where(
+        session, User, phone_number=user.phone_number
+    ):
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Phone number already exists",
@@ -69,11 +73,8 @@ def get_all_users(
 
     # -------- search --------
     if search:
-        stmt = stmt.where(
-            (User.username.ilike(f"%{search}%"))
-            | (User.email.ilike(f"%{search}%"))
-            | (User.fullname.ilike(f"%{search}%"))
-        )
+        # fullname, username and email, normalized
+        stmt = stmt.where(matches(User, search))
 
     # -------- sorting --------
     allowed_sorts = ["id", "username", "email", "created_at"]
@@ -94,6 +95,13 @@ def get_all_users(
     }
 
 
+@router.get("/batch", response_model=list[UserResponse])
+def get_users_batch(session: SessionDep, ids: IdsDep):
+    users = get_loader(session).load_many(User, ids)
+
+    return [users[i] for i in ids if i in users]
+
+
 @router.get("/{user_id}", response_model=UserResponse)
 def get_user(user_id: int, session: SessionDep):
     user = session.get(User, user_id)
@@ -118,11 +126,8 @@ def update_user(
 
     # ---------- username uniqueness ----------
     if "username" in data:
-        exists = session.scalar(
-            select(User).where(
-                User.username == data["username"],
-                User.id != user_id,
-            )
+        exists = exists_where(
+            session, User, exclude_id=user_id, username=data["username"]
         )
         if exists:
             raise HTTPException(
@@ -132,11 +137,8 @@ def update_user(
 
     # ---------- email uniqueness ----------
     if "email" in data:
-        exists = session.scalar(
-            select(User).where(
-                User.email == data["email"],
-                User.id != user_id,
-            )
+        exists = exists_where(
+            session, User, exclude_id=user_id, email=data["email"]
         )
         if exists:
             raise HTTPException(
@@ -146,11 +148,8 @@ def update_user(
 
     # ---------- phone uniqueness ----------
     if "phone_number" in data and data["phone_number"] is not None:
-        exists = session.scalar(
-            select(User).where(
-                User.phone_number == data["phone_number"],
-                User.id != user_id,
-            )
+        exists = exists_where(
+            session, User, exclude_id=user_id, phone_number=data["phone_number"]
         )
         if exists:
             raise HTTPException(
@@ -209,7 +208,7 @@ def delete_user(session: SessionDep, user_id: int):
             detail="User not found"
         )
     user_name = user.fullname
-    session.delete(user)
+    soft_delete(session, user)
     session.commit()
 
     return {"detail": f"User {user_id}: {user_name}  deleted successfully"}
\ No newline at end of file
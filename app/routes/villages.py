@@ -1,12 +1,16 @@
 from fastapi import APIRouter, HTTPException, Query
 from sqlalchemy import select
 from ..db import SessionDep
+from ..softdelete import soft_delete
+from ..tracing import TracedRoute
+from ..text import matches
 from ..models.villages import Village
 from ..models.cities import City
 from ..schemas.villages import VillageCreate, VillageOut
 from ..schemas.pagination import Page, paginate
+from ..queries import exists_where
 
-router = APIRouter(prefix="/villages", tags=["Village"])
+router = APIRouter(prefix="/villages", tags=["Village"], route_class=TracedRoute)
 
 
 @router.post("/", response_model=VillageOut, status_code=201)
@@ -20,9 +24,9 @@ def create_village(
         raise HTTPException(status_code=404, detail="City not found")
     
     # -------- prevent duplicate villages in same city --------
-    exists = session.execute(
-        select(Village).where(Village.village == village.village, Village.city_id == village.city_id)
-    ).scalar_one_or_none()
+    exists = exists_where(
+        session, Village, village=village.village, city_id=village.city_id
+    )
 
     if exists:
         raise HTTPException(
@@ -59,7 +63,7 @@ def get_all_villages(
 
     # -------- search --------
     if search:
-        stmt = stmt.where(Village.village.ilike(f"%{search}%"))
+        stmt = stmt.where(matches(Village, search))
 
     # -------- sorting --------
     allowed_sorts = ["id", "village", "created_at", "city_id"]
@@ -94,7 +98,7 @@ def delete_city(
         )
 
     village_name = village.village
-    session.delete(village)
+    soft_delete(session, village)
     session.commit()
 
     return {"detail": f"Village {village_id}: {village_name} deleted successfully"}
\ No newline at end of file
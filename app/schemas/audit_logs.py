@@ -0,0 +1,16 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+from typing import Any
+
+
+class AuditLogResponse(BaseModel):
+    id: int
+    entity: str
+    entity_id: int | None
+    action: str
+    changes: dict[str, Any]
+    actor: str | None
+    request: str | None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,9 @@
+from typing import Literal
+
+from pydantic import BaseModel
+
+
+class AutocompleteItem(BaseModel):
+    kind: Literal["village", "city", "driver", "farmer"]
+    id: int
+    label: str
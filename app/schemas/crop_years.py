@@ -12,12 +12,25 @@ class CropYearBase(BaseModel):
     )
 
 
+# -------- settlement rates --------
+class CropYearRates(BaseModel):
+    beet_price_per_ton: float | None = Field(None, ge=0)
+    base_sugar_grade: float | None = Field(None, gt=0, le=100)
+    sugar_quota_kg_per_ton: float | None = Field(None, ge=0)
+    pulp_quota_kg_per_ton: float | None = Field(None, ge=0)
+
+
 # -------- create --------
-class CropYearCreate(CropYearBase):
+class CropYearCreate(CropYearRates, CropYearBase):
     pass
 
 
+# -------- update --------
+class CropYearUpdate(CropYearRates):
+    crop_year_name: str | None = Field(None, min_length=3, max_length=100)
+
+
 # -------- response --------
-class CropYearResponse(CropYearBase):
+class CropYearResponse(CropYearRates, CropYearBase):
     id: int
     created_at: datetime
\ No newline at end of file
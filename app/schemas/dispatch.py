@@ -0,0 +1,32 @@
+from pydantic import BaseModel, Field
+
+
+class Pickup(BaseModel):
+    village_id: int
+    tons: float = Field(..., gt=0)
+
+
+class DispatchRequest(BaseModel):
+    pickups: list[Pickup] = Field(..., min_length=1, max_length=100_000)
+    driver_ids: list[int] | None = None
+    car_id: int | None = None
+    max_rounds: int | None = Field(None, ge=1)
+
+
+class Stop(BaseModel):
+    village_id: int
+    tons: float
+
+
+class TripOut(BaseModel):
+    driver_id: int
+    round: int
+    load_ton: float
+    capacity_ton: float
+    stops: list[Stop]
+
+
+class DispatchPlan(BaseModel):
+    rounds: int
+    trips: list[TripOut]
+    unassigned: list[Stop]
@@ -0,0 +1,33 @@
+from typing import Literal
+
+from pydantic import BaseModel, Field, model_validator
+
+
+class DistributionItem(BaseModel):
+    farmer_id: int
+    factory_seed_id: int | None = None
+    factory_pesticide_id: int | None = None
+    amount: float = Field(..., gt=0)
+
+    @model_validator(mode="after")
+    def one_stock_row(self):
+        if (self.factory_seed_id is None) == (self.factory_pesticide_id is None):
+            raise ValueError("Give exactly one of factory_seed_id and factory_pesticide_id")
+        return self
+
+
+class DistributionBatch(BaseModel):
+    crop_year_id: int
+    items: list[DistributionItem] = Field(..., min_length=1, max_length=1000)
+
+
+class StockLevel(BaseModel):
+    kind: Literal["seed", "pesticide"]
+    id: int
+    amount: float
+
+
+class DistributionResult(BaseModel):
+    # in the order of the submitted items
+    allocation_ids: list[int]
+    remaining: list[StockLevel]
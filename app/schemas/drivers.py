@@ -1,6 +1,7 @@
 from pydantic import BaseModel, ConfigDict
 from datetime import datetime
 from ..models.drivers import Driver
+from ..tracing import traced
 
 
 class DriverBase(BaseModel):
@@ -43,6 +44,7 @@ class DriverResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     @classmethod
+    @traced("DriverResponse.from_orm_full")
     def from_orm_full(cls, d: Driver) -> "DriverResponse":
         return cls(
             id=d.id,
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, ConfigDict
 from ..models.factory_pesticides import FactoryPesticide
 from datetime import datetime
+from ..tracing import traced
 
 class FactoryPesticideBase(BaseModel):
     factory_id: int
@@ -43,6 +44,7 @@ class FactoryPesticideResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     @classmethod
+    @traced("FactoryPesticideResponse.from_orm_full")
     def from_orm_full(cls, fs: FactoryPesticide) -> "FactoryPesticideResponse":
         return cls(
             id=fs.id,
@@ -1,6 +1,7 @@
 from pydantic import BaseModel, ConfigDict
 from ..models.factory_seeds import FactorySeed
 from datetime import datetime
+from ..tracing import traced
 
 class FactorySeedBase(BaseModel):
     factory_id: int
@@ -43,6 +44,7 @@ class FactorySeedResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     @classmethod
+    @traced("FactorySeedResponse.from_orm_full")
     def from_orm_full(cls, fs: FactorySeed) -> "FactorySeedResponse":
         return cls(
             id=fs.id,
@@ -0,0 +1,33 @@
+from pydantic import BaseModel, ConfigDict, Field
+from datetime import datetime
+
+
+class LoadIn(BaseModel):
+    terminal_load_id: str = Field(..., min_length=1, max_length=64)
+    farmer_id: int
+    driver_id: int
+    factory_id: int
+    crop_year_id: int
+    weight_kg: float = Field(..., gt=0)
+    sugar_grade: float = Field(..., ge=0, le=100)
+    loss_percent: float = Field(..., ge=0, le=100)
+    weighed_at: datetime
+
+
+class LoadBatch(BaseModel):
+    terminal_id: str = Field(..., min_length=1, max_length=50)
+    loads: list[LoadIn] = Field(..., min_length=1, max_length=5000)
+
+
+class LoadBatchResult(BaseModel):
+    received: int
+    inserted: int
+    duplicates: int
+
+
+class LoadResponse(LoadIn):
+    id: int
+    terminal_id: str
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
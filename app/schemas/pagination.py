@@ -24,7 +24,8 @@ def paginate(
     """
 
     # -------- total count --------
-    total_stmt = select(func.count()).select_from(stmt.subquery())
+    # ORDER BY is irrelevant for a count; dropping it spares postgres the sort
+    total_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
     total = session.execute(total_stmt).scalar_one()
 
     # -------- pages --------
@@ -35,3 +36,25 @@ def paginate(
     items = session.execute(stmt).scalars().all()
 
     return total, pages, items
+
+
+def paginate_rows(
+    session: Session,
+    stmt,
+    page: int,
+    size: int,
+):
+    """
+    Like paginate, for column selects: items are read-only row mappings
+    (no ORM entities, no identity map) that the response model validates
+    directly.
+    """
+    total_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
+    total = session.execute(total_stmt).scalar_one()
+
+    pages = (total + size - 1) // size
+
+    stmt = stmt.offset((page - 1) * size).limit(size)
+    items = session.execute(stmt).mappings().all()
+
+    return total, pages, items
@@ -0,0 +1,24 @@
+from pydantic import BaseModel, ConfigDict
+from datetime import datetime
+
+
+class FarmerStatement(BaseModel):
+    farmer_id: int
+    load_count: int
+    gross_weight_kg: float
+    net_weight_kg: float
+    avg_sugar_grade: float
+    beet_amount: float
+    seed_deduction: float
+    pesticide_deduction: float
+    final_amount: float
+    sugar_quota_kg: float
+    pulp_quota_kg: float
+
+
+class FarmerSettlementResponse(FarmerStatement):
+    id: int
+    crop_year_id: int
+    computed_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
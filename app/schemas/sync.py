@@ -0,0 +1,17 @@
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class TableRows(BaseModel):
+    columns: list[str]
+    rows: list[list[Any]]
+
+
+class SyncResponse(BaseModel):
+    token: str
+    has_more: bool
+    # table -> rows, in the order to apply them
+    upserts: dict[str, TableRows]
+    # table -> deleted ids
+    deletes: dict[str, list[int]]
@@ -0,0 +1,206 @@
+"""
+Season-close settlement engine.
+
+A crop year's loads and farmer allocations are pulled as plain columns,
+turned into numpy arrays, and every farmer's statement is computed with
+grouped array reductions (np.bincount) instead of per-row ORM objects.
+Seed and pesticide deductions use the farmer price in effect when each
+allocation was made (app/prices.py).
+
+    python -m app.settlement <crop_year_id>
+"""
+import sys
+
+import numpy as np
+from sqlalchemy import delete, func, insert, select
+
+from .audit import audit_writer, core_entry
+from .db import engine
+from .models import CropYear, FactoryPesticide, FactorySeed, FarmerAllocation, Load
+from .models.settlements import FarmerSettlement
+from .prices import price_at
+
+FETCH_CHUNK = 100_000
+
+COLUMNS = (
+    "farmer_id",
+    "load_count",
+    "gross_weight_kg",
+    "net_weight_kg",
+    "avg_sugar_grade",
+    "beet_amount",
+    "seed_deduction",
+    "pesticide_deduction",
+    "final_amount",
+    "sugar_quota_kg",
+    "pulp_quota_kg",
+)
+
+
+class SettlementError(Exception):
+    pass
+
+
+def _fetch(connection, stmt, ncols):
+    result = connection.execution_options(yield_per=FETCH_CHUNK).execute(stmt)
+    parts = [np.array(part, dtype=np.float64) for part in result.partitions()]
+    if not parts:
+        return np.empty((0, ncols))
+    return np.concatenate(parts)
+
+
+def load_rates(connection, crop_year_id):
+    rates = connection.execute(
+        select(
+            CropYear.beet_price_per_ton,
+            CropYear.base_sugar_grade,
+            CropYear.sugar_quota_kg_per_ton,
+            CropYear.pulp_quota_kg_per_ton,
+        ).where(CropYear.id == crop_year_id)
+    ).one_or_none()
+    if rates is None:
+        raise SettlementError("Crop year not found")
+    if rates.beet_price_per_ton is None:
+        raise SettlementError("Crop year has no beet price per ton")
+    return rates
+
+
+def compute(connection, crop_year_id, farmer_id=None):
+    """
+    Statements for every farmer of the crop year (or just one), as a dict
+    of equally long numpy arrays keyed by COLUMNS.
+    """
+    rates = load_rates(connection, crop_year_id)
+
+    loads_stmt = select(
+        Load.farmer_id, Load.weight_kg, Load.sugar_grade, Load.loss_percent
+    ).where(Load.crop_year_id == crop_year_id)
+
+    # bags are charged at the price in effect when they were issued, not at
+    # today's; the current price only covers allocations without history
+    seed_prices, seed_in_effect = price_at(FactorySeed, FarmerAllocation.created_at)
+    pesticide_prices, pesticide_in_effect = price_at(
+        FactoryPesticide, FarmerAllocation.created_at
+    )
+    allocations_stmt = (
+        select(
+            FarmerAllocation.farmer_id,
+            FarmerAllocation.amount
+            * func.coalesce(seed_prices.farmer_price, FactorySeed.farmer_price, 0),
+            FarmerAllocation.amount
+            * func.coalesce(
+                pesticide_prices.farmer_price, FactoryPesticide.farmer_price, 0
+            ),
+        )
+        .outerjoin(FactorySeed, FarmerAllocation.factory_seed_id == FactorySeed.id)
+        .outerjoin(seed_prices, seed_in_effect)
+        .outerjoin(
+            FactoryPesticide,
+            FarmerAllocation.factory_pesticide_id == FactoryPesticide.id,
+        )
+        .outerjoin(pesticide_prices, pesticide_in_effect)
+        .where(FarmerAllocation.crop_year_id == crop_year_id)
+    )
+
+    if farmer_id is not None:
+        loads_stmt = loads_stmt.where(Load.farmer_id == farmer_id)
+        allocations_stmt = allocations_stmt.where(
+            FarmerAllocation.farmer_id == farmer_id
+        )
+
+    loads = _fetch(connection, loads_stmt, 4)
+    allocations = _fetch(connection, allocations_stmt, 3)
+
+    load_farmers = loads[:, 0].astype(np.int64)
+    alloc_farmers = allocations[:, 0].astype(np.int64)
+    farmers = np.union1d(load_farmers, alloc_farmers)
+    n = len(farmers)
+
+    # -------- loads --------
+    li = np.searchsorted(farmers, load_farmers)
+    weight, grade, loss = loads[:, 1], loads[:, 2], loads[:, 3]
+
+    net_each = weight * (1 - loss / 100)
+    grade_factor = grade / rates.base_sugar_grade if rates.base_sugar_grade else 1.0
+    amount_each = net_each / 1000 * rates.beet_price_per_ton * grade_factor
+
+    load_count = np.bincount(li, minlength=n)
+    gross = np.bincount(li, weights=weight, minlength=n)
+    net = np.bincount(li, weights=net_each, minlength=n)
+    graded = np.bincount(li, weights=net_each * grade, minlength=n)
+    avg_grade = np.divide(graded, net, out=np.zeros(n), where=net > 0)
+    beet_amount = np.bincount(li, weights=amount_each, minlength=n)
+
+    # -------- deductions --------
+    ai = np.searchsorted(farmers, alloc_farmers)
+    seed = np.bincount(ai, weights=allocations[:, 1], minlength=n)
+    pesticide = np.bincount(ai, weights=allocations[:, 2], minlength=n)
+
+    net_tons = net / 1000
+
+    return {
+        "farmer_id": farmers,
+        "load_count": load_count,
+        "gross_weight_kg": gross,
+        "net_weight_kg": net,
+        "avg_sugar_grade": avg_grade,
+        "beet_amount": beet_amount,
+        "seed_deduction": seed,
+        "pesticide_deduction": pesticide,
+        "final_amount": beet_amount - seed - pesticide,
+        "sugar_quota_kg": net_tons * (rates.sugar_quota_kg_per_ton or 0),
+        "pulp_quota_kg": net_tons * (rates.pulp_quota_kg_per_ton or 0),
+    }
+
+
+def to_rows(result):
+    columns = [result[c].tolist() for c in COLUMNS]
+    return [dict(zip(COLUMNS, values)) for values in zip(*columns)]
+
+
+def settle_farmer(connection, crop_year_id, farmer_id):
+    rows = to_rows(compute(connection, crop_year_id, farmer_id))
+    return rows[0] if rows else None
+
+
+def run_settlement(crop_year_id) -> int:
+    """
+    Recompute and store every farmer statement of the crop year.
+
+    Audited as one entry per run, keyed by the crop year: the statements
+    are derived from audited loads, allocations and prices, so an entry per
+    farmer would only repeat them.
+    """
+    with engine.begin() as connection:
+        # one run per crop year at a time, across workers
+        connection.execute(select(func.pg_advisory_xact_lock(crop_year_id)))
+
+        rows = to_rows(compute(connection, crop_year_id))
+        replaced = connection.execute(
+            delete(FarmerSettlement).where(
+                FarmerSettlement.crop_year_id == crop_year_id
+            )
+        ).rowcount
+        if rows:
+            connection.execute(
+                insert(FarmerSettlement),
+                [{"crop_year_id": crop_year_id, **row} for row in rows],
+            )
+    audit_writer.submit(
+        [
+            core_entry(
+                "farmer_settlements",
+                crop_year_id,
+                "update",
+                {"farmers": (replaced, len(rows))},
+            )
+        ]
+    )
+    return len(rows)
+
+
+if __name__ == "__main__":
+    audit_writer.start()
+    count = run_settlement(int(sys.argv[1]))
+    audit_writer.stop()  # flushes the run's audit entry
+    print(f"settled {count} farmers")
@@ -0,0 +1,99 @@
+"""
+Soft delete.
+
+Rows of SoftDelete models are never removed: deleting one sets its
+deleted_at. Every ORM select a session runs is scoped to live rows
+(deleted_at IS NULL) by a do_orm_execute hook, primary key lookups
+included, so routes read as if the row were gone. Archived rows stay
+visible to:
+
+- relationship loads and attribute refreshes, so a load's driver or an
+  allocation's factory seed keeps resolving;
+- statements run with execution_options(include_deleted=True);
+- Core queries on a plain connection (app/settlement.py).
+
+Unique columns are declared with live_unique: a partial unique index over
+live rows, so a name is free again once its row is deleted and lookups
+never walk the archive. Reports of a soft delete (change feed, audit,
+sync tombstones) see it as a delete, see app/changes.py.
+"""
+import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import DateTime, Index, event, select, text
+from sqlalchemy.orm import Mapped, mapped_column, with_loader_criteria
+
+from .db import Base, SessionLocal
+
+LIVE = "deleted_at IS NULL"
+
+
+class SoftDelete:
+    deleted_at: Mapped[DateTime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+
+
+def live_unique(table, *columns):
+    """
+    Unique index on columns over live rows only, for __table_args__.
+    """
+    return Index(
+        f"ux_{table}_{'_'.join(columns)}",
+        *columns,
+        unique=True,
+        postgresql_where=text(LIVE),
+        sqlite_where=text(LIVE),
+    )
+
+
+# -------- reads --------
+@event.listens_for(SessionLocal, "do_orm_execute")
+def _live_rows_only(state):
+    # rewrites every select, so build queries with select(), not lambda_stmt:
+    # a rewritten lambda statement can replay the values of its first call
+    if (
+        state.is_select
+        and not state.is_relationship_load
+        and not state.is_column_load
+        and not state.execution_options.get("include_deleted", False)
+    ):
+        state.statement = state.statement.options(
+            with_loader_criteria(
+                SoftDelete,
+                lambda cls: cls.deleted_at.is_(None),
+                include_aliases=True,
+                # lazy loads of the returned rows must still see archived rows
+                propagate_to_loaders=False,
+            )
+        )
+
+
+# -------- deletes --------
+def _referrers(model):
+    """
+    (referencing model, fk column) for every soft-deletable model pointing at model.
+    """
+    found = []
+    for mapper in Base.registry.mappers:
+        if not issubclass(mapper.class_, SoftDelete):
+            continue
+        for column in mapper.local_table.columns:
+            if any(fk.column.table is model.__table__ for fk in column.foreign_keys):
+                found.append((mapper.class_, column))
+    return found
+
+
+def soft_delete(session, obj):
+    """
+    Mark obj deleted. Like the RESTRICT foreign keys did for hard deletes,
+    refuse while live rows still point at it.
+    """
+    for referrer, column in _referrers(type(obj)):
+        if session.scalar(select(referrer.id).where(column == obj.id).limit(1)):
+            raise HTTPException(
+                status_code=409,
+                detail=f"Still referenced by {referrer.__tablename__}",
+            )
+    # a plain value, not func.now(): the flush hooks read it from history
+    obj.deleted_at = datetime.datetime.now(datetime.timezone.utc)
@@ -0,0 +1,199 @@
+"""
+Delta sync for offline field devices.
+
+A device keeps a token (a watermark, microseconds since the epoch) and
+asks for everything that changed since: rows whose updated_at falls in
+[since, upper) and tombstones from the deletions log in the same window.
+
+upper is not simply now(): updated_at is the writing transaction's start
+time, so a row from a transaction still in flight would show up *behind*
+a watermark that was already handed out. upper is therefore the start of
+the oldest open transaction (or now() when there is none), and rows at or
+after it are left for the next sync.
+
+    python -m app.sync prune   # drop tombstones past the retention window
+"""
+import datetime
+import os
+import sys
+
+from sqlalchemy import delete, event, func, insert, select, text
+from sqlalchemy.orm import Session
+
+from .changes import collect_changes
+from .db import SessionLocal, engine
+from .models import (
+    Car,
+    City,
+    CropYear,
+    Deletion,
+    Driver,
+    Factory,
+    FactoryPesticide,
+    FactorySeed,
+    MeasureUnit,
+    Pesticide,
+    Province,
+    Seed,
+    Village,
+)
+
+# in dependency order, so a device can apply upserts front to back
+SYNCED = (
+    Province,
+    City,
+    Village,
+    MeasureUnit,
+    Seed,
+    Pesticide,
+    Factory,
+    CropYear,
+    FactorySeed,
+    FactoryPesticide,
+    Car,
+    Driver,
+)
+SYNCED_TABLES = {model.__tablename__ for model in SYNCED}
+
+# internal columns devices do not need
+EXCLUDED_COLUMNS = {"search_text", "deleted_at"}
+
+RETENTION = datetime.timedelta(days=int(os.getenv("SYNC_RETENTION_DAYS", "90")))
+EPOCH = datetime.datetime(1970, 1, 1, tzinfo=datetime.timezone.utc)
+ONE_TICK = datetime.timedelta(microseconds=1)
+
+
+class SyncExpired(Exception):
+    """
+    The token is older than the deletions log keeps; resync from scratch.
+    """
+
+
+def encode_token(moment):
+    return str((moment - EPOCH) // ONE_TICK)
+
+
+def decode_token(token):
+    return EPOCH + int(token) * ONE_TICK
+
+
+# -------- tombstones, written with the delete itself --------
+@event.listens_for(SessionLocal, "after_flush")
+def _record_deletions(session, flush_context):
+    rows = [
+        {"entity": entity, "entity_id": entity_id}
+        for entity, entity_id, action, _ in collect_changes(session)
+        if action == "delete" and entity in SYNCED_TABLES
+    ]
+    if rows:
+        session.connection().execute(insert(Deletion), rows)
+
+
+# -------- reads --------
+_OLDEST_OPEN_TRANSACTION = text(
+    "SELECT min(xact_start) FROM pg_stat_activity"
+    " WHERE datname = current_database() AND pid <> pg_backend_pid()"
+    " AND xact_start IS NOT NULL"
+)
+
+
+def safe_upper(session: Session):
+    now = session.execute(select(func.now())).scalar_one()
+    if session.bind.dialect.name != "postgresql":
+        return now
+    oldest = session.execute(_OLDEST_OPEN_TRANSACTION).scalar_one()
+    return min(now, oldest) if oldest is not None else now
+
+
+def _columns(model):
+    # mapped attributes rather than table columns, so the soft delete
+    # scope applies and deleted rows only show up as tombstones
+    return [
+        getattr(model, c.key)
+        for c in model.__mapper__.column_attrs
+        if c.key not in EXCLUDED_COLUMNS
+    ]
+
+
+def _changed_rows(session, model, since, upper, limit):
+    """
+    Rows of one table in [since, upper), at most about limit of them, and
+    the point up to which they are complete.
+    """
+    columns = _columns(model)
+    updated_at = model.updated_at
+    rows = session.execute(
+        select(*columns)
+        .where(updated_at >= since, updated_at < upper)
+        .order_by(updated_at, model.id)
+        .limit(limit + 1)
+    ).all()
+    if len(rows) <= limit:
+        return columns, rows, upper
+
+    cut = rows[limit].updated_at
+    if cut > since:
+        # everything strictly before the first row left out is complete
+        return columns, [r for r in rows if r.updated_at < cut], cut
+
+    # more than limit rows share one timestamp (one big transaction):
+    # send that whole group, the token cannot advance otherwise
+    rows = session.execute(
+        select(*columns)
+        .where(updated_at == since)
+        .order_by(model.id)
+    ).all()
+    return columns, rows, since + ONE_TICK
+
+
+def changes_since(session: Session, token: str | None, limit: int = 1000):
+    safe = upper = safe_upper(session)
+    since = decode_token(token) if token else EPOCH
+    if token and since < upper - RETENTION:
+        raise SyncExpired()
+
+    fetched = []
+    for model in SYNCED:
+        columns, rows, complete_until = _changed_rows(session, model, since, upper, limit)
+        fetched.append((model, columns, rows))
+        upper = min(upper, complete_until)
+
+    upserts = {}
+    for model, columns, rows in fetched:
+        # a later table may have lowered upper: keep every table consistent
+        rows = [r for r in rows if r.updated_at < upper]
+        if rows:
+            upserts[model.__tablename__] = {
+                "columns": [c.key for c in columns],
+                "rows": [list(r) for r in rows],
+            }
+
+    deletes = {}
+    for entity, entity_id in session.execute(
+        select(Deletion.entity, Deletion.entity_id)
+        .where(Deletion.deleted_at >= since, Deletion.deleted_at < upper)
+        .order_by(Deletion.id)
+    ):
+        deletes.setdefault(entity, []).append(entity_id)
+
+    return {
+        "token": encode_token(upper),
+        "has_more": upper < safe,
+        "upserts": upserts,
+        "deletes": deletes,
+    }
+
+
+def prune_deletions() -> int:
+    with engine.begin() as connection:
+        result = connection.execute(
+            delete(Deletion).where(Deletion.deleted_at < func.now() - RETENTION)
+        )
+    return result.rowcount
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] == ["prune"]:
+        print(f"pruned {prune_deletions()} tombstones")
+    else:
+        print(__doc__)
@@ -0,0 +1,126 @@
+"""
+Persian text normalization for search.
+
+Names reach the API typed on Arabic and Persian keyboards alike: ي/ی,
+ك/ک, ZWNJ or a space or nothing between word parts, diacritics, tatweel,
+Persian/Arabic digits. normalize_fa folds all of these to one form.
+
+Searchable models get a `search_text` column holding the normalized
+form of their name columns, filled by mapper events on every ORM insert
+and update; search filters compare the normalized term against it with
+LIKE, which the pg_trgm GIN index on that column serves (migration 0005).
+Rows written around the ORM are refreshed with
+
+    python -m app.text backfill
+"""
+import re
+import sys
+
+from sqlalchemy import Index, bindparam, column, event, select, table, update
+
+_CHARS = str.maketrans(
+    {
+        "ي": "ی",
+        "ى": "ی",
+        "ئ": "ی",
+        "ك": "ک",
+        "ة": "ه",
+        "ۀ": "ه",
+        "أ": "ا",
+        "إ": "ا",
+        "ٱ": "ا",
+        "آ": "ا",
+        "ؤ": "و",
+        "\u200c": " ",  # ZWNJ
+        "\u200d": "",  # ZWJ
+        "\u0640": "",  # tatweel
+        **{chr(0x06F0 + d): str(d) for d in range(10)},  # ۰-۹
+        **{chr(0x0660 + d): str(d) for d in range(10)},  # ٠-٩
+    }
+)
+_DIACRITICS = re.compile(r"[\u064b-\u065f\u0670]")
+_SPACES = re.compile(r"\s+")
+
+
+def normalize_fa(text: str | None) -> str:
+    if not text:
+        return ""
+    text = _DIACRITICS.sub("", text.translate(_CHARS))
+    return _SPACES.sub(" ", text).strip().casefold()
+
+
+# -------- search_text maintenance --------
+# table -> source columns of every @searchable model
+SEARCHABLE = {}
+
+
+def searchable(*columns):
+    """
+    Class decorator: keep model.search_text = normalize_fa(columns...).
+    """
+
+    def decorator(model):
+        def fill(mapper, connection, target):
+            target.search_text = normalize_fa(
+                " ".join(str(v) for v in (getattr(target, c) for c in columns) if v)
+            )
+
+        SEARCHABLE[model.__tablename__] = columns
+        event.listen(model, "before_insert", fill)
+        event.listen(model, "before_update", fill)
+        # trigram index so LIKE '%term%' does not scan the table; over live
+        # rows only for soft-deletable models (app/softdelete.py)
+        deleted_at = model.__table__.c.get("deleted_at")
+        Index(
+            f"ix_{model.__tablename__}_search_text_trgm",
+            model.__table__.c.search_text,
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+            postgresql_where=deleted_at.is_(None) if deleted_at is not None else None,
+        )
+        return model
+
+    return decorator
+
+
+def matches(model, term):
+    """
+    WHERE clause for a free-text search on a searchable model.
+    """
+    return model.search_text.contains(normalize_fa(term), autoescape=True)
+
+
+def backfill(connection, table_name, columns, batch=5000):
+    """
+    Recompute search_text for every row of table_name.
+    """
+    t = table(table_name, column("id"), column("search_text"), *map(column, columns))
+    stmt = (
+        update(t)
+        .where(t.c.id == bindparam("_id"))
+        .values(search_text=bindparam("_text"))
+    )
+    rows = connection.execute(select(t.c.id, *(t.c[c] for c in columns))).all()
+    for start in range(0, len(rows), batch):
+        connection.execute(
+            stmt,
+            [
+                {
+                    "_id": row[0],
+                    "_text": normalize_fa(" ".join(str(v) for v in row[1:] if v)),
+                }
+                for row in rows[start : start + batch]
+            ],
+        )
+    return len(rows)
+
+
+if __name__ == "__main__":
+    if sys.argv[1:] != ["backfill"]:
+        sys.exit(__doc__)
+    import app.models  # noqa: F401  (register every @searchable model)
+    from app.db import engine
+
+    with engine.begin() as connection:
+        for name, columns in SEARCHABLE.items():
+            print(f"{name}: {backfill(connection, name, columns)} rows")
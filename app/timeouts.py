@@ -0,0 +1,81 @@
+"""
+Per-route statement_timeout / lock_timeout.
+
+TimeoutMiddleware picks the limits for the request path; every session
+transaction opened while serving it starts with SET LOCAL equivalents,
+so one slow search cannot hold a pooled connection indefinitely.
+"""
+import contextvars
+import os
+
+from sqlalchemy import event, text
+
+from .db import SessionLocal
+
+STATEMENT_TIMEOUT_MS = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "5000"))
+LOCK_TIMEOUT_MS = int(os.getenv("DB_LOCK_TIMEOUT_MS", "2000"))
+
+# (statement_timeout_ms, lock_timeout_ms) for the current request
+current_timeouts = contextvars.ContextVar(
+    "db_timeouts", default=(STATEMENT_TIMEOUT_MS, LOCK_TIMEOUT_MS)
+)
+
+
+def _route_timeouts(spec):
+    """
+    "/settlements/=60000,/drivers/=2000"  ->  {prefix: statement_timeout_ms}
+    """
+    timeouts = {}
+    for item in filter(None, (s.strip() for s in spec.split(","))):
+        prefix, _, value = item.partition("=")
+        timeouts[prefix] = int(value)
+    return timeouts
+
+
+ROUTE_TIMEOUTS = _route_timeouts(
+    os.getenv(
+        "DB_ROUTE_TIMEOUTS",
+        # free-text searches over joined tables get a tight budget,
+        # statements and reports a generous one
+        "/drivers/=2000,/factory_seeds/=2000,/factory_pesticides/=2000,"
+        "/settlements/=60000,/audit-logs/=15000",
+    )
+)
+
+_SET_TIMEOUTS = text(
+    "SELECT set_config('statement_timeout', :statement, true),"
+    " set_config('lock_timeout', :lock, true)"
+)
+
+
+@event.listens_for(SessionLocal, "after_begin")
+def _apply_timeouts(session, transaction, connection):
+    if connection.dialect.name != "postgresql":
+        return
+    statement_ms, lock_ms = current_timeouts.get()
+    connection.execute(
+        _SET_TIMEOUTS, {"statement": f"{statement_ms}ms", "lock": f"{lock_ms}ms"}
+    )
+
+
+class TimeoutMiddleware:
+    def __init__(self, app, routes=ROUTE_TIMEOUTS):
+        self.app = app
+        # longest prefix wins
+        self.routes = sorted(routes.items(), key=lambda r: len(r[0]), reverse=True)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        for prefix, statement_ms in self.routes:
+            if scope["path"].startswith(prefix):
+                break
+        else:
+            return await self.app(scope, receive, send)
+
+        token = current_timeouts.set((statement_ms, LOCK_TIMEOUT_MS))
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_timeouts.reset(token)
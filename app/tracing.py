@@ -0,0 +1,287 @@
+"""
+Lightweight request tracing.
+
+Spans follow the W3C trace-context / OpenTelemetry shape (trace_id,
+span_id, parent_span_id, unix-nano timestamps, attributes), so they can be
+shipped to any collector later; for now they go to a local exporter:
+
+    TRACE_EXPORTER=file    JSON lines appended to TRACE_FILE
+    TRACE_EXPORTER=memory  last TRACE_MEMORY_SIZE spans kept in process
+
+Per request: the root span (TracingMiddleware), get_session, the handler,
+every SQL statement, from_orm_full conversions and response serialization
+(handler return -> first response byte). With no exporter configured, or
+for unsampled requests, every hook is a single contextvar lookup.
+"""
+import contextvars
+import functools
+import inspect
+import json
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+
+current_span = contextvars.ContextVar("trace_span", default=None)
+
+
+class Trace:
+    __slots__ = ("trace_id", "spans", "handler_end")
+
+    def __init__(self, trace_id):
+        self.trace_id = trace_id
+        self.spans = []
+        self.handler_end = None
+
+
+class Span:
+    __slots__ = ("trace", "span_id", "parent_id", "name", "start", "end", "attributes", "error")
+
+    def __init__(self, trace, name, parent_id=None, attributes=None, start=None):
+        self.trace = trace
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.name = name
+        self.start = start or time.time_ns()
+        self.end = None
+        self.attributes = attributes or {}
+        self.error = None
+
+    def child(self, name, **attributes):
+        return Span(self.trace, name, self.span_id, attributes)
+
+    def finish(self, end=None):
+        self.end = end or time.time_ns()
+        self.trace.spans.append(self)
+
+    def to_dict(self):
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_span_id": self.parent_id,
+            "name": self.name,
+            "start_time_unix_nano": self.start,
+            "end_time_unix_nano": self.end,
+            "duration_ms": round((self.end - self.start) / 1e6, 3),
+            "attributes": self.attributes,
+            "status": {"code": "ERROR", "message": self.error} if self.error else {"code": "OK"},
+        }
+
+
+@contextmanager
+def span(name, **attributes):
+    parent = current_span.get()
+    if parent is None:
+        yield None
+        return
+    child = parent.child(name, **attributes)
+    token = current_span.set(child)
+    try:
+        yield child
+    except BaseException as exc:
+        child.error = type(exc).__name__
+        raise
+    finally:
+        current_span.reset(token)
+        child.finish()
+
+
+def traced(name):
+    """
+    Decorator form of span() for plain functions.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if current_span.get() is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+# -------- exporters --------
+class MemoryExporter:
+    def __init__(self, size=10_000):
+        self.spans = deque(maxlen=size)
+
+    def export(self, spans):
+        self.spans.extend(s.to_dict() for s in spans)
+
+
+class FileExporter:
+    """
+    JSON lines, written by a background thread so the event loop never
+    blocks on disk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._queue = queue.Queue(maxsize=10_000)
+        self._thread = threading.Thread(target=self._run, name="trace-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, spans):
+        try:
+            self._queue.put_nowait([s.to_dict() for s in spans])
+        except queue.Full:
+            pass
+
+    def _run(self):
+        with open(self.path, "a", buffering=1 << 16) as f:
+            while True:
+                batch = self._queue.get()
+                for item in batch:
+                    f.write(json.dumps(item, default=str) + "\n")
+                if self._queue.empty():
+                    f.flush()
+
+
+def _exporter():
+    kind = os.getenv("TRACE_EXPORTER", "")
+    if kind == "file":
+        return FileExporter(os.getenv("TRACE_FILE", "/tmp/havirkesht-traces.jsonl"))
+    if kind == "memory":
+        return MemoryExporter(int(os.getenv("TRACE_MEMORY_SIZE", "10000")))
+    return None
+
+
+exporter = _exporter()
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "1"))
+
+
+# -------- SQL statements --------
+def instrument(engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_execute(conn, cursor, statement, parameters, context, executemany):
+        parent = current_span.get()
+        if parent is not None:
+            context._trace_span = parent.child(
+                "db.query",
+                **{"db.system": conn.dialect.name, "db.statement": statement[:500]},
+            )
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_execute(conn, cursor, statement, parameters, context, executemany):
+        query_span = getattr(context, "_trace_span", None)
+        if query_span is not None:
+            query_span.attributes["db.rows"] = cursor.rowcount
+            query_span.finish()
+
+    @event.listens_for(engine, "handle_error")
+    def _on_error(context):
+        query_span = getattr(context.execution_context, "_trace_span", None)
+        if query_span is not None and query_span.end is None:
+            query_span.error = type(context.original_exception).__name__
+            query_span.finish()
+
+
+# -------- handler --------
+def _traced_endpoint(endpoint):
+    def done():
+        root = current_span.get()
+        if root is not None:
+            root.trace.handler_end = time.time_ns()
+
+    if inspect.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def wrapper(*args, **kwargs):
+            with span("handler", function=endpoint.__qualname__):
+                result = await endpoint(*args, **kwargs)
+            done()
+            return result
+
+    else:
+
+        @functools.wraps(endpoint)
+        def wrapper(*args, **kwargs):
+            with span("handler", function=endpoint.__qualname__):
+                result = endpoint(*args, **kwargs)
+            done()
+            return result
+
+    return wrapper
+
+
+class TracedRoute(APIRoute):
+    def __init__(self, path, endpoint, **kwargs):
+        super().__init__(path, _traced_endpoint(endpoint), **kwargs)
+
+
+# -------- root span --------
+def _parse_traceparent(value):
+    # 00-<trace_id>-<parent_id>-<flags>
+    parts = value.split("-")
+    if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+        return None
+    return parts[1], parts[2], parts[3] == "01"
+
+
+class TracingMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if exporter is None or scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        incoming = None
+        for name, value in scope["headers"]:
+            if name == b"traceparent":
+                incoming = _parse_traceparent(value.decode("latin-1"))
+                break
+        if incoming is not None:
+            trace_id, parent_id, sampled = incoming
+        else:
+            trace_id, parent_id = f"{random.getrandbits(128):032x}", None
+            sampled = random.random() < TRACE_SAMPLE_RATE
+        if not sampled:
+            return await self.app(scope, receive, send)
+
+        root = Span(
+            Trace(trace_id),
+            f"{scope['method']} {scope['path']}",
+            parent_id,
+            {"http.method": scope["method"], "http.target": scope["path"]},
+        )
+        traceparent = f"00-{trace_id}-{root.span_id}-01".encode()
+
+        async def send_traced(message):
+            if message["type"] == "http.response.start":
+                trace = root.trace
+                if trace.handler_end is not None:
+                    Span(
+                        trace, "response.serialize", root.span_id, start=trace.handler_end
+                    ).finish()
+                root.attributes["http.status_code"] = message["status"]
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"traceparent", traceparent),
+                ]
+            await send(message)
+
+        token = current_span.set(root)
+        try:
+            await self.app(scope, receive, send_traced)
+        except BaseException as exc:
+            root.error = type(exc).__name__
+            raise
+        finally:
+            current_span.reset(token)
+            route = scope.get("route")
+            if route is not None:
+                root.name = f"{scope['method']} {route.path}"
+                root.attributes["http.route"] = route.path
+            root.finish()
+            exporter.export(root.trace.spans)
@@ -0,0 +1,11 @@
+from uvicorn_worker import UvicornWorker
+
+
+class HavirkeshtWorker(UvicornWorker):
+    # uvloop + httptools instead of the pure-python asyncio/h11 fallbacks
+    CONFIG_KWARGS = {
+        "loop": "uvloop",
+        "http": "httptools",
+        "lifespan": "on",
+        "proxy_headers": True,
+    }
@@ -0,0 +1,42 @@
+"""
+Dispatch planner benchmark on synthetic harvest-day data:
+
+    python -m benchmarks.bench_dispatch
+"""
+import os
+import random
+import time
+
+from app.dispatch import plan
+
+PICKUPS = int(os.getenv("BENCH_PICKUPS", "50000"))
+VILLAGES = int(os.getenv("BENCH_VILLAGES", "3000"))
+DRIVERS = int(os.getenv("BENCH_DRIVERS", "600"))
+
+
+def main():
+    rnd = random.Random(42)
+    pickups = [
+        (rnd.randrange(VILLAGES), rnd.uniform(0.5, 12.0)) for _ in range(PICKUPS)
+    ]
+    drivers = [(i, rnd.choice([8.0, 10.0, 15.0, 20.0, 25.0])) for i in range(DRIVERS)]
+
+    start = time.perf_counter()
+    trips, unassigned = plan(pickups, drivers)
+    elapsed = time.perf_counter() - start
+
+    total = sum(t for _, t in pickups)
+    loaded = sum(t.load_ton for t in trips)
+    capacity = {d: c for d, c in drivers}
+    assert all(t.load_ton <= capacity[t.driver_id] + 1e-6 for t in trips)
+    assert abs(total - loaded) < 1e-3 and not unassigned
+
+    rounds = max(t.round for t in trips)
+    fill = loaded / sum(capacity[t.driver_id] for t in trips)
+    print(f"{PICKUPS} pickups, {VILLAGES} villages, {DRIVERS} drivers")
+    print(f"planned {len(trips)} trips in {rounds} rounds, {fill:.1%} truck fill")
+    print(f"{elapsed * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+Concurrency benchmark for seed distribution (app/distribution.py).
+
+WORKERS threads hammer one factory_seeds row with small random issues
+until it runs dry, then the books are checked: allocations must add up
+to exactly what left the stock row, and the row must not go negative.
+The same run with a naive read-then-write shows what the conditional
+UPDATE protects against.
+
+Needs DATABASE_URL pointing at a scratch Postgres migrated to head; the
+fixture rows it creates are left behind.
+
+    python -m benchmarks.bench_distribution
+"""
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+
+from sqlalchemy import func, select
+
+from app.db import SessionLocal, engine
+from app.distribution import OutOfStock, issue
+from app.models import (
+    CropYear,
+    Factory,
+    FactorySeed,
+    FarmerAllocation,
+    MeasureUnit,
+    Role,
+    Seed,
+    User,
+)
+
+WORKERS = int(os.getenv("BENCH_WORKERS", "32"))
+STOCK = float(os.getenv("BENCH_STOCK", "5000"))
+BATCH = int(os.getenv("BENCH_BATCH", "5"))
+FARMERS = 200
+FARMER_ROLE_ID = 3
+
+
+def setup():
+    run = uuid.uuid4().hex[:8]
+    with SessionLocal() as session:
+        if session.get(Role, FARMER_ROLE_ID) is None:
+            session.add(Role(id=FARMER_ROLE_ID, name="farmer"))
+        unit = MeasureUnit(unit_name=f"bench-{run}")
+        factory = Factory(factory_name=f"bench-{run}")
+        crop_year = CropYear(crop_year_name=f"bench-{run}")
+        seed = Seed(seed_name=f"bench-{run}", measure_unit=unit)
+        farmers = [
+            User(
+                username=f"bench-{run}-{i}",
+                password="x",
+                fullname=f"bench farmer {i}",
+                email=f"bench-{run}-{i}@example.com",
+                role_id=FARMER_ROLE_ID,
+            )
+            for i in range(FARMERS)
+        ]
+        session.add_all([factory, crop_year, seed, *farmers])
+        session.flush()
+        stock = [
+            FactorySeed(
+                factory_id=factory.id,
+                seed_id=seed.id,
+                crop_year_id=crop_year.id,
+                amount=STOCK,
+                farmer_price=10,
+                factory_price=8,
+            )
+        ]
+        session.add_all(stock)
+        session.commit()
+        return crop_year.id, stock[0].id, [f.id for f in farmers]
+
+
+def naive_issue(session, crop_year_id, items):
+    """
+    Read, check, write: what the conditional UPDATE replaces.
+    """
+    for item in items:
+        row = session.get(FactorySeed, item["factory_seed_id"])
+        if row.amount < item["amount"]:
+            session.rollback()
+            raise OutOfStock([])
+        time.sleep(0)  # let another thread in between read and write
+        row.amount = row.amount - item["amount"]
+        session.add(
+            FarmerAllocation(
+                farmer_id=item["farmer_id"],
+                crop_year_id=crop_year_id,
+                factory_seed_id=item["factory_seed_id"],
+                amount=item["amount"],
+            )
+        )
+    session.commit()
+
+
+def run(label, issue_fn):
+    crop_year_id, stock_id, farmers = setup()
+    issued = [0]
+    lock = threading.Lock()
+    start = threading.Barrier(WORKERS)
+
+    def worker(seed):
+        rnd = random.Random(seed)
+        start.wait()
+        with SessionLocal() as session:
+            while True:
+                items = [
+                    {
+                        "farmer_id": rnd.choice(farmers),
+                        "factory_seed_id": stock_id,
+                        "amount": float(rnd.randint(1, 5)),
+                    }
+                    for _ in range(BATCH)
+                ]
+                try:
+                    issue_fn(session, crop_year_id, items)
+                except OutOfStock:
+                    return
+                with lock:
+                    issued[0] += 1
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(WORKERS)]
+    began = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - began
+
+    with SessionLocal() as session:
+        left = session.scalar(select(FactorySeed.amount).where(FactorySeed.id == stock_id))
+        handed_out = session.scalar(
+            select(func.coalesce(func.sum(FarmerAllocation.amount), 0)).where(
+                FarmerAllocation.factory_seed_id == stock_id
+            )
+        )
+    oversold = handed_out - (STOCK - left)
+    print(
+        f"{label:<8} {issued[0]:6d} batches in {elapsed:6.2f} s "
+        f"({issued[0] / elapsed:7.0f}/s)  stock left {left:6.0f}  "
+        f"handed out {handed_out:6.0f}  oversold {oversold:6.0f}"
+    )
+    return oversold == 0 and left >= 0
+
+
+if __name__ == "__main__":
+    if engine.dialect.name != "postgresql":
+        sys.exit("needs a Postgres DATABASE_URL")
+    print(f"{WORKERS} workers, {BATCH} items per batch, {STOCK:.0f} units of stock")
+    ok = run("atomic", issue)
+    run("naive", naive_issue)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,191 @@
+"""
+Microbenchmark: CPU and peak memory per 100-item list page, ORM entities
++ from_orm_* vs. column rows fed straight to the response model
+(app/schemas/pagination.paginate_rows).
+
+Runs against in-memory SQLite so it only measures the Python side
+(row fetch, ORM hydration / identity map, Pydantic validation, JSON):
+
+    python -m benchmarks.bench_list_rows
+"""
+import datetime
+import os
+import time
+import tracemalloc
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import select  # noqa: E402
+from sqlalchemy.orm import selectinload  # noqa: E402
+
+from app.db import Base, SessionLocal, engine  # noqa: E402
+from app.models import (  # noqa: E402
+    Car,
+    CropYear,
+    Driver,
+    Factory,
+    FactorySeed,
+    MeasureUnit,
+    Seed,
+)
+from app.schemas.drivers import DriverResponse  # noqa: E402
+from app.schemas.factory_seeds import FactorySeedResponse  # noqa: E402
+from app.schemas.pagination import Page, paginate, paginate_rows  # noqa: E402
+from app.schemas.seeds import SeedResponse  # noqa: E402
+
+N = int(os.getenv("BENCH_N", "500"))
+SIZE = 100
+
+
+def setup():
+    tables = [
+        Car.__table__,
+        Driver.__table__,
+        MeasureUnit.__table__,
+        Seed.__table__,
+        Factory.__table__,
+        CropYear.__table__,
+        FactorySeed.__table__,
+    ]
+    Base.metadata.create_all(engine, tables=tables)
+    now = datetime.datetime(2025, 1, 1)
+    with SessionLocal() as session:
+        session.add_all(MeasureUnit(id=i, unit_name=f"u{i}") for i in range(1, 6))
+        session.add_all(Car(id=i, name=f"car{i}") for i in range(1, 51))
+        session.add_all(Factory(id=i, factory_name=f"f{i}") for i in range(1, 11))
+        session.add_all(CropYear(id=i, crop_year_name=f"14{i:02}") for i in range(1, 4))
+        session.add_all(
+            Seed(id=i, seed_name=f"seed{i}", measure_unit_id=i % 5 + 1, created_at=now)
+            for i in range(1, 1001)
+        )
+        session.add_all(
+            Driver(
+                id=i,
+                name=f"n{i}",
+                last_name=f"l{i}",
+                national_code=f"{i:010}",
+                phone_number=f"09{i:09}",
+                car_id=i % 50 + 1,
+                license_plate=f"p{i}",
+                capacity_ton=10,
+                created_at=now,
+            )
+            for i in range(1, 1001)
+        )
+        session.add_all(
+            FactorySeed(
+                id=i,
+                factory_id=i % 10 + 1,
+                seed_id=i % 1000 + 1,
+                crop_year_id=i % 3 + 1,
+                amount=100,
+                farmer_price=10,
+                factory_price=8,
+                created_at=now,
+                updated_at=now,
+            )
+            for i in range(1, 1001)
+        )
+        session.commit()
+
+
+# -------- ORM path (previous list handlers) --------
+def drivers_orm(session):
+    stmt = select(Driver).options(selectinload(Driver.car))
+    total, pages, items = paginate(session, stmt, 2, SIZE)
+    return {"total": total, "size": SIZE, "pages": pages,
+            "items": [DriverResponse.from_orm_full(d) for d in items]}
+
+
+def seeds_orm(session):
+    stmt = select(Seed).options(selectinload(Seed.measure_unit))
+    total, pages, items = paginate(session, stmt, 2, SIZE)
+    return {"total": total, "size": SIZE, "pages": pages,
+            "items": [SeedResponse.from_orm_with_unit(s) for s in items]}
+
+
+def factory_seeds_orm(session):
+    stmt = select(FactorySeed).options(
+        selectinload(FactorySeed.factory),
+        selectinload(FactorySeed.seed).selectinload(Seed.measure_unit),
+        selectinload(FactorySeed.crop_year),
+    )
+    total, pages, items = paginate(session, stmt, 2, SIZE)
+    return {"total": total, "size": SIZE, "pages": pages,
+            "items": [FactorySeedResponse.from_orm_full(fs) for fs in items]}
+
+
+# -------- row path (current list handlers) --------
+def drivers_rows(session):
+    stmt = select(
+        Driver.id, Driver.name, Driver.last_name, Driver.national_code,
+        Driver.phone_number, Driver.car_id, Driver.license_plate,
+        Driver.capacity_ton, Driver.created_at, Car.name.label("car_name"),
+    ).join(Car, Driver.car_id == Car.id)
+    total, pages, items = paginate_rows(session, stmt, 2, SIZE)
+    return {"total": total, "size": SIZE, "pages": pages, "items": items}
+
+
+def seeds_rows(session):
+    stmt = select(
+        Seed.id, Seed.seed_name, Seed.measure_unit_id, Seed.created_at,
+        MeasureUnit.unit_name,
+    ).outerjoin(MeasureUnit, Seed.measure_unit_id == MeasureUnit.id)
+    total, pages, items = paginate_rows(session, stmt, 2, SIZE)
+    return {"total": total, "size": SIZE, "pages": pages, "items": items}
+
+
+def factory_seeds_rows(session):
+    stmt = (
+        select(
+            FactorySeed.id, FactorySeed.factory_id, FactorySeed.seed_id,
+            FactorySeed.crop_year_id, FactorySeed.amount, FactorySeed.farmer_price,
+            FactorySeed.factory_price, FactorySeed.created_at, FactorySeed.updated_at,
+            Factory.factory_name, Seed.seed_name, MeasureUnit.unit_name,
+            CropYear.crop_year_name,
+        )
+        .join(Factory, FactorySeed.factory_id == Factory.id)
+        .join(Seed, FactorySeed.seed_id == Seed.id)
+        .join(MeasureUnit, Seed.measure_unit_id == MeasureUnit.id)
+        .join(CropYear, FactorySeed.crop_year_id == CropYear.id)
+    )
+    total, pages, items = paginate_rows(session, stmt, 2, SIZE)
+    return {"total": total, "size": SIZE, "pages": pages, "items": items}
+
+
+def run(label, fn, response_model):
+    # what FastAPI does with the handler's return value
+    adapter = TypeAdapter(Page[response_model])
+
+    def request():
+        with SessionLocal() as session:
+            return adapter.dump_json(adapter.validate_python(fn(session)))
+
+    for _ in range(20):  # warm the compiled cache
+        request()
+
+    start = time.process_time()
+    for _ in range(N):
+        request()
+    cpu = (time.process_time() - start) / N
+
+    tracemalloc.start()
+    request()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<22} {cpu * 1e3:7.2f} ms CPU / page  {peak / 1024:8.1f} KiB peak")
+    return cpu
+
+
+if __name__ == "__main__":
+    setup()
+    for name, orm, rows, model in (
+        ("drivers", drivers_orm, drivers_rows, DriverResponse),
+        ("seeds", seeds_orm, seeds_rows, SeedResponse),
+        ("factory_seeds", factory_seeds_orm, factory_seeds_rows, FactorySeedResponse),
+    ):
+        before = run(f"{name} (orm)", orm, model)
+        after = run(f"{name} (rows)", rows, model)
+        print(f"{'':<22} {before / after:7.2f}x")
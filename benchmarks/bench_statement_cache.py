@@ -0,0 +1,66 @@
+"""
+Microbenchmark: Python CPU per uniqueness check, loading whole entities
+vs the SELECT id ... LIMIT 1 of app/queries.py.
+
+Runs against in-memory SQLite so it only measures the Python side
+(statement construction, cache key, compilation, ORM result handling):
+
+    python -m benchmarks.bench_statement_cache
+"""
+import os
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import select  # noqa: E402
+
+from app.db import Base, SessionLocal, engine  # noqa: E402
+from app.models import Car, City, Province, Village  # noqa: E402
+from app.queries import exists_where  # noqa: E402
+
+N = int(os.getenv("BENCH_N", "20000"))
+
+
+def setup():
+    tables = [Car.__table__, Province.__table__, City.__table__, Village.__table__]
+    Base.metadata.create_all(engine, tables=tables)
+    with SessionLocal() as session:
+        session.add(Province(id=1, province="p"))
+        session.add(City(id=1, city="c", province_id=1))
+        session.add_all(Village(id=i, village=f"v{i}", city_id=1) for i in range(1000))
+        session.add_all(Car(id=i, name=f"car{i}") for i in range(1000))
+        session.commit()
+
+
+def before(session, i):
+    session.scalar(select(Car).where(Car.name == f"car{i % 1000}"))
+    session.scalar(
+        select(Village).where(Village.village == f"v{i % 1000}", Village.city_id == 1)
+    )
+
+
+def after(session, i):
+    exists_where(session, Car, name=f"car{i % 1000}")
+    exists_where(session, Village, village=f"v{i % 1000}", city_id=1)
+
+
+def run(label, fn):
+    with SessionLocal() as session:
+        for i in range(200):  # warm the compiled cache
+            fn(session, i)
+        session.expunge_all()
+        start = time.process_time()
+        for i in range(N):
+            fn(session, i)
+            if i % 100 == 0:
+                session.expunge_all()
+        elapsed = time.process_time() - start
+    print(f"{label:<28} {elapsed / N * 1e6:8.1f} us CPU / request")
+    return elapsed
+
+
+if __name__ == "__main__":
+    setup()
+    b = run("select(Model).where(...)", before)
+    a = run("exists_where", after)
+    print(f"{'speedup':<28} {b / a:8.2f}x")
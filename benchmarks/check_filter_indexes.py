@@ -0,0 +1,102 @@
+"""
+Check that every filtered list route is served by an index.
+
+Each case calls a route through the app, captures the SQL it sends and
+EXPLAINs it with sequential scans disabled: a Seq Scan left on the
+filtered table means no index can serve that filter. Needs DATABASE_URL
+pointing at a Postgres migrated to head; the tables may be empty.
+
+    python -m benchmarks.check_filter_indexes
+"""
+import sys
+from contextlib import contextmanager
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.config import app
+from app.db import engine
+
+# (route, table whose rows the filter selects)
+CASES = (
+    ("/cities/?province_id=1", "cities"),
+    ("/villages/?city_id=1", "villages"),
+    ("/drivers/?car_id=1", "drivers"),
+    ("/seeds/?measure_unit_id=1", "seeds"),
+    ("/pesticides/?measure_unit_id=1", "pesticides"),
+    ("/factory_seeds/?factory_id=1", "factory_seeds"),
+    ("/factory_seeds/?seed_id=1", "factory_seeds"),
+    ("/factory_seeds/?crop_year_id=1", "factory_seeds"),
+    ("/factory_pesticides/?factory_id=1", "factory_pesticides"),
+    ("/factory_pesticides/?pesticide_id=1", "factory_pesticides"),
+    ("/factory_pesticides/?crop_year_id=1", "factory_pesticides"),
+    ("/loads/?farmer_id=1", "loads"),
+    ("/loads/?driver_id=1", "loads"),
+    ("/loads/?crop_year_id=1", "loads"),
+    ("/settlements/?crop_year_id=1&farmer_id=1", "farmer_settlements"),
+)
+
+
+@contextmanager
+def captured_selects():
+    """
+    Collect (statement, parameters) of every SELECT sent while inside.
+    """
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+
+def plan_nodes(node):
+    yield node
+    for child in node.get("Plans", ()):
+        yield from plan_nodes(child)
+
+
+def explain(connection, statement, parameters, options="FORMAT JSON"):
+    (document,) = connection.exec_driver_sql(
+        f"EXPLAIN ({options}) {statement}", parameters
+    ).one()
+    return document[0]
+
+
+def check(client, url, table):
+    with captured_selects() as statements:
+        client.get(url).raise_for_status()
+
+    offending = []
+    with engine.connect() as connection:
+        connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        for statement, parameters in statements:
+            plan = explain(connection, statement, parameters)["Plan"]
+            offending += [
+                statement
+                for node in plan_nodes(plan)
+                if node["Node Type"] == "Seq Scan" and node["Relation Name"] == table
+            ]
+        connection.rollback()
+    return offending
+
+
+if __name__ == "__main__":
+    if engine.dialect.name != "postgresql":
+        sys.exit("needs a Postgres DATABASE_URL")
+
+    failed = 0
+    with TestClient(app) as client:
+        for url, table in CASES:
+            offending = check(client, url, table)
+            print(f"{'SEQ SCAN' if offending else 'ok':<9} {url}")
+            for statement in offending:
+                print("          " + " ".join(statement.split()))
+            failed += bool(offending)
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,230 @@
+"""
+Query plan regression check for the hot list, search and filter routes.
+
+Every route in ROUTES is called through the app against a seeded local
+Postgres; the SQL it sends is captured and run again under EXPLAIN
+(ANALYZE, BUFFERS). Per statement the planner cost, the shared buffers
+touched and the tables read by a Seq Scan are compared with the stored
+baseline (plan_baselines.json next to this file). The check fails when
+a route
+
+- sends more statements than before (an N+1 crept in),
+- gains a Seq Scan on a table the baseline read through an index, or
+- costs or reads noticeably more than the baseline (COST_TOLERANCE,
+  BUFFER_TOLERANCE, ignoring differences below the MIN_* floors).
+
+DATABASE_URL must point at a scratch Postgres migrated to head:
+
+    python -m benchmarks.plan_regression --seed     # once, fills empty tables
+    python -m benchmarks.plan_regression --update   # record baselines
+    python -m benchmarks.plan_regression            # compare, exit 1 on regressions
+"""
+import argparse
+import json
+import os
+import sys
+
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+
+from app.config import app
+from app.db import engine
+from benchmarks.check_filter_indexes import captured_selects, explain, plan_nodes
+
+BASELINES = os.path.join(os.path.dirname(__file__), "plan_baselines.json")
+
+COST_TOLERANCE = float(os.getenv("PLAN_COST_TOLERANCE", "0.25"))
+BUFFER_TOLERANCE = float(os.getenv("PLAN_BUFFER_TOLERANCE", "0.5"))
+MIN_COST_DELTA = 10.0
+MIN_BUFFER_DELTA = 50
+
+ROUTES = (
+    "/villages/",
+    "/villages/?city_id=17",
+    "/villages/?search=village 4711",
+    "/villages/?page=200",
+    "/cities/?province_id=3",
+    "/drivers/",
+    "/drivers/?car_id=42",
+    "/drivers/?search=last 2999",
+    "/factory_seeds/",
+    "/factory_seeds/?crop_year_id=2",
+    "/factory_seeds/?factory_id=7",
+    "/factory_seeds/?seed_id=99",
+    "/factory_seeds/?search=seed 123",
+    "/factory_pesticides/?crop_year_id=2",
+    "/seeds/?search=seed 77",
+    "/loads/?farmer_id=77",
+    "/loads/?driver_id=123",
+)
+
+
+# -------- seed data --------
+# deterministic, large enough that the planner prefers indexes where they exist
+SEED = """
+INSERT INTO provinces (id, province)
+    SELECT g, 'province ' || g FROM generate_series(1, 31) g;
+INSERT INTO cities (id, city, search_text, province_id)
+    SELECT g, 'city ' || g, 'city ' || g, g % 31 + 1 FROM generate_series(1, 1000) g;
+INSERT INTO villages (id, village, search_text, city_id)
+    SELECT g, 'village ' || g, 'village ' || g, g % 1000 + 1
+    FROM generate_series(1, 60000) g;
+INSERT INTO cars (id, name) SELECT g, 'car ' || g FROM generate_series(1, 500) g;
+INSERT INTO drivers (id, name, last_name, national_code, phone_number, search_text,
+                     car_id, license_plate, capacity_ton)
+    SELECT g, 'name ' || g, 'last ' || g, lpad(g::text, 10, '0'),
+           '09' || lpad(g::text, 9, '0'),
+           'name ' || g || ' last ' || g || ' ' || lpad(g::text, 10, '0')
+               || ' 09' || lpad(g::text, 9, '0'),
+           g % 500 + 1, 'plate ' || g, 10
+    FROM generate_series(1, 30000) g;
+INSERT INTO measure_units (id, unit_name) SELECT g, 'unit ' || g FROM generate_series(1, 5) g;
+INSERT INTO seeds (id, seed_name, search_text, measure_unit_id)
+    SELECT g, 'seed ' || g, 'seed ' || g, g % 5 + 1 FROM generate_series(1, 3000) g;
+INSERT INTO pesticides (id, pesticide_name, search_text, measure_unit_id)
+    SELECT g, 'pesticide ' || g, 'pesticide ' || g, g % 5 + 1
+    FROM generate_series(1, 3000) g;
+INSERT INTO factories (id, factory_name, search_text)
+    SELECT g, 'factory ' || g, 'factory ' || g FROM generate_series(1, 60) g;
+INSERT INTO crop_years (id, crop_year_name)
+    SELECT g, (1400 + g)::text FROM generate_series(1, 6) g;
+INSERT INTO factory_seeds (id, factory_id, seed_id, crop_year_id, amount,
+                           farmer_price, factory_price)
+    SELECT g, (g / 6) % 60 + 1, (g / 360) % 3000 + 1, g % 6 + 1, 1000, 12, 10
+    FROM generate_series(1, 60000) g;
+INSERT INTO factory_pesticides (id, factory_id, pesticide_id, crop_year_id, amount,
+                                farmer_price, factory_price)
+    SELECT g, (g / 6) % 60 + 1, (g / 360) % 3000 + 1, g % 6 + 1, 1000, 12, 10
+    FROM generate_series(1, 60000) g;
+INSERT INTO roles (id, name) VALUES (3, 'farmer') ON CONFLICT DO NOTHING;
+INSERT INTO users (id, username, password, fullname, email, search_text, disabled, role_id)
+    SELECT g, 'farmer' || g, 'x', 'farmer ' || g, 'farmer' || g || '@example.com',
+           'farmer ' || g || ' farmer' || g || ' farmer' || g || '@example.com', false, 3
+    FROM generate_series(1, 20000) g;
+INSERT INTO loads (terminal_id, terminal_load_id, farmer_id, driver_id, factory_id,
+                   crop_year_id, weight_kg, sugar_grade, loss_percent, weighed_at)
+    SELECT 't' || g % 20, g::text, g % 20000 + 1, g % 30000 + 1, g % 60 + 1,
+           g % 6 + 1, 20000, 16, 3, now()
+    FROM generate_series(1, 200000) g;
+"""
+
+SEEDED_TABLES = (
+    "provinces", "cities", "villages", "cars", "drivers", "measure_units", "seeds",
+    "pesticides", "factories", "crop_years", "factory_seeds", "factory_pesticides",
+    "users", "loads",
+)
+
+
+def seed():
+    with engine.begin() as connection:
+        if connection.execute(text("SELECT EXISTS (SELECT 1 FROM villages)")).scalar():
+            sys.exit("villages is not empty: seed a scratch database only")
+        for statement in SEED.split(";\n"):
+            if statement.strip():
+                connection.exec_driver_sql(statement)
+        for table in SEEDED_TABLES:
+            connection.execute(
+                text(
+                    f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), max(id)) "
+                    f"FROM {table}"
+                )
+            )
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as connection:
+        connection.exec_driver_sql("ANALYZE")
+
+
+# -------- measuring --------
+def measure(client, url):
+    with captured_selects() as statements:
+        client.get(url).raise_for_status()
+
+    measured = []
+    with engine.connect() as connection:
+        for statement, parameters in statements:
+            if " FROM " not in statement.upper():
+                continue  # set_config and friends
+            result = explain(
+                connection, statement, parameters, "ANALYZE, BUFFERS, FORMAT JSON"
+            )
+            plan = result["Plan"]
+            nodes = list(plan_nodes(plan))
+            measured.append(
+                {
+                    "statement": " ".join(statement.split()),
+                    "cost": plan["Total Cost"],
+                    "buffers": plan.get("Shared Hit Blocks", 0)
+                    + plan.get("Shared Read Blocks", 0),
+                    "seq_scans": sorted(
+                        {n["Relation Name"] for n in nodes if n["Node Type"] == "Seq Scan"}
+                    ),
+                    "plan": [
+                        n["Node Type"]
+                        + (f" on {n['Relation Name']}" if "Relation Name" in n else "")
+                        + (f" using {n['Index Name']}" if "Index Name" in n else "")
+                        for n in nodes
+                    ],
+                }
+            )
+        connection.rollback()
+    return measured
+
+
+def regressions(before, after):
+    found = []
+    if len(after) > len(before):
+        found.append(f"{len(before)} -> {len(after)} statements")
+    for i, (old, new) in enumerate(zip(before, after)):
+        where = f"statement {i + 1}"
+        for table in sorted(set(new["seq_scans"]) - set(old["seq_scans"])):
+            found.append(f"{where}: new Seq Scan on {table}")
+        if (
+            new["cost"] > old["cost"] * (1 + COST_TOLERANCE)
+            and new["cost"] - old["cost"] > MIN_COST_DELTA
+        ):
+            found.append(f"{where}: cost {old['cost']:.0f} -> {new['cost']:.0f}")
+        if (
+            new["buffers"] > old["buffers"] * (1 + BUFFER_TOLERANCE)
+            and new["buffers"] - old["buffers"] > MIN_BUFFER_DELTA
+        ):
+            found.append(f"{where}: buffers {old['buffers']} -> {new['buffers']}")
+    return found
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seed", action="store_true", help="fill an empty database")
+    parser.add_argument("--update", action="store_true", help="rewrite the baselines")
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        sys.exit("needs a Postgres DATABASE_URL")
+    if args.seed:
+        seed()
+
+    with TestClient(app) as client:
+        current = {url: measure(client, url) for url in ROUTES}
+
+    if args.update:
+        with open(BASELINES, "w") as f:
+            json.dump(current, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+        print(f"wrote {len(current)} baselines to {BASELINES}")
+        sys.exit(0)
+
+    if not os.path.exists(BASELINES):
+        sys.exit("no baselines yet: run with --update first")
+    with open(BASELINES) as f:
+        baselines = json.load(f)
+
+    failed = 0
+    for url, measured in current.items():
+        if url not in baselines:
+            print(f"{'new':<9} {url} (no baseline, run --update)")
+            continue
+        found = regressions(baselines[url], measured)
+        print(f"{'REGRESSED' if found else 'ok':<9} {url}")
+        for line in found:
+            print("          " + line)
+        failed += bool(found)
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,55 @@
+"""
+Production launcher config: gunicorn master + uvicorn workers.
+
+    gunicorn -c gunicorn.conf.py app.main:app
+
+Schema migrations are not run here; `alembic upgrade head` runs once
+per deploy before the workers start (see docker-compose.yaml).
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+
+# -------- workers --------
+# async workers: one per core keeps every core busy, more would only
+# multiply database connections
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+worker_class = "app.workers.HavirkeshtWorker"
+
+# -------- database connections --------
+# DB_MAX_CONNECTIONS is what this deployment may open on Postgres, below its
+# max_connections (100 by default) to leave room for migrations and psql.
+# It is split across workers; each also keeps one LISTEN connection for
+# the change feed. app/db.py reads the resulting pool sizes at preload.
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "80"))
+per_worker = DB_MAX_CONNECTIONS // workers - 1
+if per_worker < 2:
+    raise RuntimeError(
+        f"DB_MAX_CONNECTIONS={DB_MAX_CONNECTIONS} is too small for {workers} workers"
+    )
+os.environ.setdefault("DB_POOL_SIZE", str(per_worker // 2))
+os.environ.setdefault("DB_MAX_OVERFLOW", str(per_worker - per_worker // 2))
+
+# import the app once in the master so workers share its memory copy-on-write
+preload_app = True
+
+# -------- graceful restarts --------
+timeout = int(os.getenv("WORKER_TIMEOUT", "60"))
+graceful_timeout = int(os.getenv("GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("KEEPALIVE", "5"))
+# recycle workers now and then so slow leaks never pile up
+max_requests = int(os.getenv("MAX_REQUESTS", "10000"))
+max_requests_jitter = int(os.getenv("MAX_REQUESTS_JITTER", "1000"))
+
+accesslog = "-"
+errorlog = "-"
+loglevel = os.getenv("LOG_LEVEL", "info")
+
+
+def post_fork(server, worker):
+    # the preloaded engine's pooled connections belong to the master;
+    # every worker must open its own
+    from app.db import engine
+
+    engine.dispose(close=False)
@@ -0,0 +1,262 @@
+"""initial schema and roles
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _timestamps(updated=True):
+    cols = [
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        )
+    ]
+    if updated:
+        cols.append(
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                nullable=False,
+            )
+        )
+    return cols
+
+
+def upgrade():
+    # -------- geo --------
+    op.create_table(
+        "provinces",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("province", sa.String(), nullable=False),
+        *_timestamps(updated=False),
+        sa.PrimaryKeyConstraint("id", name="provinces_pkey"),
+        sa.UniqueConstraint("province", name="provinces_province_key"),
+    )
+    op.create_table(
+        "cities",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("city", sa.String(), nullable=False),
+        sa.Column("province_id", sa.BigInteger(), nullable=False),
+        *_timestamps(updated=False),
+        sa.ForeignKeyConstraint(
+            ["province_id"], ["provinces.id"], name="cities_province_id_fkey"
+        ),
+        sa.PrimaryKeyConstraint("id", name="cities_pkey"),
+    )
+    op.create_table(
+        "villages",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("village", sa.String(), nullable=False),
+        sa.Column("city_id", sa.BigInteger(), nullable=False),
+        *_timestamps(updated=False),
+        sa.ForeignKeyConstraint(
+            ["city_id"], ["cities.id"], name="villages_city_id_fkey"
+        ),
+        sa.PrimaryKeyConstraint("id", name="villages_pkey"),
+    )
+
+    # -------- users --------
+    op.create_table(
+        "roles",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column(
+            "scopes",
+            postgresql.ARRAY(sa.TEXT()),
+            server_default="{}",
+            nullable=False,
+        ),
+        *_timestamps(),
+        sa.PrimaryKeyConstraint("id", name="roles_pkey"),
+        sa.UniqueConstraint("name", name="roles_name_key"),
+    )
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("username", sa.String(50), nullable=False),
+        sa.Column("password", sa.String(255), nullable=False),
+        sa.Column("fullname", sa.String(150), nullable=False),
+        sa.Column("email", sa.String(120), nullable=False),
+        sa.Column("phone_number", sa.String(15), nullable=True),
+        sa.Column("disabled", sa.Boolean(), nullable=False),
+        sa.Column("role_id", sa.Integer(), nullable=False),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(
+            ["role_id"], ["roles.id"], name="users_role_id_fkey", ondelete="RESTRICT"
+        ),
+        sa.PrimaryKeyConstraint("id", name="users_pkey"),
+        sa.UniqueConstraint("phone_number", name="users_phone_number_key"),
+    )
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    # -------- catalog --------
+    op.create_table(
+        "crop_years",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("crop_year_name", sa.String(100), nullable=False),
+        *_timestamps(),
+        sa.PrimaryKeyConstraint("id", name="crop_years_pkey"),
+    )
+    op.create_index(
+        "ix_crop_years_crop_year_name", "crop_years", ["crop_year_name"], unique=True
+    )
+    op.create_table(
+        "factories",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("factory_name", sa.String(255), nullable=False),
+        *_timestamps(),
+        sa.PrimaryKeyConstraint("id", name="factories_pkey"),
+        sa.UniqueConstraint("factory_name", name="factories_factory_name_key"),
+    )
+    op.create_table(
+        "measure_units",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("unit_name", sa.String(100), nullable=False),
+        *_timestamps(),
+        sa.PrimaryKeyConstraint("id", name="measure_units_pkey"),
+        sa.UniqueConstraint("unit_name", name="measure_units_unit_name_key"),
+    )
+    op.create_table(
+        "seeds",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("seed_name", sa.String(150), nullable=False),
+        sa.Column("measure_unit_id", sa.BigInteger(), nullable=False),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(
+            ["measure_unit_id"],
+            ["measure_units.id"],
+            name="seeds_measure_unit_id_fkey",
+            ondelete="RESTRICT",
+        ),
+        sa.PrimaryKeyConstraint("id", name="seeds_pkey"),
+        sa.UniqueConstraint("seed_name", name="seeds_seed_name_key"),
+    )
+    op.create_table(
+        "pesticides",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("pesticide_name", sa.String(150), nullable=False),
+        sa.Column("measure_unit_id", sa.BigInteger(), nullable=False),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(
+            ["measure_unit_id"],
+            ["measure_units.id"],
+            name="pesticides_measure_unit_id_fkey",
+            ondelete="RESTRICT",
+        ),
+        sa.PrimaryKeyConstraint("id", name="pesticides_pkey"),
+        sa.UniqueConstraint("pesticide_name", name="pesticides_pesticide_name_key"),
+    )
+
+    # -------- allocations --------
+    for table, item in (("factory_seeds", "seed"), ("factory_pesticides", "pesticide")):
+        op.create_table(
+            table,
+            sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+            sa.Column("factory_id", sa.BigInteger(), nullable=False),
+            sa.Column(f"{item}_id", sa.BigInteger(), nullable=False),
+            sa.Column("crop_year_id", sa.BigInteger(), nullable=False),
+            sa.Column("amount", sa.Float(), nullable=False),
+            sa.Column("farmer_price", sa.Float(), nullable=False),
+            sa.Column("factory_price", sa.Float(), nullable=False),
+            *_timestamps(),
+            sa.ForeignKeyConstraint(
+                ["factory_id"],
+                ["factories.id"],
+                name=f"{table}_factory_id_fkey",
+                ondelete="RESTRICT",
+            ),
+            sa.ForeignKeyConstraint(
+                [f"{item}_id"],
+                [f"{item}s.id"],
+                name=f"{table}_{item}_id_fkey",
+                ondelete="RESTRICT",
+            ),
+            sa.ForeignKeyConstraint(
+                ["crop_year_id"],
+                ["crop_years.id"],
+                name=f"{table}_crop_year_id_fkey",
+                ondelete="RESTRICT",
+            ),
+            sa.PrimaryKeyConstraint("id", name=f"{table}_pkey"),
+        )
+
+    # -------- transport --------
+    op.create_table(
+        "cars",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("name", sa.String(255), nullable=False),
+        *_timestamps(),
+        sa.PrimaryKeyConstraint("id", name="cars_pkey"),
+        sa.UniqueConstraint("name", name="cars_name_key"),
+    )
+    op.create_table(
+        "drivers",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("name", sa.String(100), nullable=False),
+        sa.Column("last_name", sa.String(100), nullable=False),
+        sa.Column("national_code", sa.String(10), nullable=False),
+        sa.Column("phone_number", sa.String(11), nullable=False),
+        sa.Column("car_id", sa.BigInteger(), nullable=False),
+        sa.Column("license_plate", sa.String(20), nullable=False),
+        sa.Column("capacity_ton", sa.Float(), nullable=False),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(
+            ["car_id"], ["cars.id"], name="drivers_car_id_fkey", ondelete="RESTRICT"
+        ),
+        sa.PrimaryKeyConstraint("id", name="drivers_pkey"),
+        sa.UniqueConstraint("national_code", name="drivers_national_code_key"),
+        sa.UniqueConstraint("phone_number", name="drivers_phone_number_key"),
+    )
+
+    # -------- seed roles (one statement, safe to re-run) --------
+    roles = sa.table(
+        "roles",
+        sa.column("id", sa.Integer),
+        sa.column("name", sa.String),
+        sa.column("scopes", postgresql.ARRAY(sa.TEXT())),
+    )
+    op.execute(
+        postgresql.insert(roles)
+        .values(
+            [
+                {"id": 1, "name": "پیمانکار/ادمین", "scopes": ["admin", "contractor"]},
+                {"id": 2, "name": "راننده", "scopes": ["driver"]},
+                {"id": 3, "name": "کشاورز", "scopes": ["farmer"]},
+            ]
+        )
+        .on_conflict_do_nothing(index_elements=["id"])
+    )
+
+
+def downgrade():
+    op.drop_table("drivers")
+    op.drop_table("cars")
+    op.drop_table("factory_pesticides")
+    op.drop_table("factory_seeds")
+    op.drop_table("pesticides")
+    op.drop_table("seeds")
+    op.drop_table("measure_units")
+    op.drop_table("factories")
+    op.drop_index("ix_crop_years_crop_year_name", table_name="crop_years")
+    op.drop_table("crop_years")
+    op.drop_index("ix_users_email", table_name="users")
+    op.drop_index("ix_users_username", table_name="users")
+    op.drop_table("users")
+    op.drop_table("roles")
+    op.drop_table("villages")
+    op.drop_table("cities")
+    op.drop_table("provinces")
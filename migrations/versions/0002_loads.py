@@ -0,0 +1,72 @@
+"""weighbridge loads
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        "loads",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("terminal_id", sa.String(50), nullable=False),
+        sa.Column("terminal_load_id", sa.String(64), nullable=False),
+        sa.Column("farmer_id", sa.Integer(), nullable=False),
+        sa.Column("driver_id", sa.BigInteger(), nullable=False),
+        sa.Column("factory_id", sa.BigInteger(), nullable=False),
+        sa.Column("crop_year_id", sa.BigInteger(), nullable=False),
+        sa.Column("weight_kg", sa.Float(), nullable=False),
+        sa.Column("sugar_grade", sa.Float(), nullable=False),
+        sa.Column("loss_percent", sa.Float(), nullable=False),
+        sa.Column("weighed_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["farmer_id"], ["users.id"], name="loads_farmer_id_fkey", ondelete="RESTRICT"
+        ),
+        sa.ForeignKeyConstraint(
+            ["driver_id"], ["drivers.id"], name="loads_driver_id_fkey", ondelete="RESTRICT"
+        ),
+        sa.ForeignKeyConstraint(
+            ["factory_id"],
+            ["factories.id"],
+            name="loads_factory_id_fkey",
+            ondelete="RESTRICT",
+        ),
+        sa.ForeignKeyConstraint(
+            ["crop_year_id"],
+            ["crop_years.id"],
+            name="loads_crop_year_id_fkey",
+            ondelete="RESTRICT",
+        ),
+        sa.PrimaryKeyConstraint("id", name="loads_pkey"),
+        sa.UniqueConstraint(
+            "terminal_id", "terminal_load_id", name="uq_loads_terminal_load"
+        ),
+    )
+    op.create_index("ix_loads_driver_id", "loads", ["driver_id"])
+    op.create_index("ix_loads_crop_year_farmer", "loads", ["crop_year_id", "farmer_id"])
+
+
+def downgrade():
+    op.drop_index("ix_loads_crop_year_farmer", table_name="loads")
+    op.drop_index("ix_loads_driver_id", table_name="loads")
+    op.drop_table("loads")
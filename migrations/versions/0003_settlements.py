@@ -0,0 +1,139 @@
+"""farmer allocations, settlement rates and farmer settlements
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def _timestamps():
+    return [
+        sa.Column(
+            "created_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.Column(
+            "updated_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    ]
+
+
+def upgrade():
+    for column in (
+        "beet_price_per_ton",
+        "base_sugar_grade",
+        "sugar_quota_kg_per_ton",
+        "pulp_quota_kg_per_ton",
+    ):
+        op.add_column("crop_years", sa.Column(column, sa.Float(), nullable=True))
+
+    op.create_table(
+        "farmer_allocations",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("farmer_id", sa.Integer(), nullable=False),
+        sa.Column("crop_year_id", sa.BigInteger(), nullable=False),
+        sa.Column("factory_seed_id", sa.BigInteger(), nullable=True),
+        sa.Column("factory_pesticide_id", sa.BigInteger(), nullable=True),
+        sa.Column("amount", sa.Float(), nullable=False),
+        *_timestamps(),
+        sa.CheckConstraint(
+            "(factory_seed_id IS NULL) <> (factory_pesticide_id IS NULL)",
+            name="ck_farmer_allocations_one_item",
+        ),
+        sa.ForeignKeyConstraint(
+            ["farmer_id"],
+            ["users.id"],
+            name="farmer_allocations_farmer_id_fkey",
+            ondelete="RESTRICT",
+        ),
+        sa.ForeignKeyConstraint(
+            ["crop_year_id"],
+            ["crop_years.id"],
+            name="farmer_allocations_crop_year_id_fkey",
+            ondelete="RESTRICT",
+        ),
+        sa.ForeignKeyConstraint(
+            ["factory_seed_id"],
+            ["factory_seeds.id"],
+            name="farmer_allocations_factory_seed_id_fkey",
+            ondelete="RESTRICT",
+        ),
+        sa.ForeignKeyConstraint(
+            ["factory_pesticide_id"],
+            ["factory_pesticides.id"],
+            name="farmer_allocations_factory_pesticide_id_fkey",
+            ondelete="RESTRICT",
+        ),
+        sa.PrimaryKeyConstraint("id", name="farmer_allocations_pkey"),
+    )
+    op.create_index(
+        "ix_farmer_allocations_crop_year_farmer",
+        "farmer_allocations",
+        ["crop_year_id", "farmer_id"],
+    )
+
+    op.create_table(
+        "farmer_settlements",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("crop_year_id", sa.BigInteger(), nullable=False),
+        sa.Column("farmer_id", sa.Integer(), nullable=False),
+        sa.Column("load_count", sa.Integer(), nullable=False),
+        sa.Column("gross_weight_kg", sa.Float(), nullable=False),
+        sa.Column("net_weight_kg", sa.Float(), nullable=False),
+        sa.Column("avg_sugar_grade", sa.Float(), nullable=False),
+        sa.Column("beet_amount", sa.Float(), nullable=False),
+        sa.Column("seed_deduction", sa.Float(), nullable=False),
+        sa.Column("pesticide_deduction", sa.Float(), nullable=False),
+        sa.Column("final_amount", sa.Float(), nullable=False),
+        sa.Column("sugar_quota_kg", sa.Float(), nullable=False),
+        sa.Column("pulp_quota_kg", sa.Float(), nullable=False),
+        sa.Column(
+            "computed_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+        sa.ForeignKeyConstraint(
+            ["crop_year_id"],
+            ["crop_years.id"],
+            name="farmer_settlements_crop_year_id_fkey",
+            ondelete="RESTRICT",
+        ),
+        sa.ForeignKeyConstraint(
+            ["farmer_id"],
+            ["users.id"],
+            name="farmer_settlements_farmer_id_fkey",
+            ondelete="RESTRICT",
+        ),
+        sa.PrimaryKeyConstraint("id", name="farmer_settlements_pkey"),
+        sa.UniqueConstraint(
+            "crop_year_id", "farmer_id", name="uq_farmer_settlements_crop_year_farmer"
+        ),
+    )
+
+
+def downgrade():
+    op.drop_table("farmer_settlements")
+    op.drop_index(
+        "ix_farmer_allocations_crop_year_farmer", table_name="farmer_allocations"
+    )
+    op.drop_table("farmer_allocations")
+    for column in (
+        "pulp_quota_kg_per_ton",
+        "sugar_quota_kg_per_ton",
+        "base_sugar_grade",
+        "beet_price_per_ton",
+    ):
+        op.drop_column("crop_years", column)
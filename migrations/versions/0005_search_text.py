@@ -0,0 +1,57 @@
+"""normalized search_text columns with trigram indexes
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-19
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+from app.text import backfill
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+# table -> source columns, as declared with @searchable on the models
+SEARCHABLE = {
+    "villages": ("village",),
+    "cities": ("city",),
+    "users": ("fullname", "username", "email"),
+    "drivers": ("name", "last_name", "national_code", "phone_number"),
+    "factories": ("factory_name",),
+    "seeds": ("seed_name",),
+    "pesticides": ("pesticide_name",),
+}
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    offline = context.is_offline_mode()
+    if offline:
+        # normalize_fa is Python: it cannot be rendered into the SQL script
+        op.execute(
+            "-- search_text is not backfilled in --sql mode: after applying this "
+            "script run `python -m app.text backfill`"
+        )
+    for table, columns in SEARCHABLE.items():
+        op.add_column(
+            table,
+            sa.Column("search_text", sa.String(), server_default="", nullable=False),
+        )
+        if not offline:
+            backfill(op.get_bind(), table, columns)
+        op.create_index(
+            f"ix_{table}_search_text_trgm",
+            table,
+            ["search_text"],
+            postgresql_using="gin",
+            postgresql_ops={"search_text": "gin_trgm_ops"},
+        )
+
+
+def downgrade():
+    for table in SEARCHABLE:
+        op.drop_index(f"ix_{table}_search_text_trgm", table_name=table)
+        op.drop_column(table, "search_text")
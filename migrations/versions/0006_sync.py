@@ -0,0 +1,69 @@
+"""updated_at on every synced table, indexed, and the deletions log
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+# tables that had no updated_at yet
+NEW_UPDATED_AT = ("provinces", "cities", "villages")
+
+SYNCED = (
+    "provinces",
+    "cities",
+    "villages",
+    "measure_units",
+    "seeds",
+    "pesticides",
+    "factories",
+    "crop_years",
+    "factory_seeds",
+    "factory_pesticides",
+    "cars",
+    "drivers",
+)
+
+
+def upgrade():
+    for table in NEW_UPDATED_AT:
+        op.add_column(
+            table,
+            sa.Column(
+                "updated_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                nullable=False,
+            ),
+        )
+    for table in SYNCED:
+        op.create_index(f"ix_{table}_updated_at", table, ["updated_at"])
+
+    op.create_table(
+        "deletions",
+        sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+        sa.Column("entity", sa.String(length=50), nullable=False),
+        sa.Column("entity_id", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "deleted_at",
+            sa.DateTime(timezone=True),
+            server_default=sa.func.now(),
+            nullable=False,
+        ),
+    )
+    op.create_index("ix_deletions_deleted_at", "deletions", ["deleted_at"])
+
+
+def downgrade():
+    op.drop_index("ix_deletions_deleted_at", table_name="deletions")
+    op.drop_table("deletions")
+    for table in SYNCED:
+        op.drop_index(f"ix_{table}_updated_at", table_name=table)
+    for table in NEW_UPDATED_AT:
+        op.drop_column(table, "updated_at")
@@ -0,0 +1,99 @@
+"""soft delete: deleted_at, unique and trigram indexes over live rows only
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+SOFT_DELETE = (
+    "provinces",
+    "cities",
+    "villages",
+    "users",
+    "crop_years",
+    "factories",
+    "measure_units",
+    "seeds",
+    "pesticides",
+    "factory_seeds",
+    "factory_pesticides",
+    "cars",
+    "drivers",
+)
+
+# (table, column, old constraint, old unique index), from 0001
+UNIQUE = (
+    ("provinces", "province", "provinces_province_key", None),
+    ("users", "username", None, "ix_users_username"),
+    ("users", "email", None, "ix_users_email"),
+    ("users", "phone_number", "users_phone_number_key", None),
+    ("crop_years", "crop_year_name", None, "ix_crop_years_crop_year_name"),
+    ("factories", "factory_name", "factories_factory_name_key", None),
+    ("measure_units", "unit_name", "measure_units_unit_name_key", None),
+    ("seeds", "seed_name", "seeds_seed_name_key", None),
+    ("pesticides", "pesticide_name", "pesticides_pesticide_name_key", None),
+    ("cars", "name", "cars_name_key", None),
+    ("drivers", "national_code", "drivers_national_code_key", None),
+    ("drivers", "phone_number", "drivers_phone_number_key", None),
+)
+
+# from 0005
+SEARCHABLE = ("villages", "cities", "users", "drivers", "factories", "seeds", "pesticides")
+
+LIVE = sa.text("deleted_at IS NULL")
+
+
+def _trgm_index(table, where=None):
+    op.create_index(
+        f"ix_{table}_search_text_trgm",
+        table,
+        ["search_text"],
+        postgresql_using="gin",
+        postgresql_ops={"search_text": "gin_trgm_ops"},
+        postgresql_where=where,
+    )
+
+
+def upgrade():
+    for table in SOFT_DELETE:
+        op.add_column(
+            table, sa.Column("deleted_at", sa.DateTime(timezone=True), nullable=True)
+        )
+
+    for table, column, constraint, index in UNIQUE:
+        if constraint:
+            op.drop_constraint(constraint, table, type_="unique")
+        if index:
+            op.drop_index(index, table_name=table)
+        op.create_index(
+            f"ux_{table}_{column}", table, [column], unique=True, postgresql_where=LIVE
+        )
+
+    for table in SEARCHABLE:
+        op.drop_index(f"ix_{table}_search_text_trgm", table_name=table)
+        _trgm_index(table, where=LIVE)
+
+
+def downgrade():
+    # fails if a soft-deleted row shares a name with a live one: resolve
+    # those by hand first, deleted rows may still be referenced by history
+    for table in SEARCHABLE:
+        op.drop_index(f"ix_{table}_search_text_trgm", table_name=table)
+        _trgm_index(table)
+
+    for table, column, constraint, index in UNIQUE:
+        op.drop_index(f"ux_{table}_{column}", table_name=table)
+        if constraint:
+            op.create_unique_constraint(constraint, table, [column])
+        if index:
+            op.create_index(index, table, [column], unique=True)
+
+    for table in SOFT_DELETE:
+        op.drop_column(table, "deleted_at")
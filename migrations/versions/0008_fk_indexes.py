@@ -0,0 +1,56 @@
+"""indexes for foreign-key filters and the unique allocation keys
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+INDEXES = (
+    ("cities", "province_id"),
+    ("villages", "city_id"),
+    ("drivers", "car_id"),
+    ("seeds", "measure_unit_id"),
+    ("pesticides", "measure_unit_id"),
+    ("factory_seeds", "seed_id"),
+    ("factory_seeds", "crop_year_id"),
+    ("factory_pesticides", "pesticide_id"),
+    ("factory_pesticides", "crop_year_id"),
+    ("loads", "farmer_id"),
+    ("farmer_allocations", "factory_seed_id"),
+    ("farmer_allocations", "factory_pesticide_id"),
+)
+
+# unique over live rows; factory_id leads and serves ?factory_id=
+ALLOCATION_KEYS = (
+    ("factory_seeds", ("factory_id", "seed_id", "crop_year_id")),
+    ("factory_pesticides", ("factory_id", "pesticide_id", "crop_year_id")),
+)
+
+
+def upgrade():
+    # fails on existing duplicates, which the API never meant to allow:
+    # soft delete the extra rows first
+    for table, columns in ALLOCATION_KEYS:
+        op.create_index(
+            f"ux_{table}_{'_'.join(columns)}",
+            table,
+            list(columns),
+            unique=True,
+            postgresql_where=sa.text("deleted_at IS NULL"),
+        )
+    for table, column in INDEXES:
+        op.create_index(f"ix_{table}_{column}", table, [column])
+
+
+def downgrade():
+    for table, column in INDEXES:
+        op.drop_index(f"ix_{table}_{column}", table_name=table)
+    for table, columns in ALLOCATION_KEYS:
+        op.drop_index(f"ux_{table}_{'_'.join(columns)}", table_name=table)
@@ -0,0 +1,64 @@
+"""price history of factory seed and pesticide allocations
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+# history table -> (allocation table, foreign key column)
+HISTORY = {
+    "factory_seed_prices": ("factory_seeds", "factory_seed_id"),
+    "factory_pesticide_prices": ("factory_pesticides", "factory_pesticide_id"),
+}
+
+
+def upgrade():
+    # plain equality on bigint inside a GiST exclusion constraint
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+    for table, (parent, fk) in HISTORY.items():
+        op.create_table(
+            table,
+            sa.Column("id", sa.BigInteger(), primary_key=True, autoincrement=True),
+            sa.Column(
+                fk,
+                sa.BigInteger(),
+                sa.ForeignKey(f"{parent}.id", ondelete="RESTRICT"),
+                nullable=False,
+            ),
+            sa.Column("farmer_price", sa.Float(), nullable=False),
+            sa.Column("factory_price", sa.Float(), nullable=False),
+            sa.Column("valid_during", postgresql.TSTZRANGE(), nullable=False),
+            sa.Column(
+                "created_at",
+                sa.DateTime(timezone=True),
+                server_default=sa.func.now(),
+                nullable=False,
+            ),
+            postgresql.ExcludeConstraint(
+                (sa.column(fk), "="),
+                (sa.column("valid_during"), "&&"),
+                using="gist",
+                name=f"ex_{table}_no_overlap",
+            ),
+        )
+        # the past before this migration is unknown: today's prices
+        # count from each allocation's creation
+        op.execute(
+            f"INSERT INTO {table} ({fk}, farmer_price, factory_price, valid_during) "
+            f"SELECT id, farmer_price, factory_price, tstzrange(created_at, NULL) "
+            f"FROM {parent}"
+        )
+
+
+def downgrade():
+    for table in HISTORY:
+        op.drop_table(table)
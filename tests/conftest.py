@@ -0,0 +1,66 @@
+import os
+import tempfile
+
+os.environ.setdefault(
+    "DATABASE_URL", "sqlite:///" + os.path.join(tempfile.gettempdir(), "havirkesht-test.db")
+)
+
+import pytest  # noqa: E402
+from sqlalchemy import BigInteger  # noqa: E402
+from sqlalchemy.ext.compiler import compiles  # noqa: E402
+
+from app.db import Base, SessionLocal, engine  # noqa: E402
+from app.models import (  # noqa: E402
+    Car,
+    City,
+    CropYear,
+    Deletion,
+    Driver,
+    Factory,
+    FactorySeed,
+    MeasureUnit,
+    Province,
+    Seed,
+)
+
+TABLES = [
+    Province.__table__,
+    City.__table__,
+    Car.__table__,
+    Driver.__table__,
+    Deletion.__table__,
+    MeasureUnit.__table__,
+    Seed.__table__,
+    Factory.__table__,
+    CropYear.__table__,
+    FactorySeed.__table__,
+]
+
+
+@compiles(BigInteger, "sqlite")
+def _sqlite_bigint(type_, compiler, **kw):
+    # SQLite only autoincrements INTEGER PRIMARY KEY
+    return "INTEGER"
+
+
+@pytest.fixture
+def tables():
+    Base.metadata.create_all(engine, tables=TABLES)
+    yield
+    Base.metadata.drop_all(engine, tables=TABLES)
+
+
+@pytest.fixture
+def session(tables):
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def client(tables):
+    from fastapi.testclient import TestClient
+
+    from app.config import app
+
+    # no startup: the change feed and background writers need Postgres
+    return TestClient(app)
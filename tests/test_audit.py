@@ -0,0 +1,21 @@
+from app.audit import core_entry, current_actor, record
+
+
+def test_core_entry_masks_and_skips_fields():
+    token = current_actor.set("clerk")
+    try:
+        entry = core_entry(
+            "users", 1, "create", {"password": (None, "x"), "updated_at": (None, 1)}
+        )
+    finally:
+        current_actor.reset(token)
+    assert entry["actor"] == "clerk"
+    assert entry["changes"] == {"password": {"before": None, "after": "***"}}
+
+
+def test_recorded_entries_are_dropped_on_rollback(session):
+    session.connection()  # begin, as the Core write before it would
+    record(session, [core_entry("cars", 1, "create", {"name": (None, "x")})])
+    assert session.info["audit"]
+    session.rollback()
+    assert "audit" not in session.info
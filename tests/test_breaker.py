@@ -0,0 +1,36 @@
+import pytest
+
+from app.breaker import OPEN, CircuitBreaker, DatabaseUnavailable
+
+
+def test_successes_do_not_reset_failures():
+    breaker = CircuitBreaker(failure_threshold=3, window=30)
+    for _ in range(3):
+        breaker.record_failure()
+        breaker.record_success()
+    assert breaker.state == OPEN
+    with pytest.raises(DatabaseUnavailable):
+        breaker.check()
+
+
+def test_old_failures_age_out(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("app.breaker.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=3, window=30)
+    breaker.record_failure()
+    breaker.record_failure()
+    now[0] += 31
+    breaker.record_failure()
+    assert breaker.state != OPEN
+
+
+def test_probe_success_closes(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr("app.breaker.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10)
+    breaker.record_failure()
+    now[0] += 11
+    breaker.check()  # the probe is let through
+    breaker.record_success()
+    breaker.check()
+    assert breaker.failures == 0
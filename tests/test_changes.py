@@ -0,0 +1,3 @@
+def test_stream_rejects_non_integer_ids(client):
+    response = client.get("/changes/stream?ids=abc")
+    assert response.status_code == 422
@@ -0,0 +1,42 @@
+def driver(**fields):
+    return {
+        "name": "n",
+        "last_name": "l",
+        "national_code": "111",
+        "phone_number": "0911",
+        "car_id": 1,
+        "license_plate": "p",
+        "capacity_ton": 10,
+        **fields,
+    }
+
+
+def test_create_two_cars(client):
+    assert client.post("/cars/", json={"name": "A"}).status_code == 201
+    assert client.post("/cars/", json={"name": "B"}).status_code == 201
+    assert client.post("/cars/", json={"name": "A"}).status_code == 409
+
+
+def test_name_is_free_again_after_soft_delete(client):
+    car_id = client.post("/cars/", json={"name": "A"}).json()["id"]
+    assert client.delete(f"/cars/{car_id}").status_code == 200
+    assert client.post("/cars/", json={"name": "A"}).status_code == 201
+
+
+def test_create_two_drivers(client):
+    client.post("/cars/", json={"name": "A"})
+    assert client.post("/drivers/", json=driver()).status_code == 201
+    second = driver(national_code="222", phone_number="0922")
+    assert client.post("/drivers/", json=second).status_code == 201
+    assert client.post("/drivers/", json=driver(phone_number="0933")).status_code == 409
+
+
+def test_driver_cannot_move_to_an_archived_car(client):
+    archived = client.post("/cars/", json={"name": "A"}).json()["id"]
+    live = client.post("/cars/", json={"name": "B"}).json()["id"]
+    driver_id = client.post("/drivers/", json=driver(car_id=live)).json()["id"]
+    assert client.delete(f"/cars/{archived}").status_code == 200
+
+    response = client.put(f"/drivers/{driver_id}", json={"car_id": archived})
+    assert response.status_code == 404
+    assert client.get(f"/drivers/{driver_id}").json()["car_id"] == live
@@ -0,0 +1,35 @@
+import pytest
+
+from app.models import CropYear, Factory, FactorySeed, MeasureUnit, Seed
+
+
+@pytest.fixture
+def allocations(session):
+    session.add(MeasureUnit(id=1, unit_name="kg"))
+    session.add(Factory(id=1, factory_name="f"))
+    session.add(Seed(id=1, seed_name="s", measure_unit_id=1))
+    session.add_all([CropYear(id=1, crop_year_name="1403"), CropYear(id=2, crop_year_name="1404")])
+    session.add_all(
+        FactorySeed(
+            id=i,
+            factory_id=1,
+            seed_id=1,
+            crop_year_id=i,
+            amount=10,
+            farmer_price=12,
+            factory_price=10,
+        )
+        for i in (1, 2)
+    )
+    session.commit()
+
+
+def test_partial_update_into_a_taken_key_is_a_conflict(client, allocations):
+    response = client.put("/factory_seeds/2", json={"crop_year_id": 1})
+    assert response.status_code == 409
+
+
+def test_partial_update_of_other_fields(client, allocations):
+    response = client.put("/factory_seeds/2", json={"amount": 5})
+    assert response.status_code == 200
+    assert response.json()["amount"] == 5
@@ -0,0 +1,105 @@
+import time
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from sqlalchemy.exc import OperationalError
+
+from app import idempotency as module
+from app.breaker import CircuitBreaker
+from app.idempotency import Idempotency, IdempotencyMiddleware, ResponseCache, Stored
+
+TTL = 60
+
+
+class MemoryStore:
+    def __init__(self):
+        self.rows = {}
+
+    def claim(self, key, fingerprint):
+        if key not in self.rows:
+            self.rows[key] = Stored(fingerprint, None, [], b"")
+            return time.time() + TTL, None
+        return None, self.rows[key]
+
+    def save(self, key, stored):
+        self.rows[key] = stored
+
+    def release(self, key):
+        if self.rows[key].status is None:
+            del self.rows[key]
+
+
+@pytest.fixture
+def calls():
+    return []
+
+
+@pytest.fixture
+def control():
+    return Idempotency(ResponseCache(100), MemoryStore())
+
+
+@pytest.fixture
+def client(calls, control, monkeypatch):
+    monkeypatch.setattr(module, "breaker", CircuitBreaker(failure_threshold=1))
+    api = FastAPI()
+
+    @api.post("/things/")
+    async def create(request: Request):
+        body = await request.json()
+        calls.append(body)
+        if body.get("fail"):
+            raise RuntimeError
+        return {"id": len(calls), **body}
+
+    api.add_middleware(IdempotencyMiddleware, control=control)
+    return TestClient(api, raise_server_exceptions=False)
+
+
+KEY = {"Idempotency-Key": "k1"}
+
+
+def test_retry_replays_the_first_response(client, calls, control):
+    first = client.post("/things/", json={"a": 1}, headers=KEY)
+    control.cache._entries.clear()  # another worker: answered from the store
+    again = client.post("/things/", json={"a": 1}, headers=KEY)
+    assert again.json() == first.json() == {"id": 1, "a": 1}
+    assert again.headers["idempotent-replayed"] == "true"
+    assert len(calls) == 1
+
+
+def test_key_reused_for_another_body(client):
+    client.post("/things/", json={"a": 1}, headers=KEY)
+    assert client.post("/things/", json={"a": 2}, headers=KEY).status_code == 422
+
+
+def test_server_errors_are_not_kept(client, calls):
+    assert client.post("/things/", json={"fail": 1}, headers=KEY).status_code == 500
+    assert client.post("/things/", json={"fail": 1}, headers=KEY).status_code == 500
+    assert len(calls) == 2
+
+
+def test_database_down_is_a_503(client, control):
+    def down(key, fingerprint):
+        raise OperationalError("claim", {}, Exception("connection refused"))
+
+    control.store.claim = down
+    response = client.post("/things/", json={"a": 1}, headers=KEY)
+    assert response.status_code == 503
+    assert response.headers["retry-after"] == "2"
+
+
+def test_open_breaker_is_a_503(client):
+    module.breaker.record_failure()
+    response = client.post("/things/", json={"a": 1}, headers=KEY)
+    assert response.status_code == 503
+    assert "retry-after" in response.headers
+
+
+def test_cache_entry_expires_with_its_key():
+    cache = ResponseCache(10)
+    cache.put("live", Stored("f", 201, [], b"", time.time() + 60))
+    cache.put("expired", Stored("f", 201, [], b"", time.time() - 1))
+    assert cache.get("live") is not None
+    assert cache.get("expired") is None
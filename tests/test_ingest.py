@@ -0,0 +1,46 @@
+import pytest
+from sqlalchemy.exc import IntegrityError, TimeoutError as PoolTimeout
+
+from app.ingest import LoadIngestBuffer
+
+
+def load(n):
+    return [{"terminal_id": "t", "terminal_load_id": str(n)}]
+
+
+@pytest.fixture
+def buffer():
+    buffer = LoadIngestBuffer(flush_interval=0.001)
+    yield buffer
+    buffer.stop()
+
+
+def test_pool_timeout_in_retry_fails_pending_requests(buffer, monkeypatch):
+    def write(groups):
+        if len(groups) > 1:
+            raise IntegrityError("insert", {}, Exception("unknown farmer"))
+        raise PoolTimeout()
+
+    monkeypatch.setattr(buffer, "_write", write)
+    futures = [buffer.submit(load(n)) for n in range(3)]
+    buffer.start()
+    for future in futures:
+        with pytest.raises((IntegrityError, PoolTimeout)):
+            future.result(timeout=5)
+    assert buffer._thread.is_alive()
+
+
+def test_writer_survives_unexpected_errors(buffer, monkeypatch):
+    calls = []
+
+    def write(groups):
+        calls.append(groups)
+        if len(calls) == 1:
+            raise RuntimeError("boom")
+        return [(1, 0) for _ in groups]
+
+    monkeypatch.setattr(buffer, "_write", write)
+    buffer.start()
+    with pytest.raises(RuntimeError):
+        buffer.submit(load(1)).result(timeout=5)
+    assert buffer.submit(load(2)).result(timeout=5) == (1, 0)
@@ -0,0 +1,40 @@
+import sys
+import threading
+
+from app.profiling import RequestSampler
+from app.tracing import TracedRoute
+
+
+def test_sampler_targets_only_its_own_handler():
+    running, release = threading.Event(), threading.Event()
+
+    def handler_a():
+        return {}
+
+    def handler_b():
+        running.set()
+        release.wait(5)
+        return {}
+
+    route_a = TracedRoute("/a", handler_a)
+    route_b = TracedRoute("/b", handler_b)
+    thread = threading.Thread(target=route_b.endpoint)
+    thread.start()
+    running.wait(5)
+    try:
+        frames = []
+        frame = sys._current_frames()[thread.ident]
+        while frame is not None:
+            frames.append(frame)
+            frame = frame.f_back
+
+        def hits(route):
+            sampler = RequestSampler({"endpoint": route.endpoint, "route": route}, 1)
+            handler, field = sampler._targets()
+            return any(sampler._is_target(f, handler, field) for f in frames)
+
+        assert not hits(route_a)
+        assert hits(route_b)
+    finally:
+        release.set()
+        thread.join()
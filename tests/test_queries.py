@@ -0,0 +1,29 @@
+from app.models import Car, City, Province
+from app.queries import exists_where
+
+
+def test_exists_where_binds_each_calls_values(session):
+    session.add(Car(name="x"))
+    session.commit()
+
+    assert exists_where(session, Car, name="x")
+    assert not exists_where(session, Car, name="y")
+
+
+def test_exists_where_with_several_criteria(session):
+    session.add_all([Province(id=1, province="p1"), Province(id=2, province="p2")])
+    session.add(City(id=1, city="A", province_id=1))
+    session.commit()
+
+    assert exists_where(session, City, city="A", province_id=1)
+    assert not exists_where(session, City, city="B", province_id=2)
+    assert not exists_where(session, City, city="A", province_id=2)
+
+
+def test_exists_where_exclude_id(session):
+    first, second = Car(name="x"), Car(name="y")
+    session.add_all([first, second])
+    session.commit()
+
+    assert not exists_where(session, Car, exclude_id=first.id, name="x")
+    assert exists_where(session, Car, exclude_id=second.id, name="x")
@@ -0,0 +1,32 @@
+import datetime
+
+from sqlalchemy import select
+
+from app.models import Car, Driver
+
+
+def test_relationships_resolve_to_archived_rows(session):
+    car = Car(name="x")
+    session.add(car)
+    session.flush()
+    session.add(
+        Driver(
+            name="n",
+            last_name="l",
+            national_code="111",
+            phone_number="0911",
+            car_id=car.id,
+            license_plate="p",
+            capacity_ton=10,
+        )
+    )
+    session.commit()
+    # archived after the driver took it, e.g. by an update to car_id
+    car.deleted_at = datetime.datetime.now(datetime.timezone.utc)
+    session.commit()
+    session.expunge_all()
+
+    driver = session.scalars(select(Driver)).one()
+    assert driver.car is not None
+    assert driver.car.deleted_at is not None
+    assert session.scalars(select(Car)).all() == []
@@ -0,0 +1,12 @@
+from sqlalchemy import text
+
+from app.text import SEARCHABLE, backfill
+
+
+def test_backfill_recomputes_search_text(session):
+    session.execute(text("INSERT INTO provinces (id, province) VALUES (1, 'p')"))
+    session.execute(
+        text("INSERT INTO cities (id, city, search_text, province_id) VALUES (1, 'كرمان', '', 1)")
+    )
+    assert backfill(session.connection(), "cities", SEARCHABLE["cities"]) == 1
+    assert session.execute(text("SELECT search_text FROM cities")).scalar() == "کرمان"